@@ -1,9 +1,11 @@
 # backend\api\auth\roles.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
+from config.settings import settings
 from core.database.database import get_db
-from core.security.auth import AuthManager
+from core.security.auth import UserModel, get_current_active_user, get_current_admin_user, token_verifier
+from core.security.permissions import permission_resolver
 from core.security.roles import Role, Permission
 from core.security.schemas import (
     RoleCreate,
@@ -21,7 +23,7 @@ async def create_role(
     *,
     db: Session = Depends(get_db),
     role_in: RoleCreate,
-    current_user = Depends(AuthManager.get_current_admin_user)
+    current_user = Depends(get_current_admin_user)
 ):
     """Crear nuevo rol"""
     db_role = Role(
@@ -39,14 +41,15 @@ async def create_role(
     db.add(db_role)
     db.commit()
     db.refresh(db_role)
+    permission_resolver.refresh_role(db, db_role.id)
     return db_role
 
 @router.get("/roles/", response_model=List[RoleSchema])
 async def read_roles(
     db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
-    current_user = Depends(AuthManager.get_current_active_user)
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
+    current_user = Depends(get_current_active_user)
 ):
     """Obtener lista de roles"""
     roles = db.query(Role).offset(skip).limit(limit).all()
@@ -57,7 +60,7 @@ async def read_role(
     *,
     db: Session = Depends(get_db),
     role_id: int,
-    current_user = Depends(AuthManager.get_current_active_user)
+    current_user = Depends(get_current_active_user)
 ):
     """Obtener un rol específico"""
     role = db.query(Role).filter(Role.id == role_id).first()
@@ -71,7 +74,7 @@ async def update_role(
     db: Session = Depends(get_db),
     role_id: int,
     role_in: RoleUpdate,
-    current_user = Depends(AuthManager.get_current_admin_user)
+    current_user = Depends(get_current_admin_user)
 ):
     """Actualizar un rol"""
     role = db.query(Role).filter(Role.id == role_id).first()
@@ -92,6 +95,7 @@ async def update_role(
     db.add(role)
     db.commit()
     db.refresh(role)
+    permission_resolver.refresh_role(db, role.id)
     return role
 
 @router.delete("/roles/{role_id}")
@@ -99,7 +103,7 @@ async def delete_role(
     *,
     db: Session = Depends(get_db),
     role_id: int,
-    current_user = Depends(AuthManager.get_current_admin_user)
+    current_user = Depends(get_current_admin_user)
 ):
     """Eliminar un rol"""
     role = db.query(Role).filter(Role.id == role_id).first()
@@ -108,6 +112,7 @@ async def delete_role(
     
     db.delete(role)
     db.commit()
+    permission_resolver.remove_role(role_id)
     return {"ok": True}
 
 # Rutas para Permisos
@@ -116,7 +121,7 @@ async def create_permission(
     *,
     db: Session = Depends(get_db),
     permission_in: PermissionCreate,
-    current_user = Depends(AuthManager.get_current_admin_user)
+    current_user = Depends(get_current_admin_user)
 ):
     """Crear nuevo permiso"""
     db_permission = Permission(**permission_in.dict())
@@ -128,10 +133,49 @@ async def create_permission(
 @router.get("/permissions/", response_model=List[PermissionSchema])
 async def read_permissions(
     db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
-    current_user = Depends(AuthManager.get_current_active_user)
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
+    current_user = Depends(get_current_active_user)
 ):
     """Obtener lista de permisos"""
     permissions = db.query(Permission).offset(skip).limit(limit).all()
-    return permissions
\ No newline at end of file
+    return permissions
+
+# Asignación de roles a usuarios
+@router.post("/users/{user_id}/roles/{role_id}")
+async def assign_role(
+    *,
+    db: Session = Depends(get_db),
+    user_id: int,
+    role_id: int,
+    current_user = Depends(get_current_admin_user)
+):
+    """Asignar un rol a un usuario"""
+    user = db.query(UserModel).filter(UserModel.id == user_id).first()
+    role = db.query(Role).filter(Role.id == role_id).first()
+    if not user or not role:
+        raise HTTPException(status_code=404, detail="User or role not found")
+    if role not in user.roles:
+        user.roles.append(role)
+        db.commit()
+    permission_resolver.refresh_user(db, user_id)
+    token_verifier.forget_user(user.username)
+    return {"ok": True, "scopes": sorted(permission_resolver.scopes(user_id))}
+
+@router.delete("/users/{user_id}/roles/{role_id}")
+async def revoke_role(
+    *,
+    db: Session = Depends(get_db),
+    user_id: int,
+    role_id: int,
+    current_user = Depends(get_current_admin_user)
+):
+    """Quitar un rol a un usuario"""
+    user = db.query(UserModel).filter(UserModel.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    user.roles = [role for role in user.roles if role.id != role_id]
+    db.commit()
+    permission_resolver.refresh_user(db, user_id)
+    token_verifier.forget_user(user.username)
+    return {"ok": True, "scopes": sorted(permission_resolver.scopes(user_id))}
\ No newline at end of file
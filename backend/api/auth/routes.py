@@ -1,10 +1,11 @@
 # backend\api\auth\routes.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from typing import Any, List
 from datetime import timedelta
 
+from config.settings import settings
 from core.database.database import get_db
 from core.security.auth import (
     Token,
@@ -17,18 +18,21 @@ from core.security.auth import (
     create_user,
     get_user_by_username,
     get_users,
+    password_hasher,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from core.middleware.public_paths import public_route
+from core.security.permissions import permission_resolver
 
 router = APIRouter()
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, openapi_extra=public_route())
 async def login_for_access_token(
     db: Session = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """Login para obtener token de acceso"""
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -41,7 +45,10 @@ async def login_for_access_token(
     access_token = create_access_token(
         data={
             "sub": user.username,
-            "scopes": [role.name for role in user.roles] if user.roles else [],
+            "uid": user.id,
+            "roles": [role.name for role in user.roles] if user.roles else [],
+            # Permisos efectivos ("recurso:acción") precalculados en la matriz
+            "scopes": sorted(permission_resolver.scopes(user.id)),
             "is_superuser": user.is_superuser
         },
         expires_delta=access_token_expires
@@ -50,7 +57,7 @@ async def login_for_access_token(
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-@router.post("/register", response_model=User)
+@router.post("/register", response_model=User, openapi_extra=public_route())
 async def register(
     *,
     db: Session = Depends(get_db),
@@ -63,7 +70,8 @@ async def register(
             status_code=400,
             detail="El usuario ya existe en el sistema."
         )
-    user = create_user(db, user_in)
+    hashed_password = await password_hasher.hash(user_in.password)
+    user = create_user(db, user_in, hashed_password=hashed_password)
     return user
 
 @router.get("/users/me", response_model=User)
@@ -76,8 +84,8 @@ async def read_current_user(
 @router.get("/users", response_model=List[User])
 async def read_users(
     db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_admin_user),
 ) -> Any:
     """Obtener lista de usuarios (solo admin)"""
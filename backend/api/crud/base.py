@@ -1,11 +1,11 @@
 # backend\api\crud\base.py
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from core.database.database import get_db
+from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from fastapi import APIRouter, Depends, HTTPException, Query
+from config.settings import settings
+from core.database.async_database import DBSession, get_session_dependency
 from models.base import Base
-from schemas.base import BaseSchema, BaseCreateSchema, BaseUpdateSchema, BaseInDBSchema
-from utils.helpers import CRUDHelper
+from schemas.base import BaseSchema, BaseCreateSchema, BaseUpdateSchema, BaseInDBSchema, Page
+from utils.helpers import AsyncCRUDHelper
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseCreateSchema)
@@ -28,44 +28,55 @@ class BaseCRUDRouter(Generic[ModelType, CreateSchemaType, UpdateSchemaType, InDB
         self.update_schema = update_schema
         self.indb_schema = indb_schema
         self.router = APIRouter(prefix=prefix)
-        self.crud = CRUDHelper[ModelType, CreateSchemaType, UpdateSchemaType](model)
+        self.crud = AsyncCRUDHelper[ModelType, CreateSchemaType, UpdateSchemaType](model)
         
         # Register routes
         self._register_routes()
     
     def _register_routes(self):
         """Register all CRUD routes"""
+        get_session = get_session_dependency()
         
         @self.router.post("/", response_model=self.indb_schema)
         async def create(
             obj_in: self.create_schema,
-            db: Session = Depends(get_db)
+            db: DBSession = Depends(get_session)
         ):
             """Create new record"""
             return await self.crud.create(db, obj_in=obj_in)
 
         @self.router.get("/{id}", response_model=self.indb_schema)
-        async def read(id: int, db: Session = Depends(get_db)):
+        async def read(id: int, db: DBSession = Depends(get_session)):
             """Get record by ID"""
             db_obj = await self.crud.get(db, id)
             if db_obj is None:
                 raise HTTPException(status_code=404, detail="Object not found")
             return db_obj
 
-        @self.router.get("/", response_model=List[self.indb_schema])
+        @self.router.get(
+            "/",
+            response_model=Union[Page[self.indb_schema], List[self.indb_schema]]
+        )
         async def read_multi(
-            skip: int = 0,
-            limit: int = 100,
-            db: Session = Depends(get_db)
+            cursor: Optional[str] = None,
+            limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
+            sort: Optional[str] = None,
+            skip: int = Query(0, ge=0),
+            db: DBSession = Depends(get_session)
         ):
-            """Get multiple records"""
-            return await self.crud.get_multi(db, skip=skip, limit=limit)
+            """Get a list of records; a keyset page when cursor or sort is given"""
+            if cursor is None and sort is None:
+                return await self.crud.get_multi(db, skip=skip, limit=limit)
+            items, next_cursor = await self.crud.get_page(
+                db, cursor=cursor, limit=limit, sort=sort
+            )
+            return {"items": items, "next_cursor": next_cursor}
 
         @self.router.put("/{id}", response_model=self.indb_schema)
         async def update(
             id: int,
             obj_in: self.update_schema,
-            db: Session = Depends(get_db)
+            db: DBSession = Depends(get_session)
         ):
             """Update record"""
             db_obj = await self.crud.get(db, id)
@@ -74,7 +85,7 @@ class BaseCRUDRouter(Generic[ModelType, CreateSchemaType, UpdateSchemaType, InDB
             return await self.crud.update(db, db_obj=db_obj, obj_in=obj_in)
 
         @self.router.delete("/{id}", response_model=self.indb_schema)
-        async def delete(id: int, db: Session = Depends(get_db)):
+        async def delete(id: int, db: DBSession = Depends(get_session)):
             """Delete record"""
             return await self.crud.delete(db, id=id)
 
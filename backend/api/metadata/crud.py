@@ -1,6 +1,8 @@
 # backend\api\metadata\crud.py
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy.orm import Session, make_transient_to_detached
+from config.settings import settings
+from core.cache import MISSING, metadata_cache
 from core.metadata.models import TableMetadata, FieldMetadata, RelationshipMetadata
 from core.metadata.schema import (
     TableMetadataCreate,
@@ -10,52 +12,134 @@ from core.metadata.schema import (
     RelationshipMetadataCreate,
     RelationshipMetadataUpdate
 )
+from core.metadata.versioning import bump_metadata_version_on_commit
 from utils.helpers import CRUDHelper
 
-class TableMetadataCRUD(CRUDHelper[TableMetadata, TableMetadataCreate, TableMetadataUpdate]):
+def invalidate_metadata_cache() -> None:
+    """Drop every cached metadata read on every worker (called after any metadata write)"""
+    metadata_cache.invalidate()
+
+class MetadataCacheMixin:
+    """Cached metadata reads with write-through invalidation.
+
+    The cache keeps each row's column values, not the instance: a hit builds a
+    fresh instance and attaches it to the session with merge(load=False), so no
+    query is issued. Writes also bump the global metadata version, in the same
+    transaction as the write, so the generated routers reload.
+
+    With CACHE_TYPE=memory the invalidation only reaches this worker; the
+    others drop their copy when their router registry sees the new version.
+    """
+
+    def _cache_key(self, *parts: Any) -> str:
+        return ":".join([self.model.__tablename__, *map(str, parts)])
+
+    def _restore(self, db: Session, data: Dict[str, Any]):
+        obj = self.model(**data)
+        make_transient_to_detached(obj)
+        return db.merge(obj, load=False)
+
+    def _cached_one(self, db: Session, key: str, loader: Callable[[], Any]):
+        if not settings.CACHE_ENABLED:
+            return loader()
+        # Pin the version before loading: a write that invalidates in between
+        # leaves what we loaded under the old version
+        version = metadata_cache.version()
+        data = metadata_cache.get(key, version=version)
+        if data is not MISSING:
+            return self._restore(db, data) if data is not None else None
+        obj = loader()
+        metadata_cache.set(key, obj.dict() if obj is not None else None, version=version)
+        return obj
+
+    def _cached_many(self, db: Session, key: str, loader: Callable[[], List[Any]]):
+        if not settings.CACHE_ENABLED:
+            return loader()
+        version = metadata_cache.version()
+        rows = metadata_cache.get(key, version=version)
+        if rows is not MISSING:
+            return [self._restore(db, data) for data in rows]
+        objs = loader()
+        metadata_cache.set(key, [obj.dict() for obj in objs], version=version)
+        return objs
+
+    def get(self, db: Session, id: int):
+        """Get a record by ID (cached)"""
+        load = super().get
+        return self._cached_one(db, self._cache_key("id", id), lambda: load(db, id))
+
+    def create(self, db: Session, *, obj_in):
+        bump_metadata_version_on_commit(db)
+        db_obj = super().create(db, obj_in=obj_in)
+        invalidate_metadata_cache()
+        return db_obj
+
+    def update(self, db: Session, *, db_obj, obj_in):
+        bump_metadata_version_on_commit(db)
+        db_obj = super().update(db, db_obj=db_obj, obj_in=obj_in)
+        invalidate_metadata_cache()
+        return db_obj
+
+    def delete(self, db: Session, *, id: int):
+        bump_metadata_version_on_commit(db)
+        db_obj = super().delete(db, id=id)
+        invalidate_metadata_cache()
+        return db_obj
+
+class TableMetadataCRUD(MetadataCacheMixin, CRUDHelper[TableMetadata, TableMetadataCreate, TableMetadataUpdate]):
     """CRUD operations for table metadata"""
     
     def get_by_name(self, db: Session, name: str) -> Optional[TableMetadata]:
         """Get table metadata by name"""
-        return db.query(self.model).filter(self.model.name == name).first()
+        return self._cached_one(
+            db,
+            self._cache_key("name", name),
+            lambda: db.query(self.model).filter(self.model.name == name).first()
+        )
 
     def get_with_fields(self, db: Session, id: int) -> Optional[TableMetadata]:
         """Get table metadata with all fields"""
-        return (
-            db.query(self.model)
-            .filter(self.model.id == id)
-            .first()
-        )
+        return self.get(db, id)
 
-class FieldMetadataCRUD(CRUDHelper[FieldMetadata, FieldMetadataCreate, FieldMetadataUpdate]):
+class FieldMetadataCRUD(MetadataCacheMixin, CRUDHelper[FieldMetadata, FieldMetadataCreate, FieldMetadataUpdate]):
     """CRUD operations for field metadata"""
     
     def get_by_table(self, db: Session, table_id: int) -> List[FieldMetadata]:
         """Get all fields for a table"""
-        return (
-            db.query(self.model)
+        return self._cached_many(
+            db,
+            self._cache_key("table", table_id),
+            lambda: db.query(self.model)
             .filter(self.model.table_id == table_id)
+            .order_by(self.model.id)
             .all()
         )
 
 class RelationshipMetadataCRUD(
+    MetadataCacheMixin,
     CRUDHelper[RelationshipMetadata, RelationshipMetadataCreate, RelationshipMetadataUpdate]
 ):
     """CRUD operations for relationship metadata"""
     
     def get_by_source_table(self, db: Session, table_id: int) -> List[RelationshipMetadata]:
         """Get all relationships where table is source"""
-        return (
-            db.query(self.model)
+        return self._cached_many(
+            db,
+            self._cache_key("source", table_id),
+            lambda: db.query(self.model)
             .filter(self.model.source_table_id == table_id)
+            .order_by(self.model.id)
             .all()
         )
 
     def get_by_target_table(self, db: Session, table_id: int) -> List[RelationshipMetadata]:
         """Get all relationships where table is target"""
-        return (
-            db.query(self.model)
+        return self._cached_many(
+            db,
+            self._cache_key("target", table_id),
+            lambda: db.query(self.model)
             .filter(self.model.target_table_id == table_id)
+            .order_by(self.model.id)
             .all()
         )
 
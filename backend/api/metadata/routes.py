@@ -1,8 +1,9 @@
 # backend\api\metadata\routes.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
+from config.settings import settings
 from core.database.database import get_db
 from core.metadata.models import TableMetadata, FieldMetadata, RelationshipMetadata
 from core.metadata.schema import (
@@ -16,11 +17,19 @@ from core.metadata.schema import (
     RelationshipMetadataUpdate,
     RelationshipMetadataInDB
 )
-from .crud import table_metadata, field_metadata, relationship_metadata
+from core.metadata.versioning import bump_metadata_version
+from schemas.base import Page
+from core.cache import cache_stats
+from .crud import table_metadata, field_metadata, relationship_metadata, invalidate_metadata_cache
 
 # Crear el router SIN prefijo - importante!
 router = APIRouter()
 
+@router.get("/metadata/cache/stats")
+def read_metadata_cache_stats():
+    """Hits, misses e invalidaciones de la cache (backend y namespaces)"""
+    return cache_stats()
+
 # Rutas para TableMetadata
 @router.post("/tables/", response_model=TableMetadataInDB)
 def create_table(
@@ -36,14 +45,22 @@ def create_table(
         )
     return table_metadata.create(db, obj_in=table)
 
-@router.get("/tables/", response_model=List[TableMetadataInDB])
+@router.get(
+    "/tables/",
+    response_model=Union[Page[TableMetadataInDB], List[TableMetadataInDB]]
+)
 def read_tables(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
+    sort: Optional[str] = None,
+    skip: int = Query(0, ge=0),
     db: Session = Depends(get_db)
 ):
-    """Obtener lista de tablas"""
-    return table_metadata.get_multi(db, skip=skip, limit=limit)
+    """Obtener lista de tablas; página keyset si se envía cursor o sort"""
+    if cursor is None and sort is None:
+        return table_metadata.get_multi(db, skip=skip, limit=limit)
+    items, next_cursor = table_metadata.get_page(db, cursor=cursor, limit=limit, sort=sort)
+    return {"items": items, "next_cursor": next_cursor}
 
 @router.get("/tables/{table_id}", response_model=TableMetadataInDB)
 def read_table(table_id: int, db: Session = Depends(get_db)):
@@ -96,8 +113,10 @@ def delete_table(table_id: int, db: Session = Depends(get_db)):
             TableMetadata.id == table_id
         ).delete(synchronize_session=False)
         
-        # Commit de todas las eliminaciones
+        # Commit de todas las eliminaciones junto con la nueva versión
+        bump_metadata_version(db)
         db.commit()
+        invalidate_metadata_cache()
         
         return JSONResponse(
             status_code=200,
@@ -270,14 +289,24 @@ def create_relationship(
     
     return relationship_metadata.create(db, obj_in=relationship)
 
-@router.get("/relationships/", response_model=List[RelationshipMetadataInDB])
+@router.get(
+    "/relationships/",
+    response_model=Union[Page[RelationshipMetadataInDB], List[RelationshipMetadataInDB]]
+)
 def read_relationships(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
+    sort: Optional[str] = None,
+    skip: int = Query(0, ge=0),
     db: Session = Depends(get_db)
 ):
-    """Obtener lista de relaciones"""
-    return relationship_metadata.get_multi(db, skip=skip, limit=limit)
+    """Obtener lista de relaciones; página keyset si se envía cursor o sort"""
+    if cursor is None and sort is None:
+        return relationship_metadata.get_multi(db, skip=skip, limit=limit)
+    items, next_cursor = relationship_metadata.get_page(
+        db, cursor=cursor, limit=limit, sort=sort
+    )
+    return {"items": items, "next_cursor": next_cursor}
 
 @router.get("/relationships/{relationship_id}", response_model=RelationshipMetadataInDB)
 def read_relationship(relationship_id: int, db: Session = Depends(get_db)):
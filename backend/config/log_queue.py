@@ -0,0 +1,99 @@
+# backend\config\log_queue.py
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional, TYPE_CHECKING
+import atexit
+import logging
+import os
+import queue
+import sys
+
+if TYPE_CHECKING:
+    from config.settings import Settings
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler que nunca bloquea el thread que loguea.
+
+    prepare() es el del QueueHandler estándar: arma el mensaje (msg % args y
+    traceback) antes de encolar y limpia args/exc_info, así el record no
+    retiene objetos que pueden cambiar o no ser seguros entre threads. El
+    formato final (LOG_FORMAT) y la escritura los hace el thread del
+    QueueListener. Si la cola está llena el record se descarta y se cuenta,
+    en vez de frenar el request.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[NonBlockingQueueHandler] = None
+
+def configure_queue_logging(settings: "Settings") -> None:
+    """Logging de producción: los loggers solo encolan, un thread escribe.
+
+    El thread del QueueListener formatea y escribe a consola y a un archivo
+    rotativo (LOG_MAX_BYTES x LOG_BACKUP_COUNT). El nivel mínimo es INFO y
+    sqlalchemy.engine queda en WARNING; las sentencias SQL se loguean
+    muestreadas (SQL_LOG_SAMPLE_RATE, ver core.database.instrumentation).
+    """
+    global _listener, _handler
+    stop_queue_logging()
+
+    log_dir = os.path.dirname(settings.LOG_FILE)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    formatter = logging.Formatter(settings.LOG_FORMAT, datefmt="%Y-%m-%d %H:%M:%S")
+    console = logging.StreamHandler(sys.stdout)
+    file_handler = RotatingFileHandler(
+        settings.LOG_FILE,
+        maxBytes=settings.LOG_MAX_BYTES,
+        backupCount=settings.LOG_BACKUP_COUNT,
+        encoding="utf-8",
+    )
+    for handler in (console, file_handler):
+        handler.setFormatter(formatter)
+
+    _handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    _listener = QueueListener(_handler.queue, console, file_handler, respect_handler_level=True)
+
+    level = logging.getLevelName(settings.LOG_LEVEL)
+    if not isinstance(level, int) or level < logging.INFO:
+        level = logging.INFO
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    root.addHandler(_handler)
+    root.setLevel(level)
+
+    # Todo pasa por el handler del root; sin handlers propios no hay doble escritura
+    for name, logger_level in (("uvicorn", level), ("sqlalchemy.engine", logging.WARNING)):
+        named = logging.getLogger(name)
+        for handler in named.handlers[:]:
+            named.removeHandler(handler)
+        named.setLevel(logger_level)
+        named.propagate = True
+
+    _listener.start()
+
+def stop_queue_logging() -> None:
+    """Vacía la cola y detiene el thread del listener (idempotente)"""
+    global _listener, _handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        if _handler.dropped:
+            sys.stderr.write(f"Logging: {_handler.dropped} records descartados por cola llena\n")
+        _handler = None
+
+atexit.register(stop_queue_logging)
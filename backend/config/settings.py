@@ -21,12 +21,43 @@ class Settings(BaseModel):
     DB_POOL_SIZE: int = 5
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
+    DB_POOL_PRE_PING: bool = True  # descarta conexiones cortadas antes de usarlas
+    DB_POOL_RECYCLE: int = 1800  # segundos; reabre conexiones más viejas (-1 = nunca)
+    DB_POOL_WAIT_WARN_MS: float = 1000  # checkouts más lentos se registran con el estado del pool
+    DB_POOL_ADAPTIVE: bool = False  # ajusta max_overflow según la demanda observada
+    DB_POOL_ADAPT_SECONDS: float = 10  # ventana de observación del modo adaptativo
+    DB_POOL_OVERFLOW_LIMIT: int = 50  # techo de max_overflow en modo adaptativo
+    DATABASE_REPLICA_URLS: List[str] = []  # réplicas de lectura para los GET (vacío = solo primaria)
+    REPLICA_READ_YOUR_WRITES_SECONDS: float = 5  # tras escribir, el cliente lee de la primaria (entre workers requiere CACHE_TYPE=redis)
+    REPLICA_HEALTH_CHECK_SECONDS: float = 10  # intervalo del chequeo de réplicas (0 = desactivado)
+    DB_POOLER: str = "internal"  # internal o pgbouncer (modo transaction: NullPool, sin prepared statements)
+    DB_MODE: str = "async"  # async o sync
+    MAX_PAGE_SIZE: int = 1000  # tope del parámetro limit en los listados
+    EXPORT_BATCH_SIZE: int = 1000  # filas por lote en los endpoints /export
+    BULK_BATCH_SIZE: int = 500  # filas por statement en los endpoints /bulk
+    METADATA_POLL_SECONDS: float = 5  # recarga de routers al cambiar la metadata (0 = desactivado)
+    QUERY_TIMING_ENABLED: bool = True  # conteo de consultas por request + header Server-Timing
+    SLOW_QUERY_MS: float = 200  # umbral del log de consultas lentas (logger ...instrumentation.slow)
+    N_PLUS_ONE_THRESHOLD: int = 10  # misma sentencia N veces en un request (0 = desactivado)
+    METRICS_ENABLED: bool = True  # endpoint /metrics (formato Prometheus) y latencia por ruta
+    MIGRATION_LOCK_TIMEOUT_MS: int = 2000  # migraciones online: espera máxima por un lock antes de reintentar
+    MIGRATION_STATEMENT_TIMEOUT_MS: int = 30000  # tope de cada DDL corto y de cada lote de backfill
+    MIGRATION_RETRIES: int = 5  # reintentos por paso ante lock_timeout/statement_timeout/deadlock
+    MIGRATION_RETRY_BACKOFF_SECONDS: float = 1.0  # espera base entre reintentos (exponencial)
+    MIGRATION_BACKFILL_BATCH_SIZE: int = 5000  # rango de ids por UPDATE de backfill
+    MIGRATION_BACKFILL_PAUSE_MS: float = 100  # pausa entre lotes para no saturar la base
     
     # Security
     SECRET_KEY: str = "your-secret-key-here"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 días
+    AUTH_CACHE_TTL_SECONDS: int = 60  # tokens verificados + snapshot del usuario
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    PASSWORD_HASH_WORKERS: int = 4  # threads para bcrypt (login/registro)
+    PASSWORD_HASH_MAX_PENDING: int = 64  # por encima se responde 503
+    ENFORCE_PERMISSIONS: bool = False  # exigir "tabla:acción" en los endpoints generados
+    PERMISSIONS_POLL_SECONDS: float = 5  # recarga de la matriz si otro worker la cambió
     
     # CORS Settings
     BACKEND_CORS_ORIGINS: List[str] = ["*"]
@@ -37,15 +68,28 @@ class Settings(BaseModel):
     # Cache Config
     CACHE_ENABLED: bool = True
     CACHE_EXPIRE_MINUTES: int = 15
-    CACHE_TYPE: str = "memory"  # memory o redis
+    CACHE_TYPE: str = "memory"  # memory (por proceso) o redis (compartida; necesaria con varios workers)
+    CACHE_MAX_ENTRIES: int = 1024  # entradas por proceso antes de descartar por LRU
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"  # memory:// usa un stand-in en proceso
+    CACHE_KEY_PREFIX: str = "molecule"
     
     # Logging Settings
     LOG_LEVEL: str = "DEBUG"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     LOG_FILE: str = "logs/molecule.log"
+    LOG_MODE: str = "development"  # development o production (cola + thread, ver config/log_queue.py)
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024  # rotación del archivo en production
+    LOG_BACKUP_COUNT: int = 5
+    LOG_QUEUE_SIZE: int = 10000  # records en cola; si se llena se descartan
+    SQL_LOG_SAMPLE_RATE: float = 0.0  # fracción de sentencias SQL logueadas (0 = ninguna)
 
     def configure_logging(self) -> None:
         """Configura el sistema de logging"""
+        if self.LOG_MODE == "production":
+            from config.log_queue import configure_queue_logging
+            configure_queue_logging(self)
+            return
+
         # Crear directorio de logs si no existe
         os.makedirs("logs", exist_ok=True)
 
@@ -102,11 +146,28 @@ class Settings(BaseModel):
             return f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
         return v
 
+    @staticmethod
+    def to_async_url(url: str) -> str:
+        """URL equivalente con driver async (asyncpg, o aiosqlite para SQLite)"""
+        if url.startswith("sqlite://"):
+            return url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    def get_async_database_url(self) -> str:
+        """URL de conexión para el engine async (asyncpg; aiosqlite con SQLite)"""
+        return self.to_async_url(self.DATABASE_URL)
+
+    def get_sql_echo(self) -> bool:
+        """echo de SQLAlchemy (cada sentencia con sus parámetros): solo en desarrollo"""
+        return self.DEBUG and self.LOG_MODE != "production"
+
     def get_db_pool_settings(self) -> Dict[str, Any]:
         return {
             "pool_size": self.DB_POOL_SIZE,
             "max_overflow": self.DB_MAX_OVERFLOW,
-            "pool_timeout": self.DB_POOL_TIMEOUT
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "pool_recycle": self.DB_POOL_RECYCLE
         }
 
     class Config:
@@ -0,0 +1,53 @@
+# backend\core\cache\__init__.py
+from typing import Any, Dict
+from config.settings import settings
+from .base import MISSING, CacheBackend
+from .memory import MemoryCache
+from .namespace import CacheNamespace
+from .redis_backend import InProcessRedis, RedisCache
+from core.metrics import CACHE_HITS, CACHE_HIT_RATIO, CACHE_MISSES, metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+def create_backend() -> CacheBackend:
+    """Backend configurado en settings: CACHE_TYPE=memory (por proceso) o redis (compartido)"""
+    ttl = settings.CACHE_EXPIRE_MINUTES * 60
+    if settings.CACHE_TYPE == "redis":
+        return RedisCache(settings.CACHE_REDIS_URL, prefix=settings.CACHE_KEY_PREFIX, ttl=ttl)
+    if settings.CACHE_TYPE != "memory":
+        logger.warning(f"CACHE_TYPE '{settings.CACHE_TYPE}' no soportado, se usa 'memory'")
+    return MemoryCache(max_entries=settings.CACHE_MAX_ENTRIES, ttl=ttl)
+
+cache_backend = create_backend()
+_namespaces: Dict[str, CacheNamespace] = {}
+
+def get_namespace(name: str) -> CacheNamespace:
+    """Namespace versionado sobre el backend compartido (uno por nombre y proceso)"""
+    namespace = _namespaces.get(name)
+    if namespace is None:
+        namespace = _namespaces[name] = CacheNamespace(cache_backend, name)
+    return namespace
+
+def cache_stats() -> Dict[str, Any]:
+    """Contadores del backend y de cada namespace"""
+    return {
+        **cache_backend.stats(),
+        "namespaces": {name: namespace.stats() for name, namespace in _namespaces.items()},
+    }
+
+def collect_cache_metrics() -> None:
+    """Hits/misses del backend y de cada namespace para /metrics"""
+    sources = {"backend": cache_backend.stats()}
+    for name, namespace in _namespaces.items():
+        sources[name] = namespace.stats()
+    for name, stats in sources.items():
+        labels = (name,)
+        CACHE_HITS.set(stats["hits"], labels)
+        CACHE_MISSES.set(stats["misses"], labels)
+        CACHE_HIT_RATIO.set(stats["hit_ratio"], labels)
+
+metrics.add_collector(collect_cache_metrics)
+
+# Lecturas de metadata: se invalidan en todos los workers con cada escritura
+metadata_cache = get_namespace("metadata")
@@ -0,0 +1,46 @@
+# backend\core\cache\base.py
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+# Distingue "no está en cache" de un valor None cacheado
+MISSING = object()
+
+class CacheBackend(ABC):
+    """Interfaz común de los backends de cache (memoria, Redis)"""
+
+    # True si las operaciones hacen I/O bloqueante: desde código async se
+    # ejecutan en el threadpool
+    blocking: bool = False
+    # True si todos los workers ven las mismas claves
+    shared: bool = False
+
+    @abstractmethod
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        """Valor cacheado o `default` si no existe o expiró"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Guarda un valor; `ttl` en segundos"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Elimina una clave"""
+
+    @abstractmethod
+    def incr(self, key: str) -> Optional[int]:
+        """Incremento atómico de un contador que no expira ni se descarta por LRU.
+
+        None si el backend no respondió y el contador no cambió.
+        """
+
+    @abstractmethod
+    def get_counter(self, key: str) -> Optional[int]:
+        """Valor actual de un contador creado con incr (0 si no existe, None si falló)"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Elimina todas las claves del backend"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Contadores para monitoreo"""
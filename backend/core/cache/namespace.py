@@ -0,0 +1,118 @@
+# backend\core\cache\namespace.py
+from typing import Any, Dict, Optional
+from starlette.concurrency import run_in_threadpool
+from .base import MISSING, CacheBackend
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Versión de un namespace cuyo contador no se pudo leer: get/set con ella son
+# miss/no-op, así nadie lee ni escribe un keyspace que puede estar invalidado
+UNAVAILABLE = -1
+
+class CacheNamespace:
+    """Grupo de claves con versión: `invalidate()` lo vacía en todos los workers.
+
+    Las claves reales son `<nombre>:v<versión>:<clave>`. Invalidar incrementa
+    el contador de versión en el backend (atómico y compartido si es Redis), de
+    modo que cada worker deja de ver las entradas anteriores en su próxima
+    lectura; éstas quedan huérfanas hasta que expiran por TTL o LRU.
+
+    Para cachear el resultado de una consulta, leer `version()` antes de
+    consultar y pasarla a get/set: si una escritura invalida mientras tanto,
+    el resultado queda bajo la versión vieja y nadie lo vuelve a leer.
+
+    Si el backend falla al invalidar, el namespace queda degradado (toda
+    lectura es miss) hasta que el incremento pendiente se aplica: servir las
+    entradas viejas hasta que expiren sería perder la invalidación.
+    """
+
+    def __init__(self, backend: CacheBackend, name: str, ttl: Optional[float] = None):
+        self.backend = backend
+        self.name = name
+        self.ttl = ttl
+        self._version_key = f"{name}:version"
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Invalidación que el backend no registró: se reintenta en version()
+        self.degraded = False
+
+    def version(self) -> int:
+        """Versión vigente del namespace, o UNAVAILABLE si el backend no responde"""
+        if self.degraded:
+            version = self.backend.incr(self._version_key)
+            if version is None:
+                return UNAVAILABLE
+            self.degraded = False
+            logger.info(f"Cache '{self.name}': invalidación pendiente aplicada")
+            return version
+        version = self.backend.get_counter(self._version_key)
+        return UNAVAILABLE if version is None else version
+
+    def _key(self, key: str, version: Optional[int] = None) -> Optional[str]:
+        if version is None:
+            version = self.version()
+        if version == UNAVAILABLE:
+            return None
+        return f"{self.name}:v{version}:{key}"
+
+    def get(self, key: str, default: Any = MISSING, version: Optional[int] = None) -> Any:
+        full_key = self._key(key, version)
+        value = self.backend.get(full_key, MISSING) if full_key is not None else MISSING
+        if value is MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(
+        self, key: str, value: Any, ttl: Optional[float] = None, version: Optional[int] = None
+    ) -> None:
+        full_key = self._key(key, version)
+        if full_key is not None:
+            self.backend.set(full_key, value, self.ttl if ttl is None else ttl)
+
+    def invalidate(self) -> None:
+        """Descarta todas las entradas del namespace (en todos los workers)"""
+        self.invalidations += 1
+        if self.backend.incr(self._version_key) is None:
+            self.degraded = True
+            logger.warning(f"Cache '{self.name}' degradada: la invalidación queda pendiente")
+
+    # Variantes para endpoints async: con un backend de red la llamada va al
+    # threadpool para no bloquear el event loop
+    async def aversion(self) -> int:
+        if self.backend.blocking:
+            return await run_in_threadpool(self.version)
+        return self.version()
+
+    async def aget(self, key: str, default: Any = MISSING, version: Optional[int] = None) -> Any:
+        if self.backend.blocking:
+            return await run_in_threadpool(self.get, key, default, version)
+        return self.get(key, default, version)
+
+    async def aset(
+        self, key: str, value: Any, ttl: Optional[float] = None, version: Optional[int] = None
+    ) -> None:
+        if self.backend.blocking:
+            await run_in_threadpool(self.set, key, value, ttl, version)
+        else:
+            self.set(key, value, ttl, version)
+
+    async def ainvalidate(self) -> None:
+        if self.backend.blocking:
+            await run_in_threadpool(self.invalidate)
+        else:
+            self.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "degraded": self.degraded,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,179 @@
+# backend\core\cache\redis_backend.py
+from threading import Lock
+from typing import Any, Dict, Iterator, Optional
+from .base import MISSING, CacheBackend
+import logging
+import pickle
+import time
+
+try:
+    import redis
+except ImportError:  # dependencia opcional: solo hace falta con CACHE_TYPE=redis
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+_ERRORS = (redis.RedisError, OSError) if redis is not None else (OSError,)
+
+class InProcessRedis:
+    """Stand-in en proceso del subconjunto de Redis que usa RedisCache.
+
+    Permite ejercitar el backend Redis (serialización, namespaces, contadores)
+    en desarrollo sin un servidor: CACHE_REDIS_URL=memory://
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = Lock()
+
+    def _alive(self, key: str) -> bool:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._data[key] if self._alive(key) else None
+
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> bool:
+        with self._lock:
+            self._data[key] = value
+            if ex:
+                self._expires[key] = time.monotonic() + ex
+            else:
+                self._expires.pop(key, None)
+            return True
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._data[key]) + 1 if self._alive(key) else 1
+            self._data[key] = str(value).encode()
+            return value
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            removed = 0
+            for key in keys:
+                self._expires.pop(key, None)
+                removed += self._data.pop(key, None) is not None
+            return removed
+
+    def scan_iter(self, match: str = "*") -> Iterator[str]:
+        prefix = match.rstrip("*")
+        with self._lock:
+            keys = [key for key in self._data if key.startswith(prefix) and self._alive(key)]
+        return iter(keys)
+
+    def dbsize(self) -> int:
+        with self._lock:
+            return sum(1 for key in list(self._data) if self._alive(key))
+
+class RedisCache(CacheBackend):
+    """Cache compartida entre workers sobre el protocolo Redis.
+
+    Los valores se guardan con pickle (datos internos de la app). Si el servidor
+    no responde, las lecturas cuentan como miss, las escrituras se descartan y
+    los contadores devuelven None: la cache nunca hace fallar un request.
+    """
+
+    blocking = True
+    shared = True
+
+    def __init__(
+        self,
+        url: str = "",
+        prefix: str = "molecule",
+        ttl: Optional[float] = None,
+        client: Any = None
+    ):
+        if client is None:
+            if url.startswith("memory://"):
+                client = InProcessRedis()
+            elif redis is None:
+                raise RuntimeError("CACHE_TYPE=redis requiere el paquete 'redis' (pip install redis)")
+            else:
+                client = redis.Redis.from_url(url)
+        self.client = client
+        # El stand-in no hace I/O: no hace falta pasar por el threadpool
+        self.blocking = not isinstance(client, InProcessRedis)
+        self.shared = not isinstance(client, InProcessRedis)
+        self.prefix = prefix
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    def _failed(self, operation: str, error: Exception) -> None:
+        self.errors += 1
+        logger.warning(f"Cache Redis no disponible ({operation}): {str(error)}")
+
+    def get(self, key: str, default: Any = MISSING) -> Any:
+        try:
+            raw = self.client.get(self._key(key))
+        except _ERRORS as e:
+            self._failed("get", e)
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return pickle.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            self.client.set(
+                self._key(key),
+                pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                ex=int(ttl) if ttl else None
+            )
+        except _ERRORS as e:
+            self._failed("set", e)
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete(self._key(key))
+        except _ERRORS as e:
+            self._failed("delete", e)
+
+    def incr(self, key: str) -> Optional[int]:
+        # Un contador perdido no es un miss: quien llama decide (ver CacheNamespace)
+        try:
+            return int(self.client.incr(self._key(key)))
+        except _ERRORS as e:
+            self._failed("incr", e)
+            return None
+
+    def get_counter(self, key: str) -> Optional[int]:
+        # INCR guarda el entero como texto, sin pickle
+        try:
+            raw = self.client.get(self._key(key))
+        except _ERRORS as e:
+            self._failed("get", e)
+            return None
+        return int(raw) if raw is not None else 0
+
+    def clear(self) -> None:
+        """Elimina solo las claves de este prefijo (la DB de Redis puede ser compartida)"""
+        try:
+            keys = list(self.client.scan_iter(match=f"{self.prefix}:*"))
+            if keys:
+                self.client.delete(*keys)
+        except _ERRORS as e:
+            self._failed("clear", e)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "redis",
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
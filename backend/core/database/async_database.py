@@ -0,0 +1,147 @@
+# backend\core\database\async_database.py
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from config.settings import settings
+from core.database.database import get_db, SessionLocal
+from core.database.pool import engine_pool_options, register_engine
+from core.database.replicas import RoutingSession, arouting_for_request, flush_write_mark
+from fastapi import Request
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Sequence, Union
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sesión que pueden recibir los endpoints generados (según settings.DB_MODE)
+DBSession = Union[AsyncSession, Session]
+
+logger.info("Initializing async database engine...")
+async_engine = create_async_engine(
+    settings.get_async_database_url(),
+    echo=settings.get_sql_echo(),
+    **engine_pool_options("async", is_async=True)
+)
+register_engine("async", async_engine.sync_engine)
+logger.info("Async database engine initialized successfully")
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+async def get_async_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency para obtener sesión async de DB (los GET pueden ir a una réplica)"""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Opening new async database connection")
+
+    async with AsyncSessionLocal() as db:
+        await arouting_for_request(db.sync_session, request)
+        try:
+            yield db
+            # Commits hechos directo con db.commit() y no con commit()
+            await flush_write_mark(db.sync_session)
+        except Exception as e:
+            logger.error(f"Database error occurred: {str(e)}", exc_info=True)
+            await db.rollback()
+            raise
+        finally:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Closing async database connection")
+
+def get_session_dependency() -> Callable:
+    """Devuelve la dependency de sesión configurada en settings.DB_MODE"""
+    if settings.DB_MODE == "async":
+        return get_async_db
+    return get_db
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[DBSession]:
+    """Sesión fuera de Depends (p. ej. respuestas en streaming que la usan después del handler)"""
+    if settings.DB_MODE == "async":
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+
+# Helpers independientes del tipo de sesión: con AsyncSession se hace await
+# directo, con Session (modo sync) la llamada bloqueante va al threadpool para
+# no frenar el event loop.
+async def execute(db: DBSession, statement: Any, *args, **kwargs) -> Any:
+    """Ejecuta un statement en la sesión"""
+    if isinstance(db, AsyncSession):
+        return await db.execute(statement, *args, **kwargs)
+    return await run_in_threadpool(db.execute, statement, *args, **kwargs)
+
+async def commit(db: DBSession) -> None:
+    """Confirma la transacción actual"""
+    if isinstance(db, AsyncSession):
+        await db.commit()
+        await flush_write_mark(db.sync_session)
+    else:
+        await run_in_threadpool(db.commit)
+
+async def rollback(db: DBSession) -> None:
+    """Revierte la transacción actual"""
+    if isinstance(db, AsyncSession):
+        await db.rollback()
+    else:
+        await run_in_threadpool(db.rollback)
+
+async def refresh(db: DBSession, instance: Any) -> None:
+    """Recarga el estado de una instancia desde la DB"""
+    if isinstance(db, AsyncSession):
+        await db.refresh(instance)
+    else:
+        await run_in_threadpool(db.refresh, instance)
+
+async def delete(db: DBSession, instance: Any) -> None:
+    """Marca una instancia para eliminación"""
+    if isinstance(db, AsyncSession):
+        await db.delete(instance)
+    else:
+        db.delete(instance)
+
+@asynccontextmanager
+async def savepoint(db: DBSession) -> AsyncIterator[None]:
+    """SAVEPOINT dentro de la transacción actual; se revierte si el bloque falla"""
+    if isinstance(db, AsyncSession):
+        async with db.begin_nested():
+            yield
+    else:
+        nested = await run_in_threadpool(db.begin_nested)
+        try:
+            yield
+        except Exception:
+            await run_in_threadpool(nested.rollback)
+            raise
+        await run_in_threadpool(nested.commit)
+
+async def stream_partitions(
+    db: DBSession,
+    statement: Any,
+    size: int
+) -> AsyncIterator[Sequence[Any]]:
+    """Recorre el resultado con un cursor del lado del servidor, de a `size` filas"""
+    statement = statement.execution_options(yield_per=size)
+    if isinstance(db, AsyncSession):
+        result = await db.stream(statement)
+        async for partition in result.partitions(size):
+            yield partition
+    else:
+        result = await run_in_threadpool(db.execute, statement)
+        try:
+            while True:
+                partition = await run_in_threadpool(result.fetchmany, size)
+                if not partition:
+                    break
+                yield partition
+        finally:
+            result.close()
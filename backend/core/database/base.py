@@ -1,12 +1,27 @@
 # backend\core\database\base.py
 from typing import Any
+from operator import attrgetter
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy import Column, Integer, DateTime, text
 from datetime import datetime
 from sqlalchemy.orm import mapped_column
 
-class Base(DeclarativeBase):
+class ColumnReaderMixin:
+    """Fast column reads shared by the declarative bases (this one and models.base)"""
+
+    @classmethod
+    def _column_reader(cls):
+        """Column names and a single attrgetter for them, built once per class"""
+        reader = cls.__dict__.get('_column_reader_cache')
+        if reader is None:
+            names = tuple(cls.__table__.columns.keys())
+            getter = attrgetter(*names)
+            reader = (names, getter if len(names) > 1 else lambda obj: (getter(obj),))
+            cls._column_reader_cache = reader
+        return reader
+
+class Base(ColumnReaderMixin, DeclarativeBase):
     """Base class for all database models"""
     
     @declared_attr
@@ -34,10 +49,8 @@ class Base(DeclarativeBase):
 
     def dict(self) -> dict[str, Any]:
         """Convert model instance to dictionary"""
-        return {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
+        names, getter = self._column_reader()
+        return dict(zip(names, getter(self)))
 
     def update(self, **kwargs):
         """Update model instance with given kwargs"""
@@ -1,9 +1,12 @@
 # backend\core\database\database.py
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import QueuePool
 from sqlalchemy.engine import Engine
 from config.settings import settings
+from core.database.instrumentation import record_query
+from core.database.pool import engine_pool_options, register_engine
+from core.database.replicas import RoutingSession, routing_for_request
+from fastapi import Request
 from typing import Generator
 import logging
 import logging.config
@@ -19,42 +22,53 @@ logger = logging.getLogger(__name__)
 logger.info("Initializing database engine...")
 engine = create_engine(
     settings.DATABASE_URL,
-    poolclass=QueuePool,
-    echo=settings.DEBUG,
-    **settings.get_db_pool_settings()
+    echo=settings.get_sql_echo(),
+    **engine_pool_options("primary")
 )
+register_engine("primary", engine)
 logger.info("Database engine initialized successfully")
 
 
-# Event listeners para logging detallado de SQL
+# Event listeners para logging detallado de SQL e instrumentación. Los
+# tiempos se apilan por conexión para que cada consulta mida la suya
 @event.listens_for(Engine, "before_cursor_execute")
 def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-    conn.info.setdefault('query_start_time', time.time())
-    if settings.DEBUG:
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+    if logger.isEnabledFor(logging.DEBUG):
         logger.debug("SQL Query Starting: %s", statement)
         logger.debug("Parameters: %r", parameters)
 
 @event.listens_for(Engine, "after_cursor_execute")
 def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-    total = time.time() - conn.info['query_start_time']
-    if settings.DEBUG:
+    total = time.perf_counter() - conn.info['query_start_time'].pop()
+    record_query(statement, total)
+    if logger.isEnabledFor(logging.DEBUG):
         logger.debug("SQL Query Completed in %.3f seconds", total)
 
+@event.listens_for(Engine, "handle_error")
+def handle_error(exception_context):
+    # Una consulta que falla no llega a after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get('query_start_time'):
+        connection.info['query_start_time'].pop()
+
 # Crear sessionmaker
 SessionLocal = sessionmaker(
     bind=engine,
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
     expire_on_commit=False
 )
 logger.info("Database session factory created")
 
-def get_db() -> Generator[Session, None, None]:
-    """Dependency para obtener sesión de DB"""
-    if settings.DEBUG:
+def get_db(request: Request) -> Generator[Session, None, None]:
+    """Dependency para obtener sesión de DB (los GET pueden ir a una réplica)"""
+    if logger.isEnabledFor(logging.DEBUG):
         logger.debug("Opening new database connection")
     
     db = SessionLocal()
+    routing_for_request(db, request)
     try:
         yield db
     except Exception as e:
@@ -62,7 +76,7 @@ def get_db() -> Generator[Session, None, None]:
         db.rollback()
         raise
     finally:
-        if settings.DEBUG:
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug("Closing database connection")
         db.close()
 
@@ -0,0 +1,89 @@
+# backend\core\database\instrumentation.py
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+from config.settings import settings
+from core.metrics import DB_QUERY_SECONDS
+import logging
+import random
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger(f"{__name__}.slow")
+sampled_query_logger = logging.getLogger(f"{__name__}.sql")
+
+@dataclass
+class QueryStats:
+    """Consultas ejecutadas durante un request (o un bloque track_queries)"""
+    label: str = ""
+    count: int = 0
+    seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.seconds += duration
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Sentencias idénticas ejecutadas `threshold` veces o más (posible N+1)"""
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+    def server_timing(self) -> str:
+        """Valor para el header Server-Timing"""
+        return f'db;dur={self.seconds * 1000:.2f};desc="{self.count} queries"'
+
+# Estadísticas del request en curso. El objeto es mutable y se comparte con
+# los threads del threadpool y los greenlets de SQLAlchemy async, que copian
+# el contexto
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+def record_query(statement: str, duration: float) -> None:
+    """Registra una consulta terminada (llamado desde after_cursor_execute)"""
+    DB_QUERY_SECONDS.observe(duration)
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, duration)
+    # Muestra de sentencias para producción, sin parámetros y con formateo diferido
+    rate = settings.SQL_LOG_SAMPLE_RATE
+    if rate > 0 and random.random() < rate:
+        sampled_query_logger.info("SQL (%.1f ms): %s", duration * 1000, statement)
+    if duration * 1000 >= settings.SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            "Slow query (%.1f ms)%s: %s",
+            duration * 1000,
+            f" [{stats.label}]" if stats is not None and stats.label else "",
+            " ".join(statement.split())
+        )
+
+def report_repeated(stats: QueryStats) -> None:
+    """Advierte sobre sentencias repetidas (patrón N+1)"""
+    threshold = settings.N_PLUS_ONE_THRESHOLD
+    if threshold <= 0:
+        return
+    for statement, count in stats.repeated(threshold):
+        logger.warning(
+            "Possible N+1%s: statement executed %d times: %s",
+            f" in {stats.label}" if stats.label else "",
+            count,
+            " ".join(statement.split())[:500]
+        )
+
+@contextmanager
+def track_queries(label: str = "") -> Iterator[QueryStats]:
+    """Cuenta las consultas del bloque y al salir reporta posibles N+1"""
+    stats = QueryStats(label=label)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        report_repeated(stats)
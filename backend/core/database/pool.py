@@ -0,0 +1,188 @@
+# backend\core\database\pool.py
+from threading import Lock
+from typing import Any, Dict
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+from config.settings import settings
+from core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CONNECTION_AGE_SECONDS,
+    DB_POOL_HOLD_SECONDS,
+    DB_POOL_MAX_OVERFLOW,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SATURATION,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUTS,
+    DB_POOL_WAIT_SECONDS,
+    DB_POOL_WAITING,
+    metrics,
+)
+import logging
+import math
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+class InstrumentedPoolMixin:
+    """QueuePool con telemetría de espera y, opcionalmente, overflow adaptativo.
+
+    connect() mide la espera de cada checkout (cola + conexión nueva +
+    pre-ping) y lleva la demanda: conexiones en uso más checkouts esperando.
+    Las esperas largas y los timeouts se registran con el estado del pool para
+    que se vea por qué un request quedó en cola.
+
+    En modo adaptativo (DB_POOL_ADAPTIVE), cada DB_POOL_ADAPT_SECONDS el
+    max_overflow se ajusta al pico de demanda de la ventana (+25% de margen),
+    entre DB_MAX_OVERFLOW y DB_POOL_OVERFLOW_LIMIT. Crece de inmediato y se
+    achica a mitad de camino por ventana para no oscilar.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.label = self.logging_name or "default"
+        self.adaptive = settings.DB_POOL_ADAPTIVE and self._max_overflow > -1
+        # recreate() copia el max_overflow vigente; el piso es siempre el configurado
+        self.base_overflow = settings.DB_MAX_OVERFLOW if self.adaptive else self._max_overflow
+        self.waiting = 0
+        self._counter_lock = Lock()
+        self._adapt_lock = Lock()
+        self._peak_demand = 0
+        self._window_started = time.monotonic()
+
+    def connect(self):
+        started = time.perf_counter()
+        with self._counter_lock:
+            self.waiting += 1
+            demand = self.checkedout() + self.waiting
+            if demand > self._peak_demand:
+                self._peak_demand = demand
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.inc(labels=(self.label,))
+            logger.warning("Pool '%s' sin conexiones libres tras %ss: %s", self.label, self._timeout, self.status())
+            raise
+        finally:
+            with self._counter_lock:
+                self.waiting -= 1
+            waited = time.perf_counter() - started
+            DB_POOL_WAIT_SECONDS.observe(waited, (self.label,))
+            if waited * 1000 >= settings.DB_POOL_WAIT_WARN_MS:
+                logger.warning(
+                    "Checkout del pool '%s' esperó %.0f ms (%d esperando): %s",
+                    self.label, waited * 1000, self.waiting, self.status()
+                )
+            if self.adaptive:
+                self._maybe_adapt()
+
+    def _maybe_adapt(self) -> None:
+        now = time.monotonic()
+        if now - self._window_started < settings.DB_POOL_ADAPT_SECONDS:
+            return
+        if not self._adapt_lock.acquire(blocking=False):
+            return
+        try:
+            peak, self._peak_demand, self._window_started = self._peak_demand, 0, now
+            needed = math.ceil(max(0, peak - self.size()) * 1.25)
+            target = min(settings.DB_POOL_OVERFLOW_LIMIT, max(self.base_overflow, needed))
+            current = self._max_overflow
+            if target < current:
+                target = max(target, (current + target) // 2)
+            if target != current:
+                # QueuePool lee _max_overflow en cada checkout; achicarlo no
+                # cierra conexiones en uso, las de overflow se cierran al volver
+                self._max_overflow = target
+                logger.info(
+                    "Pool '%s': max_overflow %d -> %d (pico de demanda %d, pool_size %d)",
+                    self.label, current, target, peak, self.size()
+                )
+        finally:
+            self._adapt_lock.release()
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+class InstrumentedAsyncQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+# --- Eventos de checkout/checkin ------------------------------------------
+# El record de la conexión guarda cuándo se abrió y cuándo salió del pool
+def _on_connect(dbapi_connection, connection_record) -> None:
+    connection_record.info["created_at"] = time.monotonic()
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    now = time.monotonic()
+    info = connection_record.info
+    label = getattr(getattr(connection_proxy, "_pool", None), "label", "default")
+    info["pool_label"] = label
+    info["checked_out_at"] = now
+    DB_POOL_CONNECTION_AGE_SECONDS.observe(now - info.get("created_at", now), (label,))
+
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    checked_out_at = connection_record.info.pop("checked_out_at", None)
+    if checked_out_at is not None:
+        DB_POOL_HOLD_SECONDS.observe(
+            time.monotonic() - checked_out_at,
+            (connection_record.info.get("pool_label", "default"),)
+        )
+
+# --- Configuración de engines ---------------------------------------------
+def engine_pool_options(name: str, is_async: bool = False) -> Dict[str, Any]:
+    """Argumentos de pool para create_engine según settings.DB_POOLER.
+
+    "internal": QueuePool instrumentado con pre-ping y recycle.
+    "pgbouncer": PgBouncer en modo transaction hace el pooling, así que el
+    proceso no retiene conexiones (NullPool) y asyncpg no reutiliza prepared
+    statements, que no sobreviven al cambio de conexión del servidor.
+    """
+    if settings.DB_POOLER == "pgbouncer":
+        options: Dict[str, Any] = {"poolclass": NullPool}
+        if is_async:
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                # Nombres únicos por si un statement queda preparado en otra conexión
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            }
+        return options
+    if settings.DB_POOLER != "internal":
+        logger.warning(f"DB_POOLER '{settings.DB_POOLER}' no soportado, se usa 'internal'")
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_logging_name": name,
+        **settings.get_db_pool_settings(),
+    }
+
+_engines: Dict[str, Engine] = {}
+
+def register_engine(name: str, engine: Engine) -> None:
+    """Instrumenta checkout/checkin del pool del engine y lo expone en /metrics.
+
+    Los eventos se registran en el engine (no en la clase del pool) para que
+    sobrevivan a pool.recreate() y funcionen también con el engine async.
+    """
+    _engines[name] = engine
+    event.listen(engine, "connect", _on_connect)
+    event.listen(engine, "checkout", _on_checkout)
+    event.listen(engine, "checkin", _on_checkin)
+
+def collect_pool_metrics() -> None:
+    for name, engine in _engines.items():
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        labels = (name,)
+        size = pool.size()
+        max_overflow = max(0, pool._max_overflow)
+        checked_out = pool.checkedout()
+        DB_POOL_SIZE.set(size, labels)
+        DB_POOL_MAX_OVERFLOW.set(max_overflow, labels)
+        DB_POOL_CHECKED_OUT.set(checked_out, labels)
+        # overflow() es negativo mientras no se abrieron todas las de pool_size
+        DB_POOL_OVERFLOW.set(max(0, pool.overflow()), labels)
+        DB_POOL_WAITING.set(getattr(pool, "waiting", 0), labels)
+        DB_POOL_SATURATION.set(round(checked_out / (size + max_overflow), 4) if size + max_overflow else 0.0, labels)
+
+metrics.add_collector(collect_pool_metrics)
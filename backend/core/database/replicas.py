@@ -0,0 +1,194 @@
+# backend\core\database\replicas.py
+from itertools import count
+from typing import Any, List, Optional
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from starlette.concurrency import run_in_threadpool
+from config.settings import settings
+from core.cache import cache_backend
+from core.database.pool import engine_pool_options, register_engine
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+class Replica:
+    """Una réplica de lectura con su engine sync y async"""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = url
+        self.engine = create_engine(url, **engine_pool_options(name))
+        self.async_engine = create_async_engine(
+            settings.to_async_url(url),
+            **engine_pool_options(f"{name}-async", is_async=True)
+        )
+        self.healthy = True
+        register_engine(name, self.engine)
+        register_engine(f"{name}-async", self.async_engine.sync_engine)
+        for engine in (self.engine, self.async_engine.sync_engine):
+            event.listen(engine, "handle_error", self._on_error)
+
+    def _on_error(self, exception_context) -> None:
+        # Una conexión caída saca a la réplica de la rotación hasta el próximo chequeo
+        if exception_context.is_disconnect and self.healthy:
+            self.healthy = False
+            logger.warning(f"Réplica {self.name} fuera de rotación: {exception_context.original_exception}")
+
+    def check(self) -> bool:
+        """SELECT 1 contra la réplica; actualiza `healthy`"""
+        try:
+            with self.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            healthy = True
+        except Exception as e:
+            healthy = False
+            if self.healthy:
+                logger.warning(f"Réplica {self.name} fuera de rotación: {str(e)}")
+        if healthy and not self.healthy:
+            logger.info(f"Réplica {self.name} vuelve a la rotación")
+        self.healthy = healthy
+        return healthy
+
+class ReplicaSet:
+    """Réplicas de lectura en round-robin, solo entre las sanas"""
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(f"replica{index}", url) for index, url in enumerate(urls)]
+        self._next = count()
+        if self.replicas and not cache_backend.shared:
+            # La marca de read-your-writes vive en el backend de cache: en
+            # memoria solo la ve el worker que atendió la escritura
+            logger.warning(
+                "Réplicas configuradas con CACHE_TYPE=memory: read-your-writes solo se "
+                "garantiza dentro de cada worker; usar CACHE_TYPE=redis con varios workers"
+            )
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    def check_all(self) -> None:
+        for replica in self.replicas:
+            replica.check()
+
+    async def watch(self, interval: float) -> None:
+        """Chequeo periódico de salud (en el threadpool, no bloquea el event loop)"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_threadpool(self.check_all)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error chequeando réplicas: {str(e)}", exc_info=True)
+
+# --- Read-your-writes -----------------------------------------------------
+def client_key(request: Request) -> str:
+    """Identidad del cliente: el usuario del token o, sin token, la IP"""
+    claims = getattr(request.state, "user", None) or {}
+    user = claims.get("uid") or claims.get("sub")
+    if user is not None:
+        return f"user:{user}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+def _recent_write_key(client: str) -> str:
+    return f"replicas:wrote:{client}"
+
+def mark_write(client: str) -> None:
+    """El cliente escribió: sus lecturas van a la primaria durante la ventana"""
+    window = settings.REPLICA_READ_YOUR_WRITES_SECONDS
+    if window > 0:
+        cache_backend.set(_recent_write_key(client), time.time(), window)
+
+def wrote_recently(client: str) -> bool:
+    return cache_backend.get(_recent_write_key(client), None) is not None
+
+# Variantes para el event loop: con Redis la llamada va al threadpool
+async def amark_write(client: str) -> None:
+    if cache_backend.blocking:
+        await run_in_threadpool(mark_write, client)
+    else:
+        mark_write(client)
+
+async def awrote_recently(client: str) -> bool:
+    if cache_backend.blocking:
+        return await run_in_threadpool(wrote_recently, client)
+    return wrote_recently(client)
+
+# --- Sesión con ruteo -----------------------------------------------------
+class RoutingSession(Session):
+    """Session que manda los SELECT a una réplica y todo lo demás a la primaria.
+
+    La réplica se asigna por request (routing_for_request) y se mantiene
+    para toda la sesión. Si la sesión escribe, deja de usar la réplica y al
+    confirmar marca al cliente para que lea de la primaria durante
+    REPLICA_READ_YOUR_WRITES_SECONDS. Sin réplica asignada se comporta como
+    una Session común.
+
+    La marca se guarda en el backend de cache: entre workers solo se comparte
+    con CACHE_TYPE=redis. Bajo una AsyncSession el commit corre en el event
+    loop, así que el hook solo la deja pendiente y la escribe
+    flush_write_mark (lo llaman adb.commit y get_async_db).
+    """
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any):
+        if self._flushing or (clause is not None and not isinstance(clause, Select)):
+            self.info["wrote"] = True
+            self.info.pop("replica", None)
+        replica = self.info.get("replica")
+        if replica is not None and isinstance(clause, Select) and clause._for_update_arg is None:
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+@event.listens_for(RoutingSession, "after_commit")
+def _mark_client_write(session: Session) -> None:
+    if session.info.pop("wrote", False) and session.info.get("client"):
+        if session.info.get("is_async"):
+            session.info["write_mark_pending"] = True
+        else:
+            mark_write(session.info["client"])
+
+async def flush_write_mark(session: Session) -> None:
+    """Escribe la marca de read-your-writes que dejó pendiente un commit async"""
+    if session.info.pop("write_mark_pending", False):
+        await amark_write(session.info["client"])
+
+replica_set = ReplicaSet(settings.DATABASE_REPLICA_URLS)
+
+def routing_for_request(session: Session, request: Request) -> None:
+    """Asigna réplica a la sesión del request si es una lectura y el cliente no escribió hace poco"""
+    if not replica_set:
+        return
+    client = client_key(request)
+    session.info["client"] = client
+    if request.method not in READ_METHODS or wrote_recently(client):
+        return
+    replica = replica_set.choose()
+    if replica is not None:
+        session.info["replica"] = replica.engine
+
+async def arouting_for_request(session: Session, request: Request) -> None:
+    """routing_for_request para la sync_session de una AsyncSession, sin bloquear el event loop"""
+    if not replica_set:
+        return
+    client = client_key(request)
+    session.info["client"] = client
+    session.info["is_async"] = True
+    if request.method not in READ_METHODS or await awrote_recently(client):
+        return
+    replica = replica_set.choose()
+    if replica is not None:
+        session.info["replica"] = replica.async_engine.sync_engine
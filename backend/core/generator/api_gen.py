@@ -1,15 +1,37 @@
 # backend\core\generator\api_gen.py
 from datetime import datetime
-from typing import Type, Dict, Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Awaitable, Callable, Type, Dict, Any, List, Optional, Tuple
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import delete, insert, select, update
 from pydantic import create_model
-from core.database.database import get_db
+from core.cache import MISSING, CacheNamespace, get_namespace
+from core.database import async_database as adb
+from core.database.async_database import DBSession, get_session_dependency
 from core.metadata.models import TableMetadata, FieldMetadata
+from core.metrics import TABLE_EXTRA
+from core.middleware.public_paths import public_route
+from core.security.auth import require_permission
+from core.generator.bulk import BulkWriter
+from core.generator.etag import ETagger
+from core.generator.query_builder import QueryBuilder
+from core.generator.serializers import FastJSONResponse, RowSerializer, dumps
+from config.settings import settings
+from utils.helpers import insert_values
+from utils.pagination import build_page, order_clauses, paginate_keyset, parse_sort
+import csv
+import hashlib
+import io
+import logging
+
+logger = logging.getLogger(__name__)
 
 class APIGenerator:
     """Generador de endpoints FastAPI desde metadatos"""
     
+    # Schemas Pydantic ya generados, por hash de la metadata de la tabla
+    _schema_cache: Dict[str, Tuple[Type, Type]] = {}
+    
     def __init__(self):
         self.routers: Dict[str, APIRouter] = {}
     
@@ -17,104 +39,234 @@ class APIGenerator:
         """Genera un router FastAPI para un modelo específico"""
         try:
             router = APIRouter()
+            get_session = get_session_dependency()
+            
+            # Crear schemas Pydantic (memoizados por hash de la metadata)
+            create_schema, update_schema = self._get_schemas(table_metadata, model)
+            
+            # Filtros, ordenamiento y proyección derivados de los metadatos
+            query_builder = QueryBuilder(table_metadata, model)
+            
+            # Serializador compilado una vez por modelo (datetime a ISO format)
+            serialize_model = RowSerializer(model)
+            table = model.__table__
+            
+            # Cache de lecturas (opcional por tabla) compartida entre workers;
+            # toda escritura la invalida
+            row_cache = self._row_cache(table_metadata)
+            
+            async def invalidate_rows() -> None:
+                if row_cache is not None:
+                    await row_cache.ainvalidate()
             
-            # Crear schemas Pydantic
-            create_schema = self._generate_create_schema(table_metadata, model)
-            update_schema = self._generate_update_schema(table_metadata, model)
+            # GET condicional (If-None-Match -> 304), opcional por tabla
+            etagger = ETagger(table) if self._uses_etag(table_metadata) else None
+            etag_columns = list(etagger.columns) if etagger else []
             
-            # Función auxiliar para serializar respuestas
-            def serialize_model(db_obj):
-                """Serializa los objetos del modelo, convirtiendo datetime a ISO format"""
-                result = {}
-                for column in model.__table__.columns:
-                    value = getattr(db_obj, column.name)
-                    if isinstance(value, datetime):
-                        result[column.name] = value.isoformat()
-                    else:
-                        result[column.name] = value
-                return result
+            async def cached_response(
+                request: Request, cache_key: str, version: int
+            ) -> Optional[Response]:
+                """Respuesta desde la cache de lecturas, o 304 si el ETag coincide"""
+                cached = await row_cache.aget(cache_key, version=version)
+                if cached is MISSING:
+                    return None
+                body, etag = cached
+                if ETagger.matches(request, etag):
+                    return ETagger.not_modified(etag)
+                return Response(body, media_type="application/json", headers=ETagger.headers(etag))
             
             # Endpoints CRUD
-            @router.post("/")
-            async def create_item(item: create_schema, db: Session = Depends(get_db)):
+            @router.post("/", **self._access(table_metadata, "create"))
+            async def create_item(item: create_schema, db: DBSession = Depends(get_session)):
                 """Crear nuevo item"""
                 try:
                     # Convertir Pydantic model a dict
                     item_data = item.dict()
                     
-                    # Crear y guardar el objeto
-                    db_item = model(**item_data)
-                    db.add(db_item)
-                    db.commit()
-                    db.refresh(db_item)
+                    # INSERT ... RETURNING: ids y defaults del servidor en el mismo viaje
+                    result = await adb.execute(
+                        db,
+                        insert(table).values(**insert_values(table, item_data)).returning(*table.c)
+                    )
+                    db_item = result.one()
+                    await adb.commit(db)
+                    await invalidate_rows()
                     
                     # Serializar la respuesta
-                    return serialize_model(db_item)
+                    return FastJSONResponse(serialize_model(db_item))
                 except Exception as e:
-                    db.rollback()
+                    await adb.rollback(db)
                     raise HTTPException(status_code=400, detail=str(e))
             
-            @router.get("/")
+            @router.get("/", **self._access(table_metadata, "read"))
             async def read_items(
-                skip: int = 0, 
-                limit: int = 100, 
-                db: Session = Depends(get_db)
+                request: Request,
+                cursor: Optional[str] = None,
+                limit: int = Query(100, ge=1, le=settings.MAX_PAGE_SIZE),
+                sort: Optional[str] = None,
+                skip: int = Query(0, ge=0),
+                fields: Optional[str] = None,
+                db: DBSession = Depends(get_session)
             ):
-                """Obtener lista de items"""
-                items = db.query(model).offset(skip).limit(limit).all()
-                # Serializar cada item en la lista
-                return [serialize_model(item) for item in items]
+                """Obtener lista de items (por offset con skip).
+
+                Con cursor o sort la respuesta es una página keyset
+                {"items", "next_cursor"}; cursor vacío pide la primera página.
+
+                Filtros: campo=valor, campo__in=a,b, campo__gte=x, campo__ilike=texto
+                (operadores según el tipo del campo); los parámetros que no son
+                campos se ignoran, salvo 'x__op' que da 400. Orden: sort=campo,-otro, solo
+                por id y campos indexados o únicos. Proyección: fields=id,campo.
+                """
+                selected = query_builder.parse_fields(fields)
+                params = request.query_params.multi_items()
+                # El mismo conjunto de filas con otros parámetros es otro cuerpo
+                variant = repr(sorted(params))
+
+                cache_key = None
+                if row_cache is not None:
+                    cache_key = "list:" + hashlib.sha1(variant.encode("utf-8")).hexdigest()
+                    # Versión fijada antes de consultar: una escritura concurrente
+                    # la invalida y el resultado no se sirve bajo la versión nueva
+                    version = await row_cache.aversion()
+                    cached = await cached_response(request, cache_key, version)
+                    if cached is not None:
+                        return cached
+
+                # Lecturas con Core select: filas Row livianas, sin identity map ni
+                # instrumentación ORM, que van directo al serializador
+                if cursor is None and sort is None:
+                    # Lista por offset: la forma original de la respuesta
+                    statement = query_builder.apply(
+                        select(*query_builder.columns(selected, [table.c.id, *etag_columns])),
+                        params
+                    )
+                    result = await adb.execute(
+                        db, statement.order_by(table.c.id).offset(skip).limit(limit)
+                    )
+                    items = result.all()
+                    etag = etagger.compute(items, variant) if etagger else None
+                    if ETagger.matches(request, etag):
+                        return ETagger.not_modified(etag)
+                    response = FastJSONResponse(
+                        serialize_model.project(selected).many(items),
+                        headers=ETagger.headers(etag)
+                    )
+                else:
+                    # Paginación keyset: WHERE (sort, id) > cursor ORDER BY sort, id LIMIT n
+                    keys = parse_sort(table, sort, query_builder.sortable)
+                    statement = query_builder.apply(
+                        select(*query_builder.columns(
+                            selected, [column for column, _ in keys] + etag_columns
+                        )),
+                        params
+                    )
+                    statement = paginate_keyset(statement, keys, cursor, limit)
+                    result = await adb.execute(db, statement)
+                    items, next_cursor = build_page(result.all(), keys, limit)
+                    etag = etagger.compute(items, f"{variant}{next_cursor}") if etagger else None
+                    # 304 antes de serializar
+                    if ETagger.matches(request, etag):
+                        return ETagger.not_modified(etag)
+                    response = FastJSONResponse(
+                        {
+                            "items": serialize_model.project(selected).many(items),
+                            "next_cursor": next_cursor
+                        },
+                        headers=ETagger.headers(etag)
+                    )
+
+                if cache_key is not None:
+                    # Se cachea el JSON ya codificado junto con su ETag
+                    await row_cache.aset(cache_key, (response.body, etag), version=version)
+                return response
             
-            @router.get("/{item_id}")
-            async def read_item(item_id: int, db: Session = Depends(get_db)):
+            # Endpoints adicionales (export, etc.) antes de las rutas /{item_id}
+            bulk_writer = BulkWriter(model, create_schema, update_schema, serialize_model)
+            self._add_custom_endpoints(
+                router, table_metadata, model, query_builder, serialize_model, bulk_writer,
+                invalidate_rows
+            )
+            
+            @router.get("/{item_id}", **self._access(table_metadata, "read"))
+            async def read_item(item_id: int, request: Request, db: DBSession = Depends(get_session)):
                 """Obtener un item específico"""
-                item = db.query(model).filter(model.id == item_id).first()
+                cache_key = f"item:{item_id}"
+                if row_cache is not None:
+                    version = await row_cache.aversion()
+                    cached = await cached_response(request, cache_key, version)
+                    if cached is not None:
+                        return cached
+                
+                result = await adb.execute(db, select(*table.c).where(table.c.id == item_id))
+                item = result.first()
                 if item is None:
                     raise HTTPException(status_code=404, detail="Item not found")
+                etag = etagger.compute([item]) if etagger else None
+                if ETagger.matches(request, etag):
+                    return ETagger.not_modified(etag)
                 # Serializar la respuesta
-                return serialize_model(item)
+                response = FastJSONResponse(serialize_model(item), headers=ETagger.headers(etag))
+                if row_cache is not None:
+                    await row_cache.aset(cache_key, (response.body, etag), version=version)
+                return response
             
-            @router.put("/{item_id}")
+            @router.put("/{item_id}", **self._access(table_metadata, "update"))
             async def update_item(
                 item_id: int, 
                 item: update_schema, 
-                db: Session = Depends(get_db)
+                db: DBSession = Depends(get_session)
             ):
                 """Actualizar un item"""
-                db_item = db.query(model).filter(model.id == item_id).first()
-                if db_item is None:
-                    raise HTTPException(status_code=404, detail="Item not found")
-                
                 # Actualizar solo los campos proporcionados
-                for key, value in item.dict(exclude_unset=True).items():
-                    if hasattr(db_item, key):
-                        setattr(db_item, key, value)
+                item_data = {
+                    key: value
+                    for key, value in item.dict(exclude_unset=True).items()
+                    if key in table.c
+                }
+                if not item_data:
+                    statement = select(*table.c).where(table.c.id == item_id)
+                else:
+                    # UPDATE ... RETURNING evita el SELECT previo y el refresh posterior
+                    statement = (
+                        update(table)
+                        .where(table.c.id == item_id)
+                        .values(**item_data)
+                        .returning(*table.c)
+                    )
                 
                 try:
-                    db.commit()
-                    db.refresh(db_item)
-                    # Serializar la respuesta
-                    return serialize_model(db_item)
+                    result = await adb.execute(db, statement)
+                    db_item = result.first()
+                    await adb.commit(db)
+                    await invalidate_rows()
                 except Exception as e:
-                    db.rollback()
+                    await adb.rollback(db)
                     raise HTTPException(status_code=400, detail=str(e))
-            
-            @router.delete("/{item_id}")
-            async def delete_item(item_id: int, db: Session = Depends(get_db)):
-                """Eliminar un item"""
-                db_item = db.query(model).filter(model.id == item_id).first()
+                
                 if db_item is None:
                     raise HTTPException(status_code=404, detail="Item not found")
-                
+                # Serializar la respuesta
+                return FastJSONResponse(serialize_model(db_item))
+            
+            @router.delete("/{item_id}", **self._access(table_metadata, "delete"))
+            async def delete_item(item_id: int, db: DBSession = Depends(get_session)):
+                """Eliminar un item"""
                 try:
-                    # Serializar antes de eliminar
-                    response = serialize_model(db_item)
-                    db.delete(db_item)
-                    db.commit()
-                    return response
+                    # DELETE ... RETURNING devuelve la fila eliminada en un solo viaje
+                    result = await adb.execute(
+                        db, delete(table).where(table.c.id == item_id).returning(*table.c)
+                    )
+                    db_item = result.first()
+                    await adb.commit(db)
+                    await invalidate_rows()
                 except Exception as e:
-                    db.rollback()
+                    await adb.rollback(db)
                     raise HTTPException(status_code=400, detail=str(e))
+                
+                if db_item is None:
+                    raise HTTPException(status_code=404, detail="Item not found")
+                return FastJSONResponse(serialize_model(db_item))
             
             return router
 
@@ -122,6 +274,59 @@ class APIGenerator:
             logger.error(f"Error generating router: {str(e)}")
             raise
     
+    @staticmethod
+    def _row_cache(table_metadata: TableMetadata) -> Optional[CacheNamespace]:
+        """Namespace de cache de la tabla si la metadata lo habilita (ui_settings.cache)"""
+        ui_settings = getattr(table_metadata, 'ui_settings', None) or {}
+        if not settings.CACHE_ENABLED or not ui_settings.get('cache'):
+            return None
+        return get_namespace(f"rows:{table_metadata.name}")
+    
+    @staticmethod
+    def _access(table_metadata: TableMetadata, action: str) -> Dict[str, Any]:
+        """Opciones de ruta según el acceso declarado en la metadata.
+
+        ui_settings.public: true hace públicas todas las acciones de la tabla;
+        una lista (p. ej. ["read"]) solo esas. El resto exige token y, con
+        ENFORCE_PERMISSIONS, el permiso "tabla:acción".
+        """
+        # La tabla queda en la ruta para etiquetar métricas
+        options: Dict[str, Any] = {"openapi_extra": {TABLE_EXTRA: table_metadata.name}}
+        public = (table_metadata.ui_settings or {}).get("public")
+        if public is True or (isinstance(public, list) and action in public):
+            options["openapi_extra"].update(public_route())
+        elif settings.ENFORCE_PERMISSIONS:
+            options["dependencies"] = [Depends(require_permission(table_metadata.name, action))]
+        return options
+    
+    @staticmethod
+    def _uses_etag(table_metadata: TableMetadata) -> bool:
+        """ETag / If-None-Match en las lecturas si la metadata lo habilita (ui_settings.etag)"""
+        ui_settings = getattr(table_metadata, 'ui_settings', None) or {}
+        return bool(ui_settings.get('etag'))
+    
+    @staticmethod
+    def metadata_hash(table_metadata: TableMetadata, model: Type) -> str:
+        """Hash de lo que define los schemas: modelo, campos y sus tipos"""
+        fields = sorted(
+            (field.name, field.field_type, bool(field.is_nullable))
+            for field in getattr(table_metadata, 'fields', None) or []
+        )
+        payload = repr((table_metadata.name, model.__module__, model.__name__, fields))
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    
+    def _get_schemas(self, table_metadata: TableMetadata, model: Type) -> Tuple[Type, Type]:
+        """Schemas de creación y actualización, generados una sola vez por versión de metadata"""
+        key = self.metadata_hash(table_metadata, model)
+        schemas = self._schema_cache.get(key)
+        if schemas is None:
+            schemas = (
+                self._generate_create_schema(table_metadata, model),
+                self._generate_update_schema(table_metadata, model),
+            )
+            self._schema_cache[key] = schemas
+        return schemas
+    
     def _generate_create_schema(
         self, 
         table_metadata: TableMetadata, 
@@ -131,11 +336,11 @@ class APIGenerator:
         try:
             fields = {}
             if not hasattr(table_metadata, 'fields'):
-                print(f"Warning: table_metadata no tiene campos para {table_metadata.name}")
+                logger.warning(f"table_metadata no tiene campos para {table_metadata.name}")
                 return create_model(f'{model.__name__}Create', __annotations__={})
                 
             for field in table_metadata.fields:
-                print(f"Procesando campo: {field.name} - tipo: {field.field_type}")
+                logger.debug("Procesando campo: %s - tipo: %s", field.name, field.field_type)
                 if field.name not in ['id', 'created_at', 'updated_at']:
                     field_type = self._get_pydantic_type(field)
                     fields[field.name] = (field_type, ... if not field.is_nullable else None)
@@ -214,9 +419,128 @@ class APIGenerator:
         self, 
         router: APIRouter, 
         table_metadata: TableMetadata, 
-        model: Type
+        model: Type,
+        query_builder: QueryBuilder,
+        serialize_model: RowSerializer,
+        bulk_writer: BulkWriter,
+        invalidate_rows: Callable[[], Awaitable[None]]
     ):
-        """Agrega endpoints personalizados según la metadata"""
-        # TODO: Implementar lógica para endpoints personalizados
-        # Por ejemplo, endpoints de búsqueda, filtrado, agregación, etc.
-        pass
\ No newline at end of file
+        """Agrega endpoints personalizados según la metadata.
+
+        Se registran antes de /{item_id} para que sus rutas fijas no queden
+        capturadas por el parámetro de path.
+        """
+        table = model.__table__
+        get_session = get_session_dependency()
+
+        def bulk_response(key: str, results: List[Any], errors: List[Dict[str, Any]]):
+            # 207 cuando parte de los ítems no se pudo escribir
+            return FastJSONResponse(
+                {key: results, "errors": errors},
+                status_code=207 if errors else 200
+            )
+
+        @router.post("/bulk", **self._access(table_metadata, "create"))
+        async def create_items(
+            items: List[Dict[str, Any]] = Body(...),
+            batch_size: Optional[int] = None,
+            db: DBSession = Depends(get_session)
+        ):
+            """Crear items en lote (INSERT ... RETURNING por lotes, una transacción)"""
+            try:
+                created, errors = await bulk_writer.create(
+                    db, items, batch_size or settings.BULK_BATCH_SIZE
+                )
+                await adb.commit(db)
+                await invalidate_rows()
+            except Exception as e:
+                await adb.rollback(db)
+                raise HTTPException(status_code=400, detail=str(e))
+            return bulk_response("created", created, errors)
+
+        @router.patch("/bulk", **self._access(table_metadata, "update"))
+        async def update_items(
+            items: List[Dict[str, Any]] = Body(...),
+            batch_size: Optional[int] = None,
+            db: DBSession = Depends(get_session)
+        ):
+            """Actualizar items en lote; cada elemento lleva su 'id' y los campos a cambiar"""
+            try:
+                updated, errors = await bulk_writer.update(
+                    db, items, batch_size or settings.BULK_BATCH_SIZE
+                )
+                await adb.commit(db)
+                await invalidate_rows()
+            except Exception as e:
+                await adb.rollback(db)
+                raise HTTPException(status_code=400, detail=str(e))
+            return bulk_response("updated", updated, errors)
+
+        @router.delete("/bulk", **self._access(table_metadata, "delete"))
+        async def delete_items(
+            ids: List[int] = Body(...),
+            batch_size: Optional[int] = None,
+            db: DBSession = Depends(get_session)
+        ):
+            """Eliminar items en lote por id"""
+            try:
+                deleted, errors = await bulk_writer.delete(
+                    db, ids, batch_size or settings.BULK_BATCH_SIZE
+                )
+                await adb.commit(db)
+                await invalidate_rows()
+            except Exception as e:
+                await adb.rollback(db)
+                raise HTTPException(status_code=400, detail=str(e))
+            return bulk_response("deleted", deleted, errors)
+
+        @router.get("/export", **self._access(table_metadata, "read"))
+        async def export_items(
+            request: Request,
+            format: str = "ndjson",
+            sort: Optional[str] = None,
+            fields: Optional[str] = None
+        ):
+            """Exportar la tabla completa en streaming (ndjson o csv), con los filtros del listado"""
+            if format not in ("ndjson", "csv"):
+                raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'csv'")
+
+            # Validar filtros/orden antes de empezar a enviar la respuesta
+            selected = query_builder.parse_fields(fields)
+            keys = parse_sort(table, sort, query_builder.sortable)
+            statement = query_builder.apply(
+                select(*query_builder.columns(selected)),
+                request.query_params.multi_items()
+            ).order_by(*order_clauses(keys))
+            serializer = serialize_model.project(selected)
+
+            async def generate_rows():
+                # La sesión vive mientras dura el stream, no solo el handler
+                async with adb.session_scope() as db:
+                    if format == "csv":
+                        buffer = io.StringIO()
+                        writer = csv.writer(buffer)
+                        writer.writerow(serializer.names)
+                    async for partition in adb.stream_partitions(
+                        db, statement, settings.EXPORT_BATCH_SIZE
+                    ):
+                        items = serializer.many(partition)
+                        if format == "csv":
+                            writer.writerows(item.values() for item in items)
+                            chunk = buffer.getvalue().encode("utf-8")
+                            buffer.seek(0)
+                            buffer.truncate()
+                            yield chunk
+                        else:
+                            yield b"".join(dumps(item) + b"\n" for item in items)
+                    if format == "csv" and buffer.tell():
+                        yield buffer.getvalue().encode("utf-8")
+
+            media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+            return StreamingResponse(
+                generate_rows(),
+                media_type=media_type,
+                headers={
+                    "Content-Disposition": f'attachment; filename="{table_metadata.name}.{format}"'
+                }
+            )
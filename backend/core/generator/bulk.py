@@ -0,0 +1,207 @@
+# backend\core\generator\bulk.py
+from typing import Any, Dict, List, Sequence, Tuple, Type, TypeVar
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from core.database import async_database as adb
+from core.database.async_database import DBSession
+from core.generator.serializers import RowSerializer
+from utils.helpers import insert_values
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+def chunks(items: Sequence[T], size: int) -> List[Sequence[T]]:
+    """Divide una secuencia en lotes de `size` elementos"""
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _validation_detail(error: ValidationError) -> List[Dict[str, Any]]:
+    return error.errors(include_url=False, include_context=False, include_input=False)
+
+def _db_error_detail(error: SQLAlchemyError) -> str:
+    return str(getattr(error, "orig", None) or error)
+
+class BulkWriter:
+    """Escrituras masivas por lotes dentro de una única transacción.
+
+    Cada lote va en un SAVEPOINT: si falla, se reintenta ítem por ítem para
+    reportar exactamente qué elementos no se pudieron escribir, sin perder el
+    resto de la transacción.
+    """
+
+    def __init__(
+        self,
+        model: Type,
+        create_schema: Type[BaseModel],
+        update_schema: Type[BaseModel],
+        serializer: RowSerializer
+    ):
+        self.table = model.__table__
+        self.create_schema = create_schema
+        self.update_schema = update_schema
+        self.serializer = serializer
+
+    async def create(
+        self,
+        db: DBSession,
+        items: List[Dict[str, Any]],
+        batch_size: int
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """INSERT ... RETURNING por lotes; devuelve (filas creadas, errores)"""
+        created: List[Dict[str, Any]] = []
+        errors: List[Dict[str, Any]] = []
+
+        valid: List[Tuple[int, Dict[str, Any]]] = []
+        for index, raw in enumerate(items):
+            try:
+                data = self.create_schema.model_validate(raw).model_dump(exclude_unset=True)
+                valid.append((index, insert_values(self.table, data)))
+            except ValidationError as e:
+                errors.append({"index": index, "detail": _validation_detail(e)})
+
+        statement = insert(self.table).returning(*self.table.c, sort_by_parameter_order=True)
+
+        async def write(batch: Sequence[Tuple[int, Dict[str, Any]]]) -> None:
+            async with adb.savepoint(db):
+                result = await adb.execute(db, statement, [data for _, data in batch])
+                rows = result.all()
+            created.extend(self.serializer.many(rows))
+
+        # Los campos omitidos toman el default de la columna, así que cada
+        # executemany agrupa ítems con las mismas columnas
+        for group in self._group_by_columns(valid).values():
+            await self._run_batches(group, batch_size, write, errors)
+        return created, errors
+
+    async def update(
+        self,
+        db: DBSession,
+        items: List[Dict[str, Any]],
+        batch_size: int
+    ) -> Tuple[List[int], List[Dict[str, Any]]]:
+        """UPDATE por lotes (executemany agrupado por columnas); devuelve (ids, errores)"""
+        updated: List[int] = []
+        errors: List[Dict[str, Any]] = []
+
+        valid: List[Tuple[int, Dict[str, Any]]] = []
+        for index, raw in enumerate(items):
+            item_id = raw.get("id") if isinstance(raw, dict) else None
+            if not isinstance(item_id, int):
+                errors.append({"index": index, "detail": "Each item needs an integer 'id'"})
+                continue
+            try:
+                data = self.update_schema.model_validate(
+                    {key: value for key, value in raw.items() if key != "id"}
+                ).model_dump(exclude_unset=True)
+            except ValidationError as e:
+                errors.append({"index": index, "detail": _validation_detail(e)})
+                continue
+            valid.append((index, {"id": item_id, **data}))
+
+        # Los ids inexistentes se informan antes de escribir
+        existing = await self._existing_ids(db, [data["id"] for _, data in valid], batch_size)
+        pending = []
+        for index, data in valid:
+            if data["id"] in existing:
+                pending.append((index, data))
+            else:
+                errors.append({"index": index, "id": data["id"], "detail": "Item not found"})
+
+        # executemany necesita el mismo conjunto de columnas en todo el lote
+        for columns, group in self._group_by_columns(pending).items():
+            columns = tuple(column for column in columns if column != "id")
+            if not columns:
+                updated.extend(data["id"] for _, data in group)
+                continue
+            statement = (
+                update(self.table)
+                .where(self.table.c.id == bindparam("b_id"))
+                .values({column: bindparam(f"b_{column}") for column in columns})
+            )
+
+            async def write(batch: Sequence[Tuple[int, Dict[str, Any]]]) -> None:
+                params = [
+                    {f"b_{key}": value for key, value in data.items()}
+                    for _, data in batch
+                ]
+                async with adb.savepoint(db):
+                    await adb.execute(db, statement, params)
+                updated.extend(data["id"] for _, data in batch)
+
+            await self._run_batches(group, batch_size, write, errors)
+        return updated, errors
+
+    async def delete(
+        self,
+        db: DBSession,
+        ids: List[int],
+        batch_size: int
+    ) -> Tuple[List[int], List[Dict[str, Any]]]:
+        """DELETE ... WHERE id IN (...) RETURNING id por lotes; devuelve (ids, errores)"""
+        deleted: List[int] = []
+        errors: List[Dict[str, Any]] = []
+        indexed = list(enumerate(ids))
+
+        async def write(batch: Sequence[Tuple[int, int]]) -> None:
+            statement = (
+                delete(self.table)
+                .where(self.table.c.id.in_([item_id for _, item_id in batch]))
+                .returning(self.table.c.id)
+            )
+            async with adb.savepoint(db):
+                result = await adb.execute(db, statement)
+                removed = set(result.scalars().all())
+            for index, item_id in batch:
+                if item_id in removed:
+                    deleted.append(item_id)
+                else:
+                    errors.append({"index": index, "id": item_id, "detail": "Item not found"})
+
+        await self._run_batches(indexed, batch_size, write, errors)
+        return deleted, errors
+
+    def _group_by_columns(
+        self,
+        items: List[Tuple[int, Dict[str, Any]]]
+    ) -> Dict[Tuple[str, ...], List[Tuple[int, Dict[str, Any]]]]:
+        groups: Dict[Tuple[str, ...], List[Tuple[int, Dict[str, Any]]]] = {}
+        for index, data in items:
+            groups.setdefault(tuple(sorted(data)), []).append((index, data))
+        return groups
+
+    async def _existing_ids(self, db: DBSession, ids: List[int], batch_size: int) -> set:
+        existing = set()
+        for batch in chunks(ids, batch_size):
+            result = await adb.execute(
+                db, select(self.table.c.id).where(self.table.c.id.in_(batch))
+            )
+            existing.update(result.scalars().all())
+        return existing
+
+    async def _run_batches(self, items, batch_size, write, errors) -> None:
+        for batch in chunks(items, batch_size):
+            try:
+                await write(batch)
+            except SQLAlchemyError:
+                if len(batch) == 1:
+                    await self._write_one(batch[0], write, errors)
+                    continue
+                # Reintentar de a un ítem para aislar los que fallan
+                logger.warning("Bulk batch failed, retrying item by item")
+                for item in batch:
+                    await self._write_one(item, write, errors)
+
+    async def _write_one(self, item, write, errors) -> None:
+        try:
+            await write([item])
+        except SQLAlchemyError as e:
+            index, value = item
+            error = {"index": index, "detail": _db_error_detail(e)}
+            if isinstance(value, int):
+                error["id"] = value
+            elif isinstance(value, dict) and "id" in value:
+                error["id"] = value["id"]
+            errors.append(error)
@@ -0,0 +1,58 @@
+# backend\core\generator\etag.py
+from typing import Any, Dict, Iterable, Optional, Sequence
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy import Column, Table
+import hashlib
+
+# Los clientes deben revalidar siempre; el 304 evita reenviar el cuerpo
+CACHE_CONTROL = "private, no-cache"
+
+class ETagger:
+    """ETags de las lecturas generadas, calculados antes de serializar.
+
+    La versión de cada fila es (id, updated_at); si la tabla no tiene
+    updated_at se usa la fila completa. El ETag de un listado incluye además
+    los parámetros del request, porque la misma página con otra proyección u
+    orden tiene otro cuerpo.
+    """
+
+    def __init__(self, table: Table):
+        if "updated_at" in table.c:
+            self.columns: Sequence[Column] = (table.c.id, table.c.updated_at)
+        else:
+            self.columns = tuple(table.c)
+        self._names = tuple(column.name for column in self.columns)
+
+    def compute(self, rows: Iterable[Any], salt: str = "") -> str:
+        digest = hashlib.sha1(salt.encode("utf-8"))
+        for row in rows:
+            digest.update(repr(tuple(getattr(row, name) for name in self._names)).encode("utf-8"))
+        return f'W/"{digest.hexdigest()}"'
+
+    @staticmethod
+    def matches(request: Request, etag: Optional[str]) -> bool:
+        """True si If-None-Match incluye el ETag (comparación débil, RFC 9110)"""
+        header = request.headers.get("if-none-match")
+        if not header or etag is None:
+            return False
+        if header.strip() == "*":
+            return True
+        opaque = etag[2:] if etag.startswith("W/") else etag
+        for candidate in header.split(","):
+            candidate = candidate.strip()
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            if candidate == opaque:
+                return True
+        return False
+
+    @staticmethod
+    def headers(etag: Optional[str]) -> Optional[Dict[str, str]]:
+        if etag is None:
+            return None
+        return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+    @classmethod
+    def not_modified(cls, etag: str) -> Response:
+        return Response(status_code=304, headers=cls.headers(etag))
@@ -0,0 +1,326 @@
+# backend\core\generator\online_migration.py
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import DBAPIError
+from config.settings import settings
+from core.generator.schema_diff import MigrationPlan, SchemaChange
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+# SQLSTATE de Postgres que justifican reintentar el paso
+RETRYABLE_SQLSTATES = {
+    "55P03": "lock_timeout",
+    "57014": "statement_timeout",
+    "40P01": "deadlock",
+}
+
+@dataclass
+class MigrationStep:
+    """Un paso del plan online.
+
+    mode:
+      transaction  DDL corto en su propia transacción, con lock_timeout y statement_timeout
+      validate     VALIDATE CONSTRAINT: con lock_timeout, sin statement_timeout (no bloquea tráfico)
+      autocommit   CONCURRENTLY: fuera de transacción, sin statement_timeout
+      backfill     UPDATE por rangos de id con pausa entre lotes
+    """
+    description: str
+    statements: List[str] = field(default_factory=list)
+    mode: str = "transaction"
+    # autocommit: índice que se descarta si quedó inválido de un intento anterior
+    index_sql: Optional[str] = None
+    # backfill: tabla, columna y valor con el que se completan los NULL
+    table_sql: Optional[str] = None
+    column_sql: Optional[str] = None
+    value: Optional[str] = None
+
+class OnlineMigrationExecutor:
+    """Aplica un MigrationPlan sin tomar locks largos (solo PostgreSQL).
+
+    Reescribe los cambios que en una tabla grande bloquearían el tráfico:
+    - los índices únicos se crean CONCURRENTLY y se convierten en constraint
+      con ADD CONSTRAINT ... UNIQUE USING INDEX;
+    - NOT NULL pasa por un CHECK (col IS NOT NULL) NOT VALID que después se
+      valida; con el check válido SET NOT NULL no recorre la tabla (PG 12+);
+    - las columnas nuevas con default se agregan sin default, se fija el
+      default para las filas nuevas y las existentes se completan por lotes;
+    - las foreign keys se agregan NOT VALID y se validan aparte.
+
+    Lo que no se puede hacer sin bloquear o que fallaría a mitad de camino
+    rechaza el plan completo antes de ejecutar nada (ver check): cambios de
+    tipo y NOT NULL sin default sobre filas con NULL.
+
+    Cada paso corre con lock_timeout (y statement_timeout si es corto): si no
+    consigue el lock a tiempo se cancela y se reintenta con backoff, en vez de
+    quedar en la cola de locks frenando a todos los demás. A diferencia de
+    TableGenerator.apply_plan no es una única transacción; los pasos son
+    idempotentes para poder volver a correr la migración si se corta.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    @staticmethod
+    def supports(engine: Engine) -> bool:
+        return engine.dialect.name == "postgresql"
+
+    # --- Plan -------------------------------------------------------------
+    def check(self, plan: MigrationPlan) -> None:
+        """Rechaza el plan (ValueError) si tiene cambios que no se aplican online"""
+        problems = []
+        for change in plan:
+            details = change.details
+            label = f"{change.table}.{change.column}"
+            if change.kind == "alter_column" and details.get("action") == "type":
+                # Reescribe la tabla con ACCESS EXCLUSIVE: no hay variante online
+                problems.append(
+                    f"{label}: {change.description} reescribe la tabla; aplicarlo sin --online en una ventana de mantenimiento"
+                )
+            elif change.kind == "add_column" and not details["nullable"] and details["default"] is None:
+                # Sin default no hay con qué completar las filas existentes y VALIDATE fallaría
+                if self._has_rows(details["table_sql"]):
+                    problems.append(f"{label}: columna NOT NULL sin default en una tabla con filas; definir un default")
+            elif (
+                change.kind == "alter_column"
+                and details.get("action") == "nullable"
+                and not details["nullable"]
+                and details.get("default") is None
+            ):
+                if self._has_rows(details["table_sql"], f"{details['column_sql']} IS NULL"):
+                    problems.append(f"{label}: hay filas con NULL y la columna no tiene default para completarlas")
+        if problems:
+            raise ValueError("Plan no aplicable online:\n  - " + "\n  - ".join(problems))
+
+    def _has_rows(self, table_sql: str, where: Optional[str] = None) -> bool:
+        condition = f" WHERE {where}" if where else ""
+        with self.engine.connect() as conn:
+            return bool(conn.exec_driver_sql(f"SELECT EXISTS (SELECT 1 FROM {table_sql}{condition})").scalar())
+
+    def steps(self, plan: MigrationPlan) -> List[MigrationStep]:
+        self.check(plan)
+        steps: List[MigrationStep] = []
+        for change in plan:
+            steps.extend(self._steps_for(change))
+        return steps
+
+    def _steps_for(self, change: SchemaChange) -> List[MigrationStep]:
+        details = change.details
+        label = f"{change.table}: {change.description}"
+
+        if change.kind == "add_column":
+            if details["nullable"] and details["default"] is None:
+                return [MigrationStep(label, [change.sql])]
+            statements = [
+                f"ALTER TABLE {details['table_sql']} ADD COLUMN IF NOT EXISTS {details['column_sql']} {details['type_sql']}"
+            ]
+            if details["default"] is not None:
+                statements.append(
+                    f"ALTER TABLE {details['table_sql']} ALTER COLUMN {details['column_sql']} SET DEFAULT {details['default']}"
+                )
+            steps = [MigrationStep(f"{label} (sin default, no reescribe la tabla)", statements)]
+            if details["default"] is not None:
+                steps.append(self._backfill_step(change, details["default"]))
+            if not details["nullable"]:
+                steps.extend(self._not_null_steps(change))
+            return steps
+
+        if change.kind == "alter_column" and details.get("action") == "nullable" and not details["nullable"]:
+            steps = []
+            if details.get("default") is not None:
+                steps.append(self._backfill_step(change, details["default"]))
+            return steps + self._not_null_steps(change)
+
+        if change.kind == "create_unique":
+            return [
+                MigrationStep(
+                    f"{label} (índice CONCURRENTLY)",
+                    [
+                        f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {details['index']} "
+                        f"ON {details['table_sql']} ({details['column_sql']})"
+                    ],
+                    mode="autocommit",
+                    index_sql=details["index_sql"],
+                ),
+                MigrationStep(
+                    f"{label} (constraint sobre el índice)",
+                    [f"ALTER TABLE {details['table_sql']} ADD CONSTRAINT {details['index']} UNIQUE USING INDEX {details['index']}"],
+                ),
+            ]
+
+        if change.kind == "drop_unique" and details.get("unique_kind") == "index":
+            return [MigrationStep(label, [f"DROP INDEX CONCURRENTLY IF EXISTS {details['index_sql']}"], mode="autocommit")]
+
+        if change.kind == "add_foreign_key":
+            return [
+                MigrationStep(
+                    f"{label} (NOT VALID)",
+                    [
+                        f"ALTER TABLE {details['table_sql']} DROP CONSTRAINT IF EXISTS {details['constraint']}",
+                        f"ALTER TABLE {details['table_sql']} ADD CONSTRAINT {details['constraint']} {details['definition']} NOT VALID",
+                    ],
+                ),
+                MigrationStep(
+                    f"{label} (validación)",
+                    [f"ALTER TABLE {details['table_sql']} VALIDATE CONSTRAINT {details['constraint']}"],
+                    mode="validate",
+                ),
+            ]
+
+        return [MigrationStep(label, [change.sql])]
+
+    def _backfill_step(self, change: SchemaChange, value: str) -> MigrationStep:
+        return MigrationStep(
+            f"{change.table}: completar {change.column} = {value} en filas existentes",
+            mode="backfill",
+            table_sql=change.details["table_sql"],
+            column_sql=change.details["column_sql"],
+            value=value,
+        )
+
+    def _not_null_steps(self, change: SchemaChange) -> List[MigrationStep]:
+        table_sql = change.details["table_sql"]
+        column_sql = change.details["column_sql"]
+        check = self.engine.dialect.identifier_preparer.quote(f"ck_{change.table}_{change.column}_not_null"[:63])
+        label = f"{change.table}: {change.column} NOT NULL"
+        return [
+            MigrationStep(
+                f"{label} (check NOT VALID)",
+                [
+                    f"ALTER TABLE {table_sql} DROP CONSTRAINT IF EXISTS {check}",
+                    f"ALTER TABLE {table_sql} ADD CONSTRAINT {check} CHECK ({column_sql} IS NOT NULL) NOT VALID",
+                ],
+            ),
+            MigrationStep(
+                f"{label} (validación del check)",
+                [f"ALTER TABLE {table_sql} VALIDATE CONSTRAINT {check}"],
+                mode="validate",
+            ),
+            MigrationStep(
+                f"{label} (SET NOT NULL usando el check)",
+                [
+                    f"ALTER TABLE {table_sql} ALTER COLUMN {column_sql} SET NOT NULL",
+                    f"ALTER TABLE {table_sql} DROP CONSTRAINT {check}",
+                ],
+            ),
+        ]
+
+    def render(self, plan: MigrationPlan) -> str:
+        """El plan online como script comentado (para dry-run)"""
+        lines = []
+        for step in self.steps(plan):
+            lines.append(f"-- {step.description} [{step.mode}]")
+            if step.mode == "backfill":
+                lines.append(
+                    f"UPDATE {step.table_sql} SET {step.column_sql} = {step.value} "
+                    f"WHERE id >= :desde AND id < :desde + {settings.MIGRATION_BACKFILL_BATCH_SIZE} "
+                    f"AND {step.column_sql} IS NULL;  -- por lotes"
+                )
+            lines.extend(f"{statement};" for statement in step.statements)
+        for note in plan.skipped:
+            lines.append(f"-- OMITIDO: {note}")
+        return "\n".join(lines) if lines else "-- Sin cambios: el esquema coincide con la metadata"
+
+    # --- Ejecución --------------------------------------------------------
+    def execute(self, plan: MigrationPlan) -> None:
+        steps = self.steps(plan)
+        for number, step in enumerate(steps, 1):
+            logger.info(f"[{number}/{len(steps)}] {step.description}")
+            started = time.perf_counter()
+            if step.mode == "backfill":
+                self._backfill(step)
+            else:
+                self._with_retry(step.description, lambda: self._run(step))
+            logger.info(f"✅ [{number}/{len(steps)}] {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def _set_timeouts(self, conn: Connection, statement_timeout_ms: float, local: bool = True) -> None:
+        scope = "LOCAL " if local else ""
+        conn.exec_driver_sql(f"SET {scope}lock_timeout = {int(settings.MIGRATION_LOCK_TIMEOUT_MS)}")
+        conn.exec_driver_sql(f"SET {scope}statement_timeout = {int(statement_timeout_ms)}")
+
+    def _run(self, step: MigrationStep) -> None:
+        if step.mode == "autocommit":
+            # CONCURRENTLY no puede correr dentro de una transacción
+            with self.engine.connect() as conn:
+                conn.execution_options(isolation_level="AUTOCOMMIT")
+                self._set_timeouts(conn, 0, local=False)
+                try:
+                    if step.index_sql:
+                        self._drop_invalid_index(conn, step.index_sql)
+                    for statement in step.statements:
+                        conn.exec_driver_sql(statement)
+                finally:
+                    conn.exec_driver_sql("RESET lock_timeout")
+                    conn.exec_driver_sql("RESET statement_timeout")
+            return
+
+        statement_timeout = 0 if step.mode == "validate" else settings.MIGRATION_STATEMENT_TIMEOUT_MS
+        with self.engine.begin() as conn:
+            self._set_timeouts(conn, statement_timeout)
+            for statement in step.statements:
+                conn.exec_driver_sql(statement)
+
+    def _drop_invalid_index(self, conn: Connection, index_sql: str) -> None:
+        """Un CREATE INDEX CONCURRENTLY cortado deja el índice inválido; IF NOT EXISTS no lo repara"""
+        invalid = conn.execute(
+            text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+            {"name": index_sql}
+        ).scalar()
+        if invalid:
+            logger.warning(f"Índice {index_sql} inválido de un intento anterior, se vuelve a crear")
+            conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {index_sql}")
+
+    def _backfill(self, step: MigrationStep) -> None:
+        # Las tablas generadas siempre tienen `id` entero como clave primaria
+        def bounds():
+            with self.engine.begin() as conn:
+                self._set_timeouts(conn, settings.MIGRATION_STATEMENT_TIMEOUT_MS)
+                return conn.exec_driver_sql(f"SELECT min(id), max(id) FROM {step.table_sql}").one()
+
+        lower, upper = self._with_retry(step.description, bounds)
+        if lower is None:
+            logger.info(f"{step.description}: tabla vacía, nada que completar")
+            return
+
+        batch_size = max(1, settings.MIGRATION_BACKFILL_BATCH_SIZE)
+        pause = settings.MIGRATION_BACKFILL_PAUSE_MS / 1000
+        batches = (upper - lower) // batch_size + 1
+        updated = 0
+        for batch, start in enumerate(range(lower, upper + 1, batch_size), 1):
+            statement = (
+                f"UPDATE {step.table_sql} SET {step.column_sql} = {step.value} "
+                f"WHERE id >= {start} AND id < {start + batch_size} AND {step.column_sql} IS NULL"
+            )
+
+            def run_batch() -> int:
+                with self.engine.begin() as conn:
+                    self._set_timeouts(conn, settings.MIGRATION_STATEMENT_TIMEOUT_MS)
+                    return conn.exec_driver_sql(statement).rowcount
+
+            updated += self._with_retry(step.description, run_batch)
+            if batch % 20 == 0 or batch == batches:
+                logger.info(f"{step.description}: lote {batch}/{batches}, {updated} filas")
+            if pause and batch < batches:
+                time.sleep(pause)
+
+    def _with_retry(self, description: str, operation: Callable[[], Any]) -> Any:
+        """Reintenta ante lock_timeout, statement_timeout o deadlock con backoff exponencial"""
+        attempt = 0
+        while True:
+            try:
+                return operation()
+            except DBAPIError as e:
+                reason = RETRYABLE_SQLSTATES.get(getattr(e.orig, "pgcode", None))
+                if reason is None or attempt >= settings.MIGRATION_RETRIES:
+                    logger.error(f"❌ {description}: {str(e.orig).strip()}")
+                    raise
+                attempt += 1
+                delay = settings.MIGRATION_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+                logger.warning(
+                    f"{description}: {reason}, reintento {attempt}/{settings.MIGRATION_RETRIES} en {delay:.1f}s"
+                )
+                time.sleep(delay)
@@ -0,0 +1,161 @@
+# backend\core\generator\query_builder.py
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+from fastapi import HTTPException
+from sqlalchemy import Column
+from sqlalchemy.sql import Select
+from core.metadata.models import TableMetadata
+from utils.pagination import sortable_columns
+
+def _parse_bool(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in ("true", "1", "yes"):
+        return True
+    if lowered in ("false", "0", "no"):
+        return False
+    raise ValueError(f"invalid boolean '{value}'")
+
+def _parse_decimal(value: str) -> Decimal:
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"invalid decimal '{value}'")
+
+class QueryBuilder:
+    """Filtros, ordenamiento y proyección de los endpoints de lista desde metadatos"""
+
+    # Operadores permitidos y conversión del valor según FieldMetadata.field_type
+    TYPE_RULES: Dict[str, Tuple[Tuple[str, ...], Callable[[str], Any]]] = {
+        'string': (('eq', 'ne', 'in', 'ilike'), str),
+        'varchar': (('eq', 'ne', 'in', 'ilike'), str),
+        'text': (('eq', 'ne', 'ilike'), str),
+        'integer': (('eq', 'ne', 'in', 'gt', 'gte', 'lt', 'lte'), int),
+        'float': (('eq', 'ne', 'gt', 'gte', 'lt', 'lte'), float),
+        'decimal': (('eq', 'ne', 'in', 'gt', 'gte', 'lt', 'lte'), _parse_decimal),
+        'boolean': (('eq', 'ne'), _parse_bool),
+        'datetime': (('eq', 'gt', 'gte', 'lt', 'lte'), datetime.fromisoformat),
+        'timestamp': (('eq', 'gt', 'gte', 'lt', 'lte'), datetime.fromisoformat),
+    }
+
+    # Columnas comunes que no están en FieldMetadata
+    BASE_FIELDS = {'id': 'integer', 'created_at': 'datetime', 'updated_at': 'datetime'}
+
+    # Parámetros del endpoint de lista que no son filtros
+    RESERVED_PARAMS = {'cursor', 'limit', 'sort', 'skip', 'fields', 'format'}
+
+    def __init__(self, table_metadata: TableMetadata, model: Type):
+        self.model = model
+        self.table = model.__table__
+        self.field_types: Dict[str, str] = {}
+
+        declared = dict(self.BASE_FIELDS)
+        unique = set()
+        for field in getattr(table_metadata, 'fields', None) or []:
+            declared[field.name] = (field.field_type or 'string').lower()
+            if field.is_unique:
+                unique.add(field.name)
+
+        for name, field_type in declared.items():
+            if name in self.table.c and field_type in self.TYPE_RULES:
+                self.field_types[name] = field_type
+
+        # Solo se ordena (y pagina por cursor) por campos con índice: en una
+        # columna sin índice cada página sería un sort completo de la tabla.
+        # is_unique cuenta aunque el modelo reflejado no lo marque: el
+        # generador de tablas crea el índice único
+        indexed = set(sortable_columns(self.table)) | unique
+        self.sortable: Dict[str, Column] = {
+            name: self.table.c[name] for name in self.field_types if name in indexed
+        }
+
+    def filter_clauses(self, params: Iterable[Tuple[str, str]]) -> List[Any]:
+        """Convierte los query params 'campo[__op]=valor' en cláusulas WHERE.
+
+        Los parámetros que no son campos se ignoran (cache-busters como `_=<ts>`,
+        parámetros de tracking); solo 'x__op' con un campo desconocido da 400,
+        porque esa forma siempre es un filtro.
+        """
+        clauses = []
+        for key, raw in params:
+            if key in self.RESERVED_PARAMS:
+                continue
+            name, separator, op = key.partition('__')
+            op = op or 'eq'
+            if name not in self.field_types:
+                if separator:
+                    raise HTTPException(status_code=400, detail=f"Unknown filter '{key}'")
+                continue
+
+            operators, convert = self.TYPE_RULES[self.field_types[name]]
+            if op not in operators:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Operator '{op}' not allowed for field '{name}'"
+                )
+            try:
+                if op == 'in':
+                    value = [convert(part) for part in raw.split(',') if part != '']
+                else:
+                    value = convert(raw)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Invalid value for filter '{key}': {str(e)}"
+                )
+            clauses.append(self._build_clause(self.table.c[name], op, value))
+        return clauses
+
+    def _build_clause(self, column: Column, op: str, value: Any) -> Any:
+        if op == 'eq':
+            return column == value
+        if op == 'ne':
+            return column != value
+        if op == 'in':
+            return column.in_(value)
+        if op == 'ilike':
+            pattern = value if '%' in value else f"%{value}%"
+            return column.ilike(pattern)
+        if op == 'gt':
+            return column > value
+        if op == 'gte':
+            return column >= value
+        if op == 'lt':
+            return column < value
+        return column <= value
+
+    def parse_fields(self, fields: Optional[str]) -> Optional[List[str]]:
+        """Valida la proyección 'fields=a,b'; None significa todas las columnas"""
+        if not fields:
+            return None
+        names = []
+        for name in fields.split(','):
+            name = name.strip()
+            if not name:
+                continue
+            if name not in self.table.c:
+                raise HTTPException(status_code=400, detail=f"Unknown field '{name}'")
+            if name not in names:
+                names.append(name)
+        return names or None
+
+    def columns(
+        self,
+        fields: Optional[List[str]] = None,
+        extra_columns: Optional[List[Column]] = None
+    ) -> List[Column]:
+        """Columnas a seleccionar: la proyección pedida más las que necesita el cursor"""
+        if not fields:
+            return list(self.table.c)
+        names = list(fields)
+        for column in extra_columns or []:
+            if column.name not in names:
+                names.append(column.name)
+        return [self.table.c[name] for name in names]
+
+    def apply(self, statement: Select, params: Iterable[Tuple[str, str]]) -> Select:
+        """Agrega los filtros de los query params al statement"""
+        clauses = self.filter_clauses(params)
+        if clauses:
+            statement = statement.where(*clauses)
+        return statement
@@ -0,0 +1,251 @@
+# backend\core\generator\router_registry.py
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from importlib import import_module
+from typing import Any, Dict, Iterator, List, Optional, Type
+from fastapi import APIRouter, FastAPI
+from sqlalchemy import MetaData, Table
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, selectinload
+from starlette.concurrency import run_in_threadpool
+from core.cache import cache_backend, metadata_cache
+from core.generator.api_gen import APIGenerator
+from core.metadata.models import TableMetadata
+from core.metadata.versioning import get_metadata_version
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class RouterPlan:
+    """Resultado de leer la metadata: qué routers agregar, reemplazar o quitar"""
+    version: int
+    routers: Dict[str, APIRouter] = field(default_factory=dict)
+    hashes: Dict[str, str] = field(default_factory=dict)
+    removed: List[str] = field(default_factory=list)
+
+class RouterRegistry:
+    """Construye y registra en la app los routers generados desde los metadatos"""
+
+    def __init__(self, app: FastAPI, api_generator: APIGenerator, prefix: str):
+        self.app = app
+        self.api_generator = api_generator
+        self.prefix = prefix
+        self.routers: Dict[str, APIRouter] = {}
+        self.timings: Dict[str, float] = defaultdict(float)
+        # Hash de la metadata y rutas montadas en la app, por tabla
+        self.hashes: Dict[str, str] = {}
+        self.app_routes: Dict[str, List[Any]] = {}
+        self.version: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += time.perf_counter() - start
+
+    def load_tables(self, db: Session) -> List[TableMetadata]:
+        """Toda la metadata en una consulta más una para los campos (sin N+1)"""
+        return (
+            db.query(TableMetadata)
+            .options(selectinload(TableMetadata.fields))
+            .order_by(TableMetadata.id)
+            .all()
+        )
+
+    @staticmethod
+    def resolve_model(table: TableMetadata) -> Type:
+        """Obtiene la clase del modelo generado para la tabla"""
+        module = import_module(f"models.generated.{table.name}")
+        class_name = ''.join(word.capitalize() for word in table.name.split('_'))
+        return getattr(module, class_name)
+
+    @staticmethod
+    def reflect_model(db: Session, table: TableMetadata) -> Type:
+        """Modelo mínimo (solo __table__) reflejado desde la DB.
+
+        Se usa cuando la tabla se creó o cambió en caliente y el módulo en
+        models/generated todavía no existe o quedó desactualizado.
+        """
+        schema = table.db_schema if table.db_schema and table.db_schema != 'public' else None
+        reflected = Table(table.name, MetaData(), autoload_with=db.get_bind(), schema=schema)
+        class_name = ''.join(word.capitalize() for word in table.name.split('_'))
+        return type(class_name, (), {
+            '__table__': reflected,
+            '__module__': f"models.reflected.{table.name}",
+        })
+
+    def table_hash(self, table: TableMetadata, model: Type) -> str:
+        """Hash de todo lo que afecta al router generado para la tabla"""
+        fields = sorted(
+            (field.name, bool(field.is_unique), field.length, field.default_value)
+            for field in table.fields or []
+        )
+        payload = repr((
+            self.api_generator.metadata_hash(table, model),
+            table.db_schema,
+            json.dumps(table.ui_settings, sort_keys=True, default=str),
+            fields,
+        ))
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _model_for(self, db: Session, table: TableMetadata) -> Type:
+        try:
+            model = self.resolve_model(table)
+        except (ImportError, AttributeError):
+            return self.reflect_model(db, table)
+        # Si el modelo importado no coincide con los campos actuales, reflejar
+        expected = {field.name for field in table.fields or []}
+        if expected and not expected <= set(model.__table__.columns.keys()):
+            try:
+                return self.reflect_model(db, table)
+            except SQLAlchemyError as e:
+                logger.warning(f"No se pudo reflejar {table.name}, se usa el modelo generado: {str(e)}")
+        return model
+
+    def plan(self, db: Session, force: bool = False) -> RouterPlan:
+        """Lee la metadata y genera solo los routers de tablas nuevas o modificadas"""
+        with self._phase("load_metadata"):
+            version = get_metadata_version(db)
+            tables = self.load_tables(db)
+
+        plan = RouterPlan(version=version)
+        current = set()
+        for table in tables:
+            current.add(table.name)
+            try:
+                with self._phase("import_models"):
+                    model = self._model_for(db, table)
+                table_hash = self.table_hash(table, model)
+                if not force and self.hashes.get(table.name) == table_hash:
+                    continue
+                with self._phase("generate_routers"):
+                    plan.routers[table.name] = self.api_generator.generate_router(table, model)
+                plan.hashes[table.name] = table_hash
+            except Exception as e:
+                logger.error(
+                    f"❌ Error generando router para {table.name}: {str(e)}",
+                    exc_info=True
+                )
+                continue
+
+        plan.removed = [name for name in self.routers if name not in current]
+        return plan
+
+    def _scratch_router(self) -> APIRouter:
+        """Router vacío con la misma configuración que el router de la app"""
+        app_router = self.app.router
+        return APIRouter(
+            dependencies=list(app_router.dependencies),
+            deprecated=app_router.deprecated,
+            include_in_schema=app_router.include_in_schema,
+            responses=dict(app_router.responses),
+            callbacks=list(app_router.callbacks or []),
+            dependency_overrides_provider=app_router.dependency_overrides_provider,
+            route_class=app_router.route_class,
+            default_response_class=app_router.default_response_class,
+            generate_unique_id_function=app_router.generate_unique_id_function,
+        )
+
+    def apply(self, plan: RouterPlan) -> None:
+        """Monta el plan en la app reemplazando la lista de rutas de una sola vez.
+
+        La lista nueva se arma aparte y la única modificación de la app es la
+        asignación final: los requests en curso siguen usando la lista anterior
+        y los nuevos ven la lista completa ya actualizada, nunca un estado intermedio.
+        """
+        with self._phase("include_routers"):
+            routes = list(self.app.router.routes)
+            for name in plan.removed:
+                old = {id(route) for route in self.app_routes.pop(name, [])}
+                routes = [route for route in routes if id(route) not in old]
+                self.routers.pop(name, None)
+                self.hashes.pop(name, None)
+                logger.info(f"🗑️  Router eliminado para tabla: {name}")
+
+            for name, router in plan.routers.items():
+                # Las rutas se generan en un router auxiliar con la configuración
+                # del de la app (overrides, response class) y se ubican en la
+                # lista nueva: la app no se toca hasta la asignación final
+                scratch = self._scratch_router()
+                scratch.include_router(router, prefix=f"{self.prefix}/{name}", tags=[name])
+                new_routes = scratch.routes
+                old = {id(route) for route in self.app_routes.get(name, [])}
+                if old:
+                    # Mantener la posición original de las rutas de la tabla
+                    position = next(i for i, route in enumerate(routes) if id(route) in old)
+                    routes = [route for route in routes if id(route) not in old]
+                    routes[position:position] = new_routes
+                else:
+                    routes.extend(new_routes)
+                self.app_routes[name] = new_routes
+                self.routers[name] = router
+                self.hashes[name] = plan.hashes[name]
+                logger.info(f"✅ Router generado para tabla: {name}")
+
+            self.app.router.routes = routes
+            if plan.routers or plan.removed:
+                # Regenerar /docs con las rutas nuevas
+                self.app.openapi_schema = None
+        self.version = plan.version
+
+    def register_all(self, db: Session) -> None:
+        """Genera y registra los routers de todas las tablas, midiendo cada fase"""
+        self.timings.clear()
+        self.apply(self.plan(db, force=True))
+
+        total = sum(self.timings.values())
+        logger.info(
+            "Routers dinámicos: %d tablas en %.1f ms (%s)",
+            len(self.routers),
+            total * 1000,
+            ", ".join(f"{name}={value * 1000:.1f}ms" for name, value in self.timings.items())
+        )
+
+    async def reload(self, session_factory) -> bool:
+        """Sincroniza los routers si cambió la versión de la metadata"""
+        async with self._lock:
+            def build() -> Optional[RouterPlan]:
+                db = session_factory()
+                try:
+                    if get_metadata_version(db) == self.version:
+                        return None
+                    if not cache_backend.shared:
+                        # Con cache por proceso este worker no vio la invalidación
+                        # del que escribió: se descarta la metadata cacheada acá
+                        metadata_cache.invalidate()
+                    return self.plan(db)
+                finally:
+                    db.close()
+
+            # Las consultas y la generación van al threadpool; el montaje se
+            # hace en el event loop, entre requests
+            plan = await run_in_threadpool(build)
+            if plan is None:
+                return False
+            self.timings.clear()
+            self.apply(plan)
+            logger.info(
+                "Routers dinámicos recargados (versión %d): %d nuevos/modificados, %d eliminados",
+                plan.version, len(plan.routers), len(plan.removed)
+            )
+            return True
+
+    async def watch(self, session_factory, interval: float) -> None:
+        """Consulta periódicamente la versión de la metadata y recarga los routers"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reload(session_factory)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error recargando routers dinámicos: {str(e)}", exc_info=True)
@@ -0,0 +1,336 @@
+# backend\core\generator\schema_diff.py
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import Index, Table, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Orden de aplicación: primero lo que crea estructura, las FK cuando ya
+# existen todas las tablas y al final lo destructivo
+CHANGE_ORDER = (
+    "create_table",
+    "add_column",
+    "alter_column",
+    "drop_unique",
+    "create_unique",
+    "add_foreign_key",
+    "drop_column",
+)
+
+# Nombres que la base devuelve al reflejar para tipos que se declaran distinto
+TYPE_ALIASES = {
+    "FLOAT": "DOUBLE PRECISION",
+    "FLOAT(53)": "DOUBLE PRECISION",
+    "DOUBLE": "DOUBLE PRECISION",
+    "TIMESTAMP": "TIMESTAMP WITHOUT TIME ZONE",
+    "DATETIME": "TIMESTAMP WITHOUT TIME ZONE",
+}
+
+@dataclass
+class SchemaChange:
+    """Un cambio del plan: la sentencia DDL y qué la motiva"""
+    kind: str
+    table: str
+    description: str
+    sql: str
+    column: Optional[str] = None
+    # Datos para reescribir el cambio (ej. core.generator.online_migration)
+    details: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass
+class ForeignKeySpec:
+    """FK deseada según RelationshipMetadata"""
+    name: str
+    table: Table
+    column: str
+    target_table: str
+    target_column: str
+    target_schema: Optional[str] = None
+
+@dataclass
+class MigrationPlan:
+    """Cambios necesarios para llevar la base a la metadata"""
+    changes: List[SchemaChange] = field(default_factory=list)
+    # Diferencias detectadas que no se aplican (dialecto o allow_drop)
+    skipped: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def __iter__(self) -> Iterator[SchemaChange]:
+        return iter(sorted(self.changes, key=lambda change: CHANGE_ORDER.index(change.kind)))
+
+    def add(
+        self,
+        kind: str,
+        table: str,
+        description: str,
+        sql: str,
+        column: Optional[str] = None,
+        **details: Any
+    ) -> None:
+        self.changes.append(SchemaChange(kind, table, description, sql, column, details))
+
+    def render(self) -> str:
+        """El plan como script SQL comentado (para dry-run)"""
+        if not self.changes and not self.skipped:
+            return "-- Sin cambios: el esquema coincide con la metadata"
+        lines = []
+        for change in self:
+            lines.append(f"-- {change.table}: {change.description}")
+            lines.append(f"{change.sql};")
+        for note in self.skipped:
+            lines.append(f"-- OMITIDO: {note}")
+        return "\n".join(lines)
+
+def _type_signature(type_: Any, dialect: Any) -> Optional[str]:
+    try:
+        compiled = type_.compile(dialect=dialect)
+    except Exception:
+        return None
+    compiled = " ".join(compiled.upper().split())
+    return TYPE_ALIASES.get(compiled, compiled)
+
+def _normalize_default(value: Any) -> Optional[str]:
+    """Normaliza un server default para comparar lo declarado con lo reflejado"""
+    if value is None:
+        return None
+    value = str(getattr(value, "text", value)).strip()
+    # Postgres devuelve los literales con cast ('open'::character varying)
+    value = re.sub(r"::[\w\s\".]+(\[\])?", "", value)
+    while value.startswith("(") and value.endswith(")"):
+        value = value[1:-1].strip()
+    if value.lower() in ("now()", "current_timestamp"):
+        return "CURRENT_TIMESTAMP"
+    return value
+
+class SchemaDiff:
+    """Compara tablas deseadas (sqlalchemy.Table) con la base reflejada.
+
+    Genera solo el DDL necesario: CREATE TABLE para las que faltan, ADD/ALTER/
+    DROP COLUMN, índices únicos y foreign keys. Las columnas que sobran solo
+    se borran con allow_drop. Lo que el dialecto no permite (ALTER COLUMN en
+    SQLite) queda en plan.skipped.
+    """
+
+    def __init__(self, engine: Engine, allow_drop: bool = False):
+        self.engine = engine
+        self.dialect = engine.dialect
+        self.preparer = engine.dialect.identifier_preparer
+        # Inspector nuevo por diff: el de la instancia cachea la reflexión
+        self.inspector = inspect(engine)
+        self.allow_drop = allow_drop
+
+    def diff(self, tables: List[Table], foreign_keys: List[ForeignKeySpec]) -> MigrationPlan:
+        plan = MigrationPlan()
+        for table in tables:
+            if not self.inspector.has_table(table.name, schema=table.schema):
+                plan.add("create_table", table.name, "crear tabla", str(CreateTable(table).compile(self.engine)).strip())
+                continue
+            self._diff_columns(plan, table)
+            self._diff_unique(plan, table)
+        self._diff_foreign_keys(plan, foreign_keys)
+        return plan
+
+    # --- Helpers de SQL ---------------------------------------------------
+    def _table_sql(self, table: Table) -> str:
+        return self.preparer.format_table(table)
+
+    def _quote(self, name: str) -> str:
+        return self.preparer.quote(name)
+
+    def _index_sql(self, table: Table, name: str) -> str:
+        if table.schema:
+            return f"{self.preparer.quote_schema(table.schema)}.{self._quote(name)}"
+        return self._quote(name)
+
+    def _alter_column(
+        self,
+        plan: MigrationPlan,
+        table: Table,
+        column: str,
+        description: str,
+        clause: str,
+        **details: Any
+    ) -> None:
+        if self.dialect.name == "sqlite":
+            plan.skipped.append(f"{table.name}.{column}: {description} (SQLite no soporta ALTER COLUMN, hay que recrear la tabla)")
+            return
+        plan.add(
+            "alter_column",
+            table.name,
+            description,
+            f"ALTER TABLE {self._table_sql(table)} ALTER COLUMN {self._quote(column)} {clause}",
+            column,
+            table_sql=self._table_sql(table),
+            column_sql=self._quote(column),
+            **details
+        )
+
+    # --- Columnas ---------------------------------------------------------
+    def _diff_columns(self, plan: MigrationPlan, table: Table) -> None:
+        reflected = {
+            column["name"]: column
+            for column in self.inspector.get_columns(table.name, schema=table.schema)
+        }
+        for column in table.columns:
+            current = reflected.get(column.name)
+            if current is None:
+                plan.add(
+                    "add_column",
+                    table.name,
+                    f"agregar columna {column.name}",
+                    f"ALTER TABLE {self._table_sql(table)} ADD COLUMN {CreateColumn(column).compile(self.engine)}",
+                    column.name,
+                    table_sql=self._table_sql(table),
+                    column_sql=self._quote(column.name),
+                    type_sql=column.type.compile(dialect=self.dialect),
+                    nullable=bool(column.nullable),
+                    default=_normalize_default(column.server_default.arg if column.server_default is not None else None)
+                )
+            elif not column.primary_key:
+                self._diff_column(plan, table, column, current)
+
+        for name in reflected.keys() - set(table.columns.keys()):
+            if not self.allow_drop:
+                plan.skipped.append(f"{table.name}.{name}: columna sin metadata (usar allow_drop para borrarla)")
+                continue
+            plan.add(
+                "drop_column",
+                table.name,
+                f"borrar columna {name}",
+                f"ALTER TABLE {self._table_sql(table)} DROP COLUMN {self._quote(name)}",
+                name,
+                table_sql=self._table_sql(table)
+            )
+
+    def _diff_column(self, plan: MigrationPlan, table: Table, column: Any, current: Dict[str, Any]) -> None:
+        wanted_default = _normalize_default(column.server_default.arg if column.server_default is not None else None)
+        current_default = _normalize_default(current.get("default"))
+
+        wanted_type = _type_signature(column.type, self.dialect)
+        current_type = _type_signature(current["type"], self.dialect)
+        if wanted_type and current_type and wanted_type != current_type:
+            type_sql = column.type.compile(dialect=self.dialect)
+            self._alter_column(
+                plan, table, column.name,
+                f"tipo de {column.name}: {current_type} -> {wanted_type}",
+                f"TYPE {type_sql} USING {self._quote(column.name)}::{type_sql}",
+                action="type"
+            )
+
+        # El default va antes que NOT NULL: las filas nuevas ya no llegan con NULL
+        if wanted_default != current_default:
+            self._alter_column(
+                plan, table, column.name,
+                f"default de {column.name}: {current_default} -> {wanted_default}",
+                f"SET DEFAULT {wanted_default}" if wanted_default is not None else "DROP DEFAULT",
+                action="default"
+            )
+
+        if bool(column.nullable) != bool(current["nullable"]):
+            self._alter_column(
+                plan, table, column.name,
+                f"{column.name} {'acepta' if column.nullable else 'no acepta'} NULL",
+                "DROP NOT NULL" if column.nullable else "SET NOT NULL",
+                action="nullable",
+                nullable=bool(column.nullable),
+                default=wanted_default
+            )
+
+    # --- Unicidad ---------------------------------------------------------
+    def _unique_columns(self, table: Table) -> Dict[str, Tuple[str, Optional[str]]]:
+        """columna -> (constraint|index, nombre) para unicidades de una sola columna"""
+        unique: Dict[str, Tuple[str, Optional[str]]] = {}
+        for constraint in self.inspector.get_unique_constraints(table.name, schema=table.schema):
+            if len(constraint["column_names"]) == 1:
+                unique[constraint["column_names"][0]] = ("constraint", constraint.get("name"))
+        for index in self.inspector.get_indexes(table.name, schema=table.schema):
+            columns = index["column_names"]
+            if index.get("unique") and len(columns) == 1 and not index.get("duplicates_constraint"):
+                unique.setdefault(columns[0], ("index", index.get("name")))
+        return unique
+
+    def _diff_unique(self, plan: MigrationPlan, table: Table) -> None:
+        existing = self._unique_columns(table)
+        wanted = {column.name for column in table.columns if column.unique and not column.primary_key}
+
+        for name in sorted(wanted - existing.keys()):
+            # Índice suelto (no se agrega a la Table) para que CreateTable no lo repita
+            index_name = f"uq_{table.name}_{name}"[:63]
+            index = Index(index_name, table.columns[name], unique=True)
+            table.indexes.discard(index)
+            plan.add(
+                "create_unique",
+                table.name,
+                f"{name} único",
+                str(CreateIndex(index).compile(self.engine)),
+                name,
+                table_sql=self._table_sql(table),
+                column_sql=self._quote(name),
+                index=self._quote(index_name),
+                index_sql=self._index_sql(table, index_name)
+            )
+
+        for name in sorted(existing.keys() - wanted):
+            if name not in table.columns or table.columns[name].primary_key:
+                continue
+            kind, constraint_name = existing[name]
+            if constraint_name is None or (kind == "constraint" and self.dialect.name == "sqlite"):
+                plan.skipped.append(f"{table.name}.{name}: la unicidad no se puede quitar sin recrear la tabla")
+                continue
+            if kind == "constraint":
+                sql = f"ALTER TABLE {self._table_sql(table)} DROP CONSTRAINT {self._quote(constraint_name)}"
+            else:
+                sql = f"DROP INDEX {self._index_sql(table, constraint_name)}"
+            plan.add(
+                "drop_unique",
+                table.name,
+                f"{name} deja de ser único",
+                sql,
+                name,
+                table_sql=self._table_sql(table),
+                unique_kind=kind,
+                index_sql=self._index_sql(table, constraint_name)
+            )
+
+    # --- Foreign keys -----------------------------------------------------
+    def _diff_foreign_keys(self, plan: MigrationPlan, foreign_keys: List[ForeignKeySpec]) -> None:
+        reflected: Dict[Tuple[str, Optional[str]], List[Dict[str, Any]]] = {}
+        for spec in foreign_keys:
+            key = (spec.table.name, spec.table.schema)
+            if key not in reflected:
+                exists = self.inspector.has_table(spec.table.name, schema=spec.table.schema)
+                reflected[key] = self.inspector.get_foreign_keys(*key) if exists else []
+            present = any(
+                fk["constrained_columns"] == [spec.column]
+                and fk["referred_table"] == spec.target_table
+                and fk["referred_columns"] == [spec.target_column]
+                for fk in reflected[key]
+            )
+            if present:
+                continue
+            if self.dialect.name == "sqlite":
+                plan.skipped.append(f"{spec.table.name}.{spec.column}: SQLite no soporta ADD CONSTRAINT FOREIGN KEY")
+                continue
+            target = self._quote(spec.target_table)
+            if spec.target_schema:
+                target = f"{self.preparer.quote_schema(spec.target_schema)}.{target}"
+            definition = f"FOREIGN KEY ({self._quote(spec.column)}) REFERENCES {target} ({self._quote(spec.target_column)})"
+            plan.add(
+                "add_foreign_key",
+                spec.table.name,
+                f"foreign key {spec.column} -> {spec.target_table}.{spec.target_column}",
+                f"ALTER TABLE {self._table_sql(spec.table)} ADD CONSTRAINT {self._quote(spec.name)} {definition}",
+                spec.column,
+                table_sql=self._table_sql(spec.table),
+                constraint=self._quote(spec.name),
+                definition=definition
+            )
@@ -0,0 +1,94 @@
+# backend\core\generator\serializers.py
+from datetime import date, datetime, time
+from decimal import Decimal
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+from fastapi.responses import Response
+from sqlalchemy import Column
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat()
+
+def _converter_for(column: Column) -> Optional[Callable[[Any], Any]]:
+    """Elige la conversión JSON de una columna según su tipo (None = sin conversión)"""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return None
+    if python_type in (datetime, date, time):
+        return _isoformat
+    if python_type is Decimal:
+        return float
+    return None
+
+class RowSerializer:
+    """Serializador compilado una vez por modelo (y por proyección de columnas).
+
+    Lee los valores con un único attrgetter y aplica solo los conversores de las
+    columnas que lo necesitan, en vez de recorrer __table__.columns por fila.
+    Funciona tanto con instancias ORM como con Row de SQLAlchemy Core.
+    """
+
+    def __init__(self, model: Type, fields: Optional[Sequence[str]] = None):
+        self.model = model
+        columns = [
+            column for column in model.__table__.columns
+            if fields is None or column.name in fields
+        ]
+        # str(): las tablas reflejadas usan quoted_name, que orjson no acepta como clave
+        self.names: Tuple[str, ...] = tuple(str(column.name) for column in columns)
+        self._converters: Tuple[Tuple[int, Callable[[Any], Any]], ...] = tuple(
+            (index, converter)
+            for index, converter in enumerate(_converter_for(column) for column in columns)
+            if converter is not None
+        )
+        getter = attrgetter(*self.names)
+        if len(self.names) == 1:
+            self._getter = lambda obj: (getter(obj),)
+        else:
+            self._getter = getter
+        self._projections: Dict[Tuple[str, ...], "RowSerializer"] = {}
+
+    def __call__(self, obj: Any) -> Dict[str, Any]:
+        values = self._getter(obj)
+        if self._converters:
+            values = list(values)
+            for index, converter in self._converters:
+                value = values[index]
+                if value is not None:
+                    values[index] = converter(value)
+        return dict(zip(self.names, values))
+
+    def many(self, objs: Iterable[Any]) -> List[Dict[str, Any]]:
+        """Serializa una lista de filas"""
+        return [self(obj) for obj in objs]
+
+    def project(self, fields: Optional[Sequence[str]]) -> "RowSerializer":
+        """Serializador para un subconjunto de columnas (cacheado por proyección)"""
+        if not fields:
+            return self
+        key = tuple(fields)
+        serializer = self._projections.get(key)
+        if serializer is None:
+            serializer = RowSerializer(self.model, key)
+            self._projections[key] = serializer
+        return serializer
+
+def dumps(content: Any) -> bytes:
+    """Codifica a JSON con orjson si está instalado"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+class FastJSONResponse(Response):
+    """Respuesta JSON ya serializada: evita el paso de jsonable_encoder de FastAPI"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
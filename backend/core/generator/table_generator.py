@@ -3,10 +3,11 @@ from sqlalchemy import JSON, Table, Column, Integer, String, Float, ForeignKey,
 from core.database.database import engine
 from sqlalchemy.dialects.postgresql import JSONB
 from core.metadata.models import TableMetadata, FieldMetadata, RelationshipMetadata
-from sqlalchemy.schema import CreateTable
+from core.generator.online_migration import OnlineMigrationExecutor
+from core.generator.schema_diff import ForeignKeySpec, MigrationPlan, SchemaDiff
 import logging
 from collections import defaultdict
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -33,14 +34,16 @@ class TableGenerator:
         """Construye un grafo de dependencias entre tablas"""
         dependencies = defaultdict(set)
         relationships = db.query(RelationshipMetadata).all()
+        # Nombres de todas las tablas en una consulta (antes: dos get() por relación)
+        table_names = dict(db.query(TableMetadata.id, TableMetadata.name).all())
         
         for rel in relationships:
-            source_table = db.query(TableMetadata).get(rel.source_table_id)
-            target_table = db.query(TableMetadata).get(rel.target_table_id)
+            source_table = table_names.get(rel.source_table_id)
+            target_table = table_names.get(rel.target_table_id)
             
             if source_table and target_table:
                 # La tabla source depende de target (necesita que target exista primero)
-                dependencies[source_table.name].add(target_table.name)
+                dependencies[source_table].add(target_table)
                 
         return dependencies
 
@@ -71,91 +74,116 @@ class TableGenerator:
         standalone_tables = [t for t in all_tables if t not in order]
         return standalone_tables + order
 
-    def generate_tables(self, db):
-        """Genera las tablas físicas desde la metadata"""
+    def build_schema(self, db) -> Tuple[List[Table], List[ForeignKeySpec]]:
+        """Arma las tablas deseadas (y sus FK) desde la metadata, sin tocar la base"""
+        self.metadata = MetaData()
+        tables_metadata = db.query(TableMetadata).all()
+        logger.info(f"Encontradas {len(tables_metadata)} tablas en metadata")
+
+        # Campos y relaciones en una consulta cada uno (no una por tabla)
+        fields_by_table = defaultdict(list)
+        for field in db.query(FieldMetadata).order_by(FieldMetadata.id).all():
+            fields_by_table[field.table_id].append(field)
+        tables_by_id = {table_meta.id: table_meta for table_meta in tables_metadata}
+        relationships_by_table = defaultdict(list)
+        for rel in db.query(RelationshipMetadata).all():
+            if rel.source_table_id in tables_by_id and rel.target_table_id in tables_by_id and rel.source_field:
+                relationships_by_table[rel.source_table_id].append(rel)
+
+        tables = []
+        foreign_keys = []
+        for table_meta in tables_metadata:
+            try:
+                logger.info(f"\n=== Procesando tabla: {table_meta.name} ===")
+                columns = [
+                    Column('id', Integer, primary_key=True),
+                    Column('created_at', DateTime, server_default=text('CURRENT_TIMESTAMP')),
+                    Column('updated_at', DateTime, server_default=text('CURRENT_TIMESTAMP'), onupdate=text('CURRENT_TIMESTAMP')),
+                ]
+                column_names = {column.name for column in columns}
+                for field in fields_by_table[table_meta.id]:
+                    if field.name in column_names:
+                        continue
+                    columns.append(self._create_column(field))
+                    column_names.add(field.name)
+
+                # Columna de la FK si la relación no tiene un campo propio
+                for rel in relationships_by_table[table_meta.id]:
+                    if rel.source_field not in column_names:
+                        columns.append(Column(rel.source_field, Integer))
+                        column_names.add(rel.source_field)
+
+                table = Table(table_meta.name, self.metadata, *columns, schema=table_meta.db_schema)
+                tables.append(table)
+
+                for rel in relationships_by_table[table_meta.id]:
+                    target = tables_by_id[rel.target_table_id]
+                    foreign_keys.append(ForeignKeySpec(
+                        name=f"fk_{table_meta.name}_{rel.source_field}"[:63],
+                        table=table,
+                        column=rel.source_field,
+                        target_table=target.name,
+                        target_column=rel.target_field or 'id',
+                        target_schema=target.db_schema,
+                    ))
+            except Exception as e:
+                logger.error(f"❌ Error procesando tabla {table_meta.name}: {str(e)}")
+                raise
+
+        return tables, foreign_keys
+
+    def plan_migration(self, db, allow_drop: bool = False) -> MigrationPlan:
+        """Compara la metadata con la base y devuelve el DDL necesario"""
+        tables, foreign_keys = self.build_schema(db)
+        return SchemaDiff(self.engine, allow_drop=allow_drop).diff(tables, foreign_keys)
+
+    def apply_plan(self, plan: MigrationPlan) -> None:
+        """Ejecuta el plan en una sola transacción: o se aplica todo o nada"""
+        with self.engine.begin() as conn:
+            for change in plan:
+                logger.info(f"{change.table}: {change.description}\n{change.sql}")
+                conn.exec_driver_sql(change.sql)
+        # La reflexión cacheada quedó vieja
+        self.inspector = inspect(self.engine)
+
+    def generate_tables(
+        self,
+        db,
+        dry_run: bool = False,
+        allow_drop: bool = False,
+        online: bool = False
+    ) -> MigrationPlan:
+        """Lleva las tablas físicas a lo que dice la metadata.
+
+        Solo emite el DDL que falta (tablas nuevas, columnas agregadas o
+        modificadas, unicidad y foreign keys). Con dry_run devuelve el plan sin
+        ejecutarlo; las columnas sin metadata solo se borran con allow_drop.
+        Con online (PostgreSQL) el plan lo aplica OnlineMigrationExecutor, sin
+        locks largos, para tablas grandes en producción.
+        """
         try:
-            tables_metadata = db.query(TableMetadata).all()
-            logger.info(f"Encontradas {len(tables_metadata)} tablas en metadata")
-
-            for table_meta in tables_metadata:
-                try:
-                    logger.info(f"\n=== Procesando tabla: {table_meta.name} ===")
-                    
-                    # Obtener campos de la tabla y mostrar la consulta SQL
-                    fields_query = db.query(FieldMetadata).filter(FieldMetadata.table_id == table_meta.id)
-                    logger.info("Campos encontrados:")
-                    fields = fields_query.all()
-
-                    # Crear columnas
-                    columns = []
-                    # Asegurar que existe la columna ID
-                    columns.append(Column('id', Integer, primary_key=True))
-                    logger.info("✅ Agregada columna 'id' automáticamente")
-                    
-                    # Agregar timestamps (importante)
-                    columns.append(Column('created_at', DateTime, server_default=text('CURRENT_TIMESTAMP')))
-                    columns.append(Column('updated_at', DateTime, server_default=text('CURRENT_TIMESTAMP'), onupdate=text('CURRENT_TIMESTAMP')))
-                    logger.info("✅ Agregadas columnas de timestamp")
-                    
-                    for field in fields:
-                        try:
-                            # Debug de cada campo
-                            logger.info(f"\nProcesando campo: {field.name}")
-                            logger.info(f"Tipo: {field.field_type}")
-                            logger.info(f"Length: {field.length}")
-                            logger.info(f"Nullable: {field.is_nullable}")
-                            logger.info(f"Unique: {field.is_unique}")
-                            logger.info(f"Default: {field.default_value}")
-
-                            # Obtener tipo de columna
-                            field_type = self.type_mapping.get(field.field_type.lower())
-                            if not field_type:
-                                logger.warning(f"⚠️ Tipo no soportado: {field.field_type}, usando String")
-                                field_type = String
-
-                            # Crear argumentos de la columna
-                            column_args = {
-                                'nullable': field.is_nullable,
-                                'unique': field.is_unique
-                            }
-
-                            # Manejar length para strings
-                            if field.length and field_type == String:
-                                field_type = String(field.length)
-
-                            # Manejar valor por defecto
-                            if field.default_value:
-                                column_args['server_default'] = text(field.default_value)
-
-                            # Crear columna
-                            column = Column(field.name, field_type, **column_args)
-                            columns.append(column)
-                            logger.info(f"✅ Columna {field.name} creada exitosamente")
-
-                        except Exception as e:
-                            logger.error(f"❌ Error creando columna {field.name}: {str(e)}")
-                            raise
-
-                    # Crear tabla
-                    logger.info(f"\nCreando tabla {table_meta.name} con {len(columns)} columnas")
-                    table = Table(
-                        table_meta.name,
-                        self.metadata,
-                        *columns,
-                        schema=table_meta.db_schema
-                    )
-
-                    # Generar SQL
-                    create_sql = str(CreateTable(table).compile(self.engine))
-                    logger.info(f"SQL generado:\n{create_sql}")
-
-                    # Crear tabla
-                    table.create(self.engine)
-                    logger.info(f"✅ Tabla {table_meta.name} creada exitosamente")
-
-                except Exception as e:
-                    logger.error(f"❌ Error procesando tabla {table_meta.name}: {str(e)}")
-                    raise
+            plan = self.plan_migration(db, allow_drop=allow_drop)
+            for note in plan.skipped:
+                logger.warning(f"⚠️ {note}")
+            if not plan:
+                logger.info("✅ El esquema ya coincide con la metadata")
+                return plan
+            if online and not OnlineMigrationExecutor.supports(self.engine):
+                logger.warning(f"⚠️ Migración online no soportada en {self.engine.dialect.name}, se aplica en una transacción")
+                online = False
+            if dry_run:
+                if online:
+                    # Valida el plan online igual que al ejecutarlo
+                    OnlineMigrationExecutor(self.engine).check(plan)
+                logger.info(f"Plan de migración: {len(plan)} cambios (dry-run, no se ejecutó)")
+                return plan
+            if online:
+                OnlineMigrationExecutor(self.engine).execute(plan)
+                self.inspector = inspect(self.engine)
+            else:
+                self.apply_plan(plan)
+            logger.info(f"✅ Migración aplicada: {len(plan)} cambios")
+            return plan
 
         except Exception as e:
             logger.error(f"Error en generate_tables: {str(e)}")
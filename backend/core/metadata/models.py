@@ -65,6 +65,15 @@ class RelationshipMetadata(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+class MetadataVersion(Base):
+    """Versión global de la metadata: cada worker la compara para recargar routers"""
+    __tablename__ = "metadata_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class UITemplate(Base):
     __tablename__ = "ui_templates"
 
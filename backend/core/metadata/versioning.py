@@ -0,0 +1,47 @@
+# backend\core\metadata\versioning.py
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session
+from core.metadata.models import MetadataVersion
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fila única que guarda la versión global de la metadata
+VERSION_ROW_ID = 1
+
+# Marca en session.info: subir la versión en el próximo commit
+PENDING_BUMP = "metadata_version_bump"
+
+def get_metadata_version(db: Session) -> int:
+    """Versión actual de la metadata (0 si todavía no hubo cambios)"""
+    version = db.execute(
+        select(MetadataVersion.version).where(MetadataVersion.id == VERSION_ROW_ID)
+    ).scalar()
+    return version or 0
+
+def bump_metadata_version(db: Session) -> None:
+    """Incrementa la versión para que todos los workers recarguen sus routers.
+
+    Corre en la transacción actual y no confirma: la versión se publica en el
+    mismo commit que el cambio de metadata (o se pierde con su rollback).
+    """
+    result = db.execute(
+        update(MetadataVersion)
+        .where(MetadataVersion.id == VERSION_ROW_ID)
+        .values(version=MetadataVersion.version + 1)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(MetadataVersion).values(id=VERSION_ROW_ID, version=1))
+
+def bump_metadata_version_on_commit(db: Session) -> None:
+    """Sube la versión dentro del próximo commit de la sesión (escrituras que confirman solas)"""
+    db.info[PENDING_BUMP] = True
+
+@event.listens_for(Session, "before_commit")
+def _bump_pending_version(session: Session) -> None:
+    if session.info.pop(PENDING_BUMP, False):
+        bump_metadata_version(session)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_version(session: Session) -> None:
+    session.info.pop(PENDING_BUMP, None)
@@ -0,0 +1,69 @@
+# backend\core\metrics\__init__.py
+from core.metrics.registry import DEFAULT_BUCKETS, Histogram, Registry, Value
+
+# Extensión OpenAPI con la que los routers generados declaran su tabla
+TABLE_EXTRA = "x-table"
+
+metrics = Registry()
+
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds",
+    "Latencia de los requests HTTP por ruta",
+    ("method", "route", "table", "status")
+)
+DB_QUERY_SECONDS = metrics.histogram(
+    "db_query_duration_seconds",
+    "Duración de las consultas SQL",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+DB_POOL_WAIT_SECONDS = metrics.histogram(
+    "db_pool_wait_seconds",
+    "Espera para obtener una conexión del pool",
+    ("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+)
+DB_POOL_HOLD_SECONDS = metrics.histogram(
+    "db_pool_hold_seconds",
+    "Tiempo entre checkout y checkin de una conexión",
+    ("pool",)
+)
+DB_POOL_CONNECTION_AGE_SECONDS = metrics.histogram(
+    "db_pool_connection_age_seconds",
+    "Antigüedad de la conexión al momento del checkout",
+    ("pool",),
+    buckets=(1, 10, 60, 300, 900, 1800, 3600, 7200)
+)
+DB_POOL_SIZE = metrics.gauge("db_pool_size", "Tamaño configurado del pool", ("pool",))
+DB_POOL_MAX_OVERFLOW = metrics.gauge("db_pool_max_overflow", "Overflow máximo vigente (cambia en modo adaptativo)", ("pool",))
+DB_POOL_CHECKED_OUT = metrics.gauge("db_pool_checked_out", "Conexiones en uso", ("pool",))
+DB_POOL_OVERFLOW = metrics.gauge("db_pool_overflow", "Conexiones por encima de pool_size", ("pool",))
+DB_POOL_WAITING = metrics.gauge("db_pool_waiting", "Checkouts esperando una conexión", ("pool",))
+DB_POOL_SATURATION = metrics.gauge("db_pool_saturation", "Conexiones en uso / (pool_size + max_overflow)", ("pool",))
+DB_POOL_TIMEOUTS = metrics.counter("db_pool_timeouts_total", "Checkouts que agotaron pool_timeout", ("pool",))
+CACHE_HITS = metrics.counter("cache_hits_total", "Hits de cache", ("cache",))
+CACHE_MISSES = metrics.counter("cache_misses_total", "Misses de cache", ("cache",))
+CACHE_HIT_RATIO = metrics.gauge("cache_hit_ratio", "Proporción de hits sobre lookups", ("cache",))
+
+__all__ = [
+    "DEFAULT_BUCKETS",
+    "Histogram",
+    "Registry",
+    "Value",
+    "TABLE_EXTRA",
+    "metrics",
+    "HTTP_REQUEST_SECONDS",
+    "DB_QUERY_SECONDS",
+    "DB_POOL_WAIT_SECONDS",
+    "DB_POOL_HOLD_SECONDS",
+    "DB_POOL_CONNECTION_AGE_SECONDS",
+    "DB_POOL_SIZE",
+    "DB_POOL_MAX_OVERFLOW",
+    "DB_POOL_CHECKED_OUT",
+    "DB_POOL_OVERFLOW",
+    "DB_POOL_WAITING",
+    "DB_POOL_SATURATION",
+    "DB_POOL_TIMEOUTS",
+    "CACHE_HITS",
+    "CACHE_MISSES",
+    "CACHE_HIT_RATIO",
+]
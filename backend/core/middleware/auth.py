@@ -1,54 +1,84 @@
 # backend\core\middleware\auth.py
-from fastapi import Request, HTTPException
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from core.security.auth import SECRET_KEY, ALGORITHM
 from typing import Optional
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from core.middleware.public_paths import PublicPathMatcher
+from core.security.auth import token_verifier
 import jwt
+import logging
 
-security = HTTPBearer()
+logger = logging.getLogger(__name__)
 
 class AuthMiddleware:
-    def __init__(self):
-        self.security = HTTPBearer()
+    """Middleware ASGI de autenticación.
 
-    async def __call__(self, request: Request) -> Optional[dict]:
-        try:
-            # Excluir rutas públicas
-            if self.is_public_path(request.url.path):
-                return None
+    Se registra con app.add_middleware(AuthMiddleware). A diferencia de
+    @app.middleware("http") (BaseHTTPMiddleware) no crea una tarea ni envuelve
+    el stream de la respuesta por request, así que las respuestas en streaming
+    pasan sin buffering. Los errores se responden directamente con 401/403 en
+    lugar de lanzar HTTPException fuera del alcance de los exception handlers.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        # Compilado desde las rutas de la app; se recompila solo si cambian
+        self.public_paths = PublicPathMatcher()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        error = self.authenticate(scope)
+        if error is not None:
+            await error(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+    def authenticate(self, scope: Scope) -> Optional[JSONResponse]:
+        """Valida el token y lo deja en request.state; devuelve la respuesta de error si falla"""
+        # Excluir rutas públicas
+        if self.is_public_path(scope):
+            return None
 
-            credentials: HTTPAuthorizationCredentials = await security(request)
-            if not credentials:
-                raise HTTPException(status_code=403, detail="Invalid authorization code.")
-
-            token = credentials.credentials
-            # Verificar y decodificar el token
-            payload = jwt.decode(
-                token, 
-                SECRET_KEY, 
-                algorithms=[ALGORITHM]
-            )
-            
-            # Agregar información del usuario al request state
-            request.state.user = payload
-            return payload
+        token = self.bearer_token(scope)
+        if token is None:
+            return self.error(403, "Not authenticated")
 
+        try:
+            # Verificar y decodificar el token (una vez por token, cacheado)
+            verified = token_verifier.verify(token)
         except jwt.ExpiredSignatureError:
-            raise HTTPException(status_code=401, detail="Token has expired")
-        except jwt.JWTError:
-            raise HTTPException(status_code=403, detail="Could not validate credentials")
+            return self.error(401, "Token has expired")
+        except jwt.InvalidTokenError:
+            return self.error(403, "Could not validate credentials")
         except Exception as e:
-            raise HTTPException(status_code=403, detail=str(e))
+            logger.error(f"Error validando el token: {str(e)}")
+            return self.error(403, str(e))
+
+        # Agregar información del usuario al request state; las
+        # dependencias reutilizan el token ya verificado
+        state = scope.setdefault("state", {})
+        state["token"] = verified
+        state["user"] = verified.claims
+        return None
 
-    def is_public_path(self, path: str) -> bool:
+    def is_public_path(self, scope: Scope) -> bool:
         """Verificar si la ruta es pública"""
-        public_paths = [
-            "/docs",
-            "/redoc",
-            "/openapi.json",
-            "/api/v1/auth/login",
-            "/api/v1/auth/register",
-            "/health",
-            "/"
-        ]
-        return any(path.startswith(public_path) for public_path in public_paths)
\ No newline at end of file
+        return self.public_paths.is_public(scope["app"], scope["method"], scope["path"])
+
+    @staticmethod
+    def bearer_token(scope: Scope) -> Optional[str]:
+        """Token del header Authorization: Bearer <token>"""
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, credentials = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and credentials.strip():
+                    return credentials.strip()
+                return None
+        return None
+
+    @staticmethod
+    def error(status_code: int, detail: str) -> JSONResponse:
+        headers = {"WWW-Authenticate": "Bearer"} if status_code == 401 else None
+        return JSONResponse({"detail": detail}, status_code=status_code, headers=headers)
@@ -0,0 +1,65 @@
+# backend\core\middleware\metrics.py
+from typing import Any, Optional
+from fastapi.routing import APIRoute
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from core.metrics import HTTP_REQUEST_SECONDS, TABLE_EXTRA
+import time
+
+# Requests que no matchean ninguna ruta comparten etiqueta (evita cardinalidad sin límite)
+UNMATCHED = "<unmatched>"
+
+# Rechazos del middleware de auth: cortan antes del router
+REJECTED = frozenset({401, 403})
+
+class MetricsMiddleware:
+    """Histograma de latencia por ruta (template, no path concreto) y tabla generada.
+
+    Se registra último para quedar por fuera de todos los middlewares y medir
+    también los 401/403 de AuthMiddleware; como esos no pasan por el router,
+    su ruta se resuelve acá.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # El router deja la ruta que matcheó en el scope
+            route = scope.get("route")
+            if route is None and status_code in REJECTED:
+                route = self.resolve_route(scope)
+            if isinstance(route, APIRoute):
+                template = route.path
+                table = (route.openapi_extra or {}).get(TABLE_EXTRA, "")
+            else:
+                template, table = UNMATCHED, ""
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                (scope["method"], template, table, str(status_code))
+            )
+
+    @staticmethod
+    def resolve_route(scope: Scope) -> Optional[Any]:
+        """Ruta de la app que corresponde al request (solo para los que no llegaron al router)"""
+        app = scope.get("app")
+        for route in getattr(getattr(app, "router", None), "routes", ()):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route
+        return None
@@ -0,0 +1,128 @@
+# backend\core\middleware\public_paths.py
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, List, Optional, Pattern, Set, Tuple
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from starlette.convertors import PathConvertor
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Marca de ruta pública: @router.get(..., openapi_extra=public_route())
+PUBLIC_FLAG = "x-public"
+ANY_METHOD = "*"
+
+def public_route() -> Dict[str, Any]:
+    """openapi_extra que declara la ruta como pública (también queda en OpenAPI)"""
+    return {PUBLIC_FLAG: True}
+
+class _Node:
+    """Nodo del trie de segmentos; `param` es el hijo comodín ({item_id})"""
+    __slots__ = ("children", "param", "methods")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.param: Optional["_Node"] = None
+        self.methods: Set[str] = set()
+
+    def insert(self, segments: List[str], methods: FrozenSet[str]) -> None:
+        node = self
+        for segment in segments:
+            if segment.startswith("{"):
+                node.param = node.param or _Node()
+                node = node.param
+            else:
+                node = node.children.setdefault(segment, _Node())
+        node.methods |= methods
+
+    def match(self, segments: List[str], index: int, method: str) -> bool:
+        if index == len(segments):
+            return method in self.methods or ANY_METHOD in self.methods
+        segment = segments[index]
+        child = self.children.get(segment)
+        if child is not None and child.match(segments, index + 1, method):
+            return True
+        # Un parámetro de path ocupa un segmento no vacío
+        return bool(segment) and self.param is not None and self.param.match(segments, index + 1, method)
+
+class PublicPathMatcher:
+    """Clasificador público/protegido compilado a partir de las rutas de la app.
+
+    Solo son públicas las rutas marcadas con public_route() y las de la
+    documentación. Las rutas sin parámetros van a un dict path -> métodos
+    (búsqueda O(1)) y las que tienen parámetros a un trie por segmentos, así
+    el costo no crece con la cantidad de tablas; solo los parámetros {x:path}
+    usan el regex de Starlette. La compilación se repite solo cuando cambia la
+    tabla de rutas (RouterRegistry la reemplaza por una lista nueva en cada
+    recarga).
+    """
+
+    def __init__(self):
+        self._compiled: Tuple[
+            Optional[List[Any]],
+            Dict[str, FrozenSet[str]],
+            Optional[_Node],
+            Tuple[Tuple[Pattern, FrozenSet[str]], ...]
+        ] = (None, {}, None, ())
+        self.compiles = 0
+
+    def compile(self, app: FastAPI) -> None:
+        routes = app.router.routes
+        exact: Dict[str, Set[str]] = defaultdict(set)
+        trie = _Node()
+        templated = 0
+        patterns: List[Tuple[Pattern, FrozenSet[str]]] = []
+
+        for path in (app.docs_url, app.redoc_url, app.openapi_url, app.swagger_ui_oauth2_redirect_url):
+            if path:
+                exact[path].add(ANY_METHOD)
+
+        for route in routes:
+            if not isinstance(route, APIRoute) or not (route.openapi_extra or {}).get(PUBLIC_FLAG):
+                continue
+            methods = frozenset(route.methods or (ANY_METHOD,))
+            if any(isinstance(convertor, PathConvertor) for convertor in route.param_convertors.values()):
+                patterns.append((route.path_regex, methods))
+                continue
+            if route.param_convertors:
+                trie.insert(route.path.split("/"), methods)
+                templated += 1
+                continue
+            exact[route.path] |= methods
+            # "/api/v1/tabla" redirige a "/api/v1/tabla/": la redirección también es pública
+            if len(route.path) > 1 and route.path.endswith("/"):
+                exact[route.path.rstrip("/")] |= methods
+
+        # Se publica de una sola vez para que los requests concurrentes vean
+        # siempre una versión consistente
+        self._compiled = (
+            routes,
+            {path: frozenset(methods) for path, methods in exact.items()},
+            trie if templated else None,
+            tuple(patterns),
+        )
+        self.compiles += 1
+        logger.debug(
+            "Rutas públicas compiladas: %d exactas, %d con parámetros",
+            len(exact), templated + len(patterns)
+        )
+
+    def is_public(self, app: FastAPI, method: str, path: str) -> bool:
+        """True si el request no necesita token"""
+        # Los preflight de CORS nunca llevan credenciales
+        if method == "OPTIONS":
+            return True
+        routes, exact, trie, patterns = self._compiled
+        if routes is not app.router.routes:
+            self.compile(app)
+            routes, exact, trie, patterns = self._compiled
+
+        methods = exact.get(path)
+        if methods is not None and (method in methods or ANY_METHOD in methods):
+            return True
+        if trie is not None and trie.match(path.split("/"), 0, method):
+            return True
+        for pattern, methods in patterns:
+            if (method in methods or ANY_METHOD in methods) and pattern.match(path):
+                return True
+        return False
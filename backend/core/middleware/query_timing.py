@@ -0,0 +1,33 @@
+# backend\core\middleware\query_timing.py
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from core.database.instrumentation import track_queries
+import time
+
+class QueryTimingMiddleware:
+    """Cuenta las consultas SQL de cada request y las expone en Server-Timing.
+
+    El header se agrega al iniciar la respuesta (en un streaming solo incluye
+    las consultas previas al primer chunk). Al terminar el request se reportan
+    las sentencias repetidas (posible N+1); las consultas lentas se registran
+    en el momento en que terminan.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        with track_queries(f'{scope["method"]} {scope["path"]}') as stats:
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    total = (time.perf_counter() - started) * 1000
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", f"{stats.server_timing()}, total;dur={total:.2f}")
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
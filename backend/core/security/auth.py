@@ -1,24 +1,53 @@
 # backend\core\security\auth.py
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.orm import Session, relationship
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, insert
+from starlette.concurrency import run_in_threadpool
+from config.settings import settings
 from core.database.base import Base
-from core.database.database import get_db
+from core.database import database
 from core.security.roles import user_roles, Role
+from core.security.passwords import PasswordHasher
+from core.security.permissions import permission_resolver
+from core.security.tokens import TokenVerifier, UserSnapshot
+from core.metrics import CACHE_HITS, CACHE_HIT_RATIO, CACHE_MISSES, metrics
+import jwt as pyjwt
 
 # Configuración de seguridad
 SECRET_KEY = "your-secret-key"  # Cambiar en producción
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Verificación única por token (middleware y dependencias comparten el resultado)
+token_verifier = TokenVerifier(
+    SECRET_KEY,
+    ALGORITHM,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS,
+    max_entries=settings.AUTH_CACHE_MAX_ENTRIES
+)
+
+def collect_token_metrics() -> None:
+    stats = token_verifier.stats()
+    CACHE_HITS.set(stats["hits"], ("auth_tokens",))
+    CACHE_MISSES.set(stats["misses"], ("auth_tokens",))
+    CACHE_HIT_RATIO.set(stats["hit_ratio"], ("auth_tokens",))
+
+metrics.add_collector(collect_token_metrics)
+
 # Configuración de Password Context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt en un pool acotado para no bloquear el event loop
+password_hasher = PasswordHasher(
+    pwd_context,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 # Modelos Pydantic
@@ -93,77 +122,137 @@ def get_user_by_username(db: Session, username: str) -> Optional[UserModel]:
     """Obtiene un usuario por su username"""
     return db.query(UserModel).filter(UserModel.username == username).first()
 
-def authenticate_user(db: Session, username: str, password: str) -> Optional[UserModel]:
-    """Autentica un usuario por username y password"""
+async def authenticate_user(db: Session, username: str, password: str) -> Optional[UserModel]:
+    """Autentica un usuario por username y password (bcrypt en el pool de hashing)"""
     user = get_user_by_username(db, username)
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await password_hasher.verify(password, user.hashed_password):
         return None
     return user
 
-def create_user(db: Session, user: UserCreate) -> UserModel:
-    """Crea un nuevo usuario"""
-    hashed_password = get_password_hash(user.password)
-    db_user = UserModel(
-        username=user.username,
-        email=user.email,
-        full_name=user.full_name,
-        hashed_password=hashed_password,
-        is_active=user.is_active,
-        is_superuser=user.is_superuser
-    )
-    db.add(db_user)
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None) -> UserModel:
+    """Crea un nuevo usuario (`hashed_password` si ya se calculó fuera del event loop)"""
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     try:
+        # INSERT ... RETURNING: el usuario vuelve con id y defaults sin refresh
+        db_user = db.scalars(
+            insert(UserModel).values(
+                username=user.username,
+                email=user.email,
+                full_name=user.full_name,
+                hashed_password=hashed_password,
+                is_active=user.is_active,
+                is_superuser=user.is_superuser
+            ).returning(UserModel)
+        ).one()
         db.commit()
-        db.refresh(db_user)
         return db_user
     except Exception as e:
         db.rollback()
         raise e
 
+def load_user_snapshot(username: str) -> Optional[UserSnapshot]:
+    """Snapshot del usuario con una sesión propia y corta (se llama en el threadpool)"""
+    db = database.SessionLocal()
+    try:
+        user = get_user_by_username(db, username)
+        return UserSnapshot.from_model(user) if user is not None else None
+    finally:
+        db.close()
+
 def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[UserModel]:
     """Obtiene una lista de usuarios"""
     return db.query(UserModel).offset(skip).limit(limit).all()
 
 # Dependencias de FastAPI
 async def get_current_user(
-    db: Session = Depends(get_db),
+    request: Request,
     token: str = Depends(oauth2_scheme)
-) -> UserModel:
-    """Obtiene el usuario actual desde el token JWT"""
+) -> UserSnapshot:
+    """Obtiene el usuario actual desde el token JWT.
+
+    Devuelve un UserSnapshot (id, username, email, full_name, is_active,
+    is_superuser y nombres de roles), no la instancia UserModel: no está
+    ligado a ninguna sesión, así que no hay lazy loads ni cambios para
+    persistir. Quien necesite el modelo lo carga por `id` con su propia sesión.
+
+    Reutiliza el token que ya verificó el middleware (request.state.token) y
+    el snapshot de usuario cacheado para ese token; la DB solo se consulta la
+    primera vez, con una sesión propia en el threadpool. El snapshot se recarga
+    cuando cambia la versión de la matriz de permisos, y las rutas que
+    modifican un usuario lo descartan con `token_verifier.forget_user`.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
+    verified = getattr(request.state, "token", None)
+    if verified is None:
+        try:
+            verified = token_verifier.verify(token)
+        except pyjwt.InvalidTokenError:
             raise credentials_exception
-        token_data = TokenData(username=username)
-    except JWTError:
-        raise credentials_exception
+        request.state.token = verified
+        request.state.user = verified.claims
 
-    user = get_user_by_username(db, username=token_data.username)
-    if user is None:
-        raise credentials_exception
-    return user
+    # Tomada antes de cargar: un cambio concurrente deja el snapshot desactualizado
+    version = permission_resolver.version
+    if verified.user is None or verified.user_version != version:
+        username: str = verified.claims.get("sub")
+        if username is None:
+            raise credentials_exception
+        user = await run_in_threadpool(load_user_snapshot, username)
+        if user is None:
+            raise credentials_exception
+        verified.user = user
+        verified.user_version = version
+    return verified.user
 
 async def get_current_active_user(
-    current_user: UserModel = Depends(get_current_user)
-) -> UserModel:
+    current_user: UserSnapshot = Depends(get_current_user)
+) -> UserSnapshot:
     """Verifica si el usuario actual está activo"""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 async def get_current_admin_user(
-    current_user: UserModel = Depends(get_current_active_user),
-) -> UserModel:
+    current_user: UserSnapshot = Depends(get_current_active_user),
+) -> UserSnapshot:
     """Verifica si el usuario actual es administrador"""
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough privileges",
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+def require_permission(resource: str, action: str):
+    """Dependencia que exige el permiso "recurso:acción" (matriz precalculada).
+
+    No consulta la DB: usa el token ya verificado por el middleware o lo
+    verifica una vez desde el header Authorization.
+    """
+    async def check_permission(request: Request) -> None:
+        verified = getattr(request.state, "token", None)
+        if verified is None:
+            scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+            try:
+                if scheme.lower() != "bearer" or not token:
+                    raise pyjwt.InvalidTokenError("missing bearer token")
+                verified = token_verifier.verify(token)
+            except pyjwt.InvalidTokenError:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Could not validate credentials",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            request.state.token = verified
+            request.state.user = verified.claims
+        if not permission_resolver.allows(verified.claims, resource, action):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Missing permission {resource}:{action}",
+            )
+    return check_permission
@@ -0,0 +1,94 @@
+# backend\core\security\passwords.py
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict, TypeVar
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class PasswordHasher:
+    """bcrypt fuera del event loop, en un pool de threads acotado.
+
+    bcrypt consume ~250 ms de CPU por operación y libera el GIL mientras
+    calcula, así que un pool de threads alcanza para que un pico de logins no
+    congele el resto de los requests del worker. Como máximo `max_pending`
+    operaciones esperan o corren a la vez; por encima se responde 503 con
+    Retry-After en lugar de encolar sin límite (backpressure).
+    """
+
+    def __init__(self, context: CryptContext, workers: int, max_pending: int):
+        self.context = context
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="password-hash"
+        )
+        # Métricas (pending se actualiza en el event loop, el resto en los threads)
+        self._lock = Lock()
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    async def _submit(self, func: Callable[..., T], *args: Any) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            logger.warning("Password hashing pool saturado (%d pendientes)", self.pending)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service busy, retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        queued_at = time.perf_counter()
+
+        def run() -> T:
+            started = time.perf_counter()
+            with self._lock:
+                self.wait_seconds += started - queued_at
+                self.running += 1
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                    self.run_seconds += time.perf_counter() - started
+
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, run)
+        finally:
+            self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """Hash bcrypt de la contraseña"""
+        return await self._submit(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Verifica la contraseña contra el hash"""
+        return await self._submit(self.context.verify, password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        """Estado del pool: cola, en curso y tiempos acumulados"""
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "running": self.running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.wait_seconds / self.completed * 1000, 3) if self.completed else 0.0,
+            "avg_run_ms": round(self.run_seconds / self.completed * 1000, 3) if self.completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
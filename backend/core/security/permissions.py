@@ -0,0 +1,187 @@
+# backend\core\security\permissions.py
+from collections import defaultdict
+from threading import Lock
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, Optional, Set
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from core.cache import cache_backend
+from core.security.roles import Permission, Role, role_permissions, user_roles
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+EMPTY: FrozenSet[str] = frozenset()
+
+# Contador compartido (con CACHE_TYPE=redis) para que los demás workers
+# recarguen la matriz cuando otro cambia roles o permisos
+VERSION_KEY = "permissions:version"
+
+def scope(resource: str, action: str) -> str:
+    return f"{resource}:{action}"
+
+class PermissionResolver:
+    """Matriz precalculada usuario -> {"recurso:acción"} para autorizar en O(1).
+
+    Se carga con dos consultas (permisos de los roles activos y roles por
+    usuario) y se actualiza de forma incremental: cambiar un rol recalcula solo
+    las filas de sus usuarios, y cambiar los roles de un usuario solo la suya.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._role_scopes: Dict[int, FrozenSet[str]] = {}
+        self._user_roles: Dict[int, Set[int]] = defaultdict(set)
+        self._role_users: Dict[int, Set[int]] = defaultdict(set)
+        self._matrix: Dict[int, FrozenSet[str]] = {}
+        self.loaded = False
+        self.version = 0
+
+    # --- Carga -----------------------------------------------------------
+    def _load_role_scopes(
+        self,
+        db: Session,
+        role_ids: Optional[Iterable[int]] = None
+    ) -> Dict[int, FrozenSet[str]]:
+        """Permisos de los roles activos (todos o los indicados) en una consulta"""
+        statement = (
+            select(Role.id, Permission.resource, Permission.action)
+            .select_from(Role)
+            .outerjoin(role_permissions, role_permissions.c.role_id == Role.id)
+            .outerjoin(Permission, Permission.id == role_permissions.c.permission_id)
+            .where(Role.is_active.is_not(False))
+        )
+        if role_ids is not None:
+            statement = statement.where(Role.id.in_(list(role_ids)))
+        scopes: Dict[int, Set[str]] = defaultdict(set)
+        for role_id, resource, action in db.execute(statement):
+            # Un rol activo sin permisos también se registra (conjunto vacío)
+            role_scopes = scopes[role_id]
+            if resource and action:
+                role_scopes.add(scope(resource, action))
+        return {role_id: frozenset(values) for role_id, values in scopes.items()}
+
+    def _compute(self, user_id: int) -> None:
+        role_ids = self._user_roles.get(user_id)
+        if not role_ids:
+            self._matrix.pop(user_id, None)
+            return
+        scopes: Set[str] = set()
+        for role_id in role_ids:
+            scopes |= self._role_scopes.get(role_id, EMPTY)
+        self._matrix[user_id] = frozenset(scopes)
+
+    def load(self, db: Session) -> None:
+        """Carga completa de la matriz"""
+        role_scopes = self._load_role_scopes(db)
+        rows = db.execute(select(user_roles.c.user_id, user_roles.c.role_id)).all()
+        with self._lock:
+            self._role_scopes = role_scopes
+            self._user_roles = defaultdict(set)
+            self._role_users = defaultdict(set)
+            for user_id, role_id in rows:
+                self._user_roles[user_id].add(role_id)
+                self._role_users[role_id].add(user_id)
+            self._matrix = {}
+            for user_id in self._user_roles:
+                self._compute(user_id)
+            self.loaded = True
+        version = cache_backend.get_counter(VERSION_KEY)
+        if version is not None:
+            self.version = version
+        logger.info(
+            "Matriz de permisos cargada: %d usuarios, %d roles",
+            len(self._matrix), len(self._role_scopes)
+        )
+
+    # --- Actualización incremental --------------------------------------
+    def _publish(self) -> None:
+        version = cache_backend.incr(VERSION_KEY)
+        # Si otro worker publicó en el medio, no se adopta la versión nueva:
+        # watch() detecta la diferencia y recarga la matriz completa
+        if version == self.version + 1:
+            self.version = version
+
+    def refresh_role(self, db: Session, role_id: int) -> None:
+        """Recalcula un rol (creado, modificado o con permisos nuevos) y sus usuarios"""
+        scopes = self._load_role_scopes(db, [role_id]).get(role_id)
+        with self._lock:
+            if scopes is None:
+                # Rol inactivo o inexistente: no aporta permisos
+                self._role_scopes.pop(role_id, None)
+            else:
+                self._role_scopes[role_id] = scopes
+            for user_id in self._role_users.get(role_id, ()):
+                self._compute(user_id)
+        self._publish()
+
+    def remove_role(self, role_id: int) -> None:
+        """Quita un rol eliminado de la matriz"""
+        with self._lock:
+            self._role_scopes.pop(role_id, None)
+            for user_id in self._role_users.pop(role_id, set()):
+                self._user_roles[user_id].discard(role_id)
+                self._compute(user_id)
+        self._publish()
+
+    def refresh_user(self, db: Session, user_id: int) -> None:
+        """Recalcula la fila de un usuario después de asignarle o quitarle roles"""
+        role_ids = set(db.execute(
+            select(user_roles.c.role_id).where(user_roles.c.user_id == user_id)
+        ).scalars().all())
+        with self._lock:
+            for role_id in self._user_roles.pop(user_id, set()) - role_ids:
+                self._role_users[role_id].discard(user_id)
+            for role_id in role_ids:
+                self._role_users[role_id].add(user_id)
+            if role_ids:
+                self._user_roles[user_id] = role_ids
+            self._compute(user_id)
+        self._publish()
+
+    # --- Consultas --------------------------------------------------------
+    def scopes(self, user_id: int) -> FrozenSet[str]:
+        """Permisos efectivos del usuario"""
+        return self._matrix.get(user_id, EMPTY)
+
+    def allows(self, claims: Mapping[str, Any], resource: str, action: str) -> bool:
+        """Autoriza con la matriz (o con los scopes del token si todavía no se cargó)"""
+        if claims.get("is_superuser"):
+            return True
+        user_id = claims.get("uid")
+        if self.loaded and user_id is not None:
+            scopes = self._matrix.get(user_id, EMPTY)
+        else:
+            scopes = claims.get("scopes") or ()
+        return (
+            scope(resource, action) in scopes
+            or scope(resource, "*") in scopes
+            or scope("*", action) in scopes
+            or "*:*" in scopes
+        )
+
+    # --- Sincronización entre workers ------------------------------------
+    async def watch(self, session_factory, interval: float) -> None:
+        """Recarga la matriz cuando otro worker publica cambios (contador compartido)"""
+        def sync() -> None:
+            version = cache_backend.get_counter(VERSION_KEY)
+            # Sin backend no hay forma de saber si cambió: se reintenta luego
+            if version is None or version == self.version:
+                return
+            db = session_factory()
+            try:
+                self.load(db)
+            finally:
+                db.close()
+
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await run_in_threadpool(sync)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error recargando la matriz de permisos: {str(e)}", exc_info=True)
+
+permission_resolver = PermissionResolver()
@@ -2,6 +2,7 @@
 from sqlalchemy import Column, Integer, String, Table, ForeignKey, Boolean
 from sqlalchemy.orm import relationship
 from core.database.base import Base
+from core.metadata.models import UserRoles
 
 # Tabla de asociación entre roles y permisos
 role_permissions = Table(
@@ -11,13 +12,8 @@ role_permissions = Table(
     Column('permission_id', Integer, ForeignKey('permissions.id'))
 )
 
-# Tabla de asociación entre usuarios y roles
-user_roles = Table(
-    'user_roles',
-    Base.metadata,
-    Column('user_id', Integer, ForeignKey('users.id')),
-    Column('role_id', Integer, ForeignKey('roles.id'))
-)
+# Tabla de asociación entre usuarios y roles: la define el modelo UserRoles
+user_roles = UserRoles.__table__
 
 class Role(Base):
     __tablename__ = 'roles'
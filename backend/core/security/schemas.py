@@ -27,4 +27,40 @@ class User(UserBase):
     id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class PermissionBase(BaseModel):
+    name: str
+    description: Optional[str] = None
+    resource: str
+    action: str
+
+class PermissionCreate(PermissionBase):
+    pass
+
+class Permission(PermissionBase):
+    id: int
+
+    class Config:
+        from_attributes = True
+
+class RoleBase(BaseModel):
+    name: str
+    description: Optional[str] = None
+    is_active: bool = True
+
+class RoleCreate(RoleBase):
+    permissions: Optional[List[int]] = None
+
+class RoleUpdate(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    is_active: Optional[bool] = None
+    permissions: Optional[List[int]] = None
+
+class Role(RoleBase):
+    id: int
+    permissions: List[Permission] = []
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,85 @@
+# backend\core\security\tokens.py
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from core.cache.memory import MemoryCache
+import jwt
+import time
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Datos del usuario autenticado, desacoplados de la sesión de DB"""
+    id: int
+    username: str
+    email: Optional[str]
+    full_name: Optional[str]
+    is_active: bool
+    is_superuser: bool
+    roles: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_model(cls, user: Any) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+            roles=tuple(role.name for role in user.roles or []),
+        )
+
+@dataclass
+class VerifiedToken:
+    """Claims de un token ya verificado y, una vez resuelto, el usuario.
+
+    `user_version` es la versión de la matriz de permisos con la que se cargó
+    el snapshot: si cambió (roles modificados en cualquier worker), se recarga.
+    """
+    claims: Dict[str, Any]
+    user: Optional[UserSnapshot] = None
+    user_version: Optional[int] = None
+
+class TokenVerifier:
+    """Verifica cada token una sola vez y recuerda el resultado.
+
+    La cache (LRU acotada, solo en proceso) guarda token -> claims + snapshot
+    del usuario hasta `ttl` segundos, nunca más allá del `exp` del token. Los
+    requests siguientes de la misma sesión evitan la verificación HMAC y la
+    consulta del usuario.
+    """
+
+    def __init__(self, secret_key: str, algorithm: str, ttl: float, max_entries: int):
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.ttl = ttl
+        self._cache = MemoryCache(max_entries=max_entries, ttl=ttl)
+        self.decodes = 0
+
+    def verify(self, token: str) -> VerifiedToken:
+        """Claims del token; lanza jwt.ExpiredSignatureError / jwt.InvalidTokenError"""
+        verified = self._cache.get(token, None)
+        if verified is not None:
+            return verified
+
+        claims = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        self.decodes += 1
+        verified = VerifiedToken(claims)
+        ttl = self.ttl
+        if claims.get("exp") is not None:
+            ttl = min(ttl, float(claims["exp"]) - time.time())
+        if ttl > 0:
+            self._cache.set(token, verified, ttl)
+        return verified
+
+    def forget_user(self, username: str) -> int:
+        """Olvida los tokens de un usuario (desactivado, degradado o con otros roles)"""
+        return self._cache.delete_where(
+            lambda token, verified: verified.claims.get("sub") == username
+        )
+
+    def clear(self) -> None:
+        """Olvida todos los tokens (p. ej. al cambiar roles o desactivar usuarios)"""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._cache.stats(), "decodes": self.decodes}
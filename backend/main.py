@@ -1,14 +1,22 @@
 # main.py
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from core.database.database import get_db
 from core.middleware.auth import AuthMiddleware
+from core.middleware.public_paths import public_route
+from core.middleware.query_timing import QueryTimingMiddleware
+from core.middleware.metrics import MetricsMiddleware
+from core.metrics import metrics
 from api import api_router
 from config.settings import settings
 from core.generator.api_gen import APIGenerator
-from core.metadata.models import TableMetadata
+from core.generator.router_registry import RouterRegistry
 from core.database.database import SessionLocal
-from importlib import import_module
+from core.database.replicas import replica_set
+from core.security.auth import password_hasher
+from core.security.permissions import permission_resolver
+import asyncio
 import logging
 import traceback
 import sys
@@ -33,6 +41,14 @@ app = FastAPI(
     version=settings.VERSION
 )
 
+# Consultas SQL por request (header Server-Timing, detección de N+1)
+if settings.QUERY_TIMING_ENABLED:
+    app.add_middleware(QueryTimingMiddleware)
+
+# Agregar middleware de autenticación (ASGI puro). Se registra antes que
+# CORS para que CORS quede por fuera y también los 401/403 lleven sus headers
+app.add_middleware(AuthMiddleware)
+
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -42,14 +58,10 @@ app.add_middleware(
     allow_headers=settings.CORS_ALLOW_HEADERS,
 )
 
-# Agregar middleware de autenticación
-auth_middleware = AuthMiddleware()
-
-@app.middleware("http")
-async def authentication_middleware(request: Request, call_next):
-    await auth_middleware(request)
-    response = await call_next(request)
-    return response
+# Latencia por ruta para /metrics. Se registra último para ser el más externo
+# y contar también los 401/403 de autenticación
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 # Incluir todas las rutas de la API base
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -57,49 +69,32 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 # Generar y registrar routers dinámicos
 api_generator = APIGenerator()
 
+router_registry = RouterRegistry(app, api_generator, settings.API_V1_STR)
+metadata_watcher = None
+permissions_watcher = None
+replicas_watcher = None
+
 def register_dynamic_routers():
     """Registra los routers generados dinámicamente desde los metadatos"""
     db = SessionLocal()
     try:
-        tables = db.query(TableMetadata).all()
-        
-        for table in tables:
-            try:
-                print(f"\nProcesando tabla: {table.name}")
-                module_path = f"models.generated.{table.name}"
-                print(f"Intentando importar módulo: {module_path}")
-                
-                module = import_module(module_path)
-                print(f"Módulo importado exitosamente")
-                
-                # Usar la función de capitalización correcta
-                class_name = ''.join(word.capitalize() for word in table.name.split('_'))
-                model = getattr(module, class_name)
-                print(f"Modelo obtenido: {model}")
-                
-                # Generar router para la tabla
-                router = api_generator.generate_router(table, model)
-                
-                # Registrar el router
-                app.include_router(
-                    router,
-                    prefix=f"{settings.API_V1_STR}/{table.name}",
-                    tags=[table.name]
-                )
-                logger.info(f"✅ Router generado para tabla: {table.name}")
-                
-            except Exception as e:
-                print("\nError detallado al procesar {table.name}:")
-                traceback.print_exc()
-                logger.error(f"❌ Error generando router para {table.name}: {str(e)}")
-                continue
-                
+        router_registry.register_all(db)
     except Exception as e:
         print("\nError detallado en register_dynamic_routers:")
         traceback.print_exc()
         logger.error(f"Error registrando routers dinámicos: {str(e)}")
     finally:
         db.close()
+
+def load_permissions():
+    """Precalcula la matriz de permisos usuario -> recurso:acción"""
+    db = SessionLocal()
+    try:
+        permission_resolver.load(db)
+    except Exception as e:
+        logger.error(f"Error cargando la matriz de permisos: {str(e)}")
+    finally:
+        db.close()
         
 @app.on_event("startup")
 async def startup_event():
@@ -109,19 +104,50 @@ async def startup_event():
     logger.info(f"API Version: {settings.VERSION}")
     # Registrar routers dinámicos al inicio
     register_dynamic_routers()
+    load_permissions()
+    # Recargar routers cuando cambie la metadata, sin reiniciar el proceso
+    global metadata_watcher
+    if settings.METADATA_POLL_SECONDS > 0:
+        metadata_watcher = asyncio.create_task(
+            router_registry.watch(SessionLocal, settings.METADATA_POLL_SECONDS)
+        )
+    global permissions_watcher
+    if settings.PERMISSIONS_POLL_SECONDS > 0:
+        permissions_watcher = asyncio.create_task(
+            permission_resolver.watch(SessionLocal, settings.PERMISSIONS_POLL_SECONDS)
+        )
+    # Sacar y devolver réplicas de lectura a la rotación según su salud
+    global replicas_watcher
+    if replica_set and settings.REPLICA_HEALTH_CHECK_SECONDS > 0:
+        replicas_watcher = asyncio.create_task(
+            replica_set.watch(settings.REPLICA_HEALTH_CHECK_SECONDS)
+        )
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Molecule Framework")
-
-@app.get("/")
+    if metadata_watcher is not None:
+        metadata_watcher.cancel()
+    if permissions_watcher is not None:
+        permissions_watcher.cancel()
+    if replicas_watcher is not None:
+        replicas_watcher.cancel()
+    password_hasher.shutdown()
+
+@app.get("/", openapi_extra=public_route())
 async def root():
     return {"message": f"{settings.PROJECT_NAME} API is running"}
 
-@app.get("/health")
+@app.get("/health", openapi_extra=public_route())
 async def health_check():
     return {"status": "ok"}
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", openapi_extra=public_route(), include_in_schema=False)
+    def metrics_endpoint():
+        """Métricas del proceso en formato de texto de Prometheus"""
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host=settings.HOST, port=settings.PORT)
\ No newline at end of file
@@ -4,8 +4,9 @@ from datetime import datetime
 from sqlalchemy import Column, DateTime, Integer
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.ext.declarative import declared_attr
+from core.database.base import ColumnReaderMixin
 
-class Base(DeclarativeBase):
+class Base(ColumnReaderMixin, DeclarativeBase):
     """Base class for all models"""
     
     @declared_attr
@@ -25,10 +26,8 @@ class Base(DeclarativeBase):
 
     def to_dict(self) -> dict[str, Any]:
         """Convert model to dictionary"""
-        return {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
+        names, getter = self._column_reader()
+        return dict(zip(names, getter(self)))
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "Base":
@@ -1,9 +1,10 @@
 # backend\schemas\base.py
 from datetime import datetime
-from typing import Optional, TypeVar, Generic
+from typing import List, Optional, TypeVar, Generic
 from pydantic import BaseModel, ConfigDict
 
 ModelType = TypeVar("ModelType")
+ItemType = TypeVar("ItemType")
 
 class BaseSchema(BaseModel):
     """Base schema for all models"""
@@ -23,3 +24,7 @@ class BaseInDBSchema(BaseSchema):
     created_at: datetime
     updated_at: datetime
 
+class Page(BaseModel, Generic[ItemType]):
+    """Keyset page with the opaque cursor for the next one"""
+    items: List[ItemType]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,139 @@
+# backend\scripts\benchmark_logging.py
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz del proyecto al PYTHONPATH
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import Column, Integer, String, create_engine, func, select
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from config.log_queue import stop_queue_logging
+from config.settings import settings
+from core.database import database
+from core.database.replicas import RoutingSession
+
+BenchBase = declarative_base()
+
+class Item(BenchBase):
+    __tablename__ = "bench_items"
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False)
+
+# Variantes: (LOG_MODE, LOG_LEVEL, DEBUG, SQL_LOG_SAMPLE_RATE)
+VARIANTS = {
+    "debug": ("development", "DEBUG", True, 0.0),  # valores por defecto del repo
+    "production": ("production", "INFO", True, 0.01),
+    "off": ("development", "WARNING", False, 0.0),  # piso: sin logging por request
+}
+
+def build_app() -> FastAPI:
+    """Endpoint de lectura con el get_db real: 3 consultas por request"""
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int, db: Session = Depends(database.get_db)):
+        item = db.get(Item, item_id)
+        total = db.scalar(select(func.count(Item.id)))
+        page = db.scalars(select(Item).order_by(Item.id).limit(20)).all()
+        return {"id": item.id, "name": item.name, "total": total, "page": len(page)}
+
+    return app
+
+def configure(variant: str, db_path: str, log_file: str) -> None:
+    """Aplica la variante a settings, reconfigura logging y rearma el engine"""
+    mode, level, debug, sample_rate = VARIANTS[variant]
+    stop_queue_logging()
+    settings.LOG_MODE = mode
+    settings.LOG_LEVEL = level
+    settings.DEBUG = debug
+    settings.SQL_LOG_SAMPLE_RATE = sample_rate
+    settings.LOG_FILE = log_file
+    settings.configure_logging()
+    # El cliente httpx del benchmark loguea cada request a INFO; no es del servidor
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    database.engine.dispose()
+    database.engine = create_engine(f"sqlite:///{db_path}", echo=settings.get_sql_echo())
+    database.SessionLocal = sessionmaker(
+        bind=database.engine,
+        class_=RoutingSession,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+async def _measure(app: FastAPI, requests: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for index in range(20):
+            await client.get(f"/items/{index + 1}")
+        latencies = []
+        for index in range(requests):
+            start = time.perf_counter()
+            response = await client.get(f"/items/{index % 100 + 1}")
+            latencies.append(time.perf_counter() - start)
+    return response.status_code, latencies
+
+def run_variant(variant: str, app: FastAPI, db_path: str, workdir: str, requests: int):
+    log_file = os.path.join(workdir, f"{variant}.log")
+    # La consola de logging va a /dev/null: se mide el costo de emitir, no la terminal
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        configure(variant, db_path, log_file)
+        status, latencies = asyncio.run(_measure(app, requests))
+        drain_started = time.perf_counter()
+        stop_queue_logging()
+        drain = time.perf_counter() - drain_started
+    size = os.path.getsize(log_file) if os.path.exists(log_file) else 0
+    return status, latencies, drain, size
+
+def benchmark(requests: int, rounds: int) -> None:
+    workdir = tempfile.mkdtemp(prefix="molecule-logging-")
+    db_path = os.path.join(workdir, "bench.db")
+    configure("off", db_path, os.path.join(workdir, "seed.log"))
+    seed_engine = create_engine(f"sqlite:///{db_path}")
+    BenchBase.metadata.create_all(seed_engine)
+    with Session(seed_engine) as session:
+        session.add_all(Item(name=f"item {index}") for index in range(100))
+        session.commit()
+    seed_engine.dispose()
+
+    app = build_app()
+    print(f"\n⏱️  Overhead de logging por request ({requests} requests, 3 consultas c/u, {rounds} rondas)")
+    best = {}
+    for _ in range(rounds):
+        # Rondas intercaladas; se queda la mejor p50 de cada variante
+        for variant in VARIANTS:
+            status, latencies, drain, size = run_variant(variant, app, db_path, workdir, requests)
+            p50 = statistics.median(latencies)
+            if variant not in best or p50 < best[variant][1]:
+                best[variant] = (status, p50, statistics.mean(latencies), drain, size)
+
+    settings.LOG_MODE = "development"
+    settings.LOG_LEVEL = "WARNING"
+    settings.configure_logging()
+
+    baseline = best["off"][1]
+    for variant, (status, p50, mean, drain, size) in best.items():
+        print(
+            f"  {variant:<11} {status} p50 {p50 * 1e6:8.1f} µs mean {mean * 1e6:8.1f} µs"
+            f" ({(p50 - baseline) * 1e6:+8.1f} µs vs off)"
+            f"  log {size / 1024:8.1f} KiB  vaciado de cola {drain * 1000:6.1f} ms"
+        )
+    print(f"\n📁 Logs en {workdir}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Overhead de logging DEBUG vs modo production")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    benchmark(args.requests, args.rounds)
@@ -0,0 +1,118 @@
+# backend\scripts\benchmark_login_storm.py
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz del proyecto al PYTHONPATH
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+import httpx
+from fastapi import FastAPI, HTTPException
+from passlib.context import CryptContext
+from core.security.passwords import PasswordHasher
+
+PASSWORD = "benchmark-password"
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+def build_app(mode: str, context: CryptContext, hashed: str, workers: int, max_pending: int):
+    """App mínima: /login verifica bcrypt (inline o en el pool) y /ping no hace nada"""
+    app = FastAPI()
+    hasher = PasswordHasher(context, workers=workers, max_pending=max_pending)
+    app.state.hasher = hasher
+
+    @app.post("/login")
+    async def login():
+        if mode == "inline":
+            # Comportamiento anterior: bcrypt directo en el event loop
+            valid = context.verify(PASSWORD, hashed)
+        else:
+            valid = await hasher.verify(PASSWORD, hashed)
+        if not valid:
+            raise HTTPException(status_code=401)
+        return {"ok": True}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+async def run_storm(app: FastAPI, logins: int, concurrency: int, ping_interval: float):
+    """Lanza `logins` logins (de a `concurrency`) y mide /ping mientras tanto"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        statuses = []
+        ping_latencies = []
+        done = asyncio.Event()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def login():
+            async with semaphore:
+                response = await client.post("/login")
+                statuses.append(response.status_code)
+
+        async def ping_loop():
+            # La latencia se mide desde el momento en que el ping debía salir:
+            # si el event loop está bloqueado, el ping ni siquiera arranca y
+            # medir desde el envío real ocultaría la espera
+            scheduled = time.perf_counter()
+            while True:
+                await client.get("/ping")
+                now = time.perf_counter()
+                ping_latencies.append(now - scheduled)
+                if done.is_set():
+                    break
+                scheduled = max(scheduled + ping_interval, now)
+                await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+
+        pinger = asyncio.create_task(ping_loop())
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await pinger
+    return elapsed, statuses, ping_latencies
+
+def benchmark_login_storm(logins: int, concurrency: int, workers: int, max_pending: int, rounds: int):
+    """Latencia de un endpoint ajeno (/ping) durante una ráfaga de logins con bcrypt"""
+    logging.getLogger("passlib").setLevel(logging.WARNING)
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+    hashed = context.hash(PASSWORD)
+
+    print(
+        f"\n⏱️  Login storm: {logins} logins, concurrencia {concurrency}, "
+        f"bcrypt rounds={rounds}, pool de {workers} threads"
+    )
+    for mode in ("inline", "pool"):
+        app = build_app(mode, context, hashed, workers, max_pending)
+        elapsed, statuses, pings = asyncio.run(run_storm(app, logins, concurrency, 0.005))
+        ok = sum(1 for code in statuses if code == 200)
+        busy = sum(1 for code in statuses if code == 503)
+        print(
+            f"  {mode:<7} logins {ok} ok / {busy} 503 en {elapsed:6.2f} s"
+            f" | /ping n={len(pings):4d} p50 {_percentile(pings, 0.50) * 1000:8.2f} ms"
+            f" p99 {_percentile(pings, 0.99) * 1000:8.2f} ms"
+            f" max {max(pings) * 1000:8.2f} ms"
+            f" mean {statistics.mean(pings) * 1000:8.2f} ms"
+        )
+        if mode == "pool":
+            print(f"  📊 pool: {app.state.hasher.stats()}")
+        app.state.hasher.shutdown()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=benchmark_login_storm.__doc__)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4, help="Threads del pool de bcrypt")
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=12, help="Costo de bcrypt")
+    args = parser.parse_args()
+    benchmark_login_storm(args.logins, args.concurrency, args.workers, args.max_pending, args.rounds)
@@ -0,0 +1,112 @@
+# backend\scripts\benchmark_writes.py
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz del proyecto al PYTHONPATH
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, create_engine, event, insert, text, update
+from sqlalchemy.orm import Session, registry
+from config.settings import settings
+
+metadata = MetaData()
+bench_table = Table(
+    "bench_writes",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("title", String(200), nullable=False),
+    Column("status", String(20), nullable=False, server_default=text("'open'")),
+    Column("created_at", DateTime, server_default=text("CURRENT_TIMESTAMP")),
+    Column("updated_at", DateTime, server_default=text("CURRENT_TIMESTAMP")),
+)
+
+class BenchRow:
+    pass
+
+registry().map_imperatively(BenchRow, bench_table)
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+def _report(name, samples, statements):
+    print(
+        f"  {name:<28} mean {statistics.mean(samples) * 1000:7.3f} ms"
+        f" | p50 {_percentile(samples, 0.50) * 1000:7.3f} ms"
+        f" | p95 {_percentile(samples, 0.95) * 1000:7.3f} ms"
+        f" | {statements / len(samples):.1f} statements/op"
+    )
+
+def benchmark_writes(url: str, iterations: int):
+    """Compara escrituras ORM + refresh contra INSERT/UPDATE ... RETURNING"""
+    # El log de SQL en modo DEBUG distorsiona las mediciones
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+    engine = create_engine(url)
+    counter = {"statements": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statements(conn, cursor, statement, parameters, context, executemany):
+        counter["statements"] += 1
+
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    def run(name, operation):
+        samples = []
+        counter["statements"] = 0
+        with Session(engine, expire_on_commit=False) as db:
+            for i in range(iterations):
+                start = time.perf_counter()
+                operation(db, i)
+                samples.append(time.perf_counter() - start)
+        _report(name, samples, counter["statements"])
+
+    def orm_create(db, i):
+        row = BenchRow(title=f"orm {i}")
+        db.add(row)
+        db.commit()
+        db.refresh(row)
+
+    def returning_create(db, i):
+        db.execute(
+            insert(bench_table).values(title=f"ret {i}").returning(*bench_table.c)
+        ).one()
+        db.commit()
+
+    def orm_update(db, i):
+        row = db.get(BenchRow, i + 1)
+        row.title = f"orm upd {i}"
+        db.commit()
+        db.refresh(row)
+        db.expunge(row)
+
+    def returning_update(db, i):
+        db.execute(
+            update(bench_table)
+            .where(bench_table.c.id == i + 1)
+            .values(title=f"ret upd {i}")
+            .returning(*bench_table.c)
+        ).one()
+        db.commit()
+
+    print(f"\n⏱️  Benchmark de escrituras ({iterations} operaciones) sobre {engine.url.render_as_string()}")
+    try:
+        run("create: add+commit+refresh", orm_create)
+        run("create: INSERT RETURNING", returning_create)
+        run("update: get+commit+refresh", orm_update)
+        run("update: UPDATE RETURNING", returning_update)
+    finally:
+        metadata.drop_all(engine)
+        engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=benchmark_writes.__doc__)
+    parser.add_argument("--url", default=settings.DATABASE_URL, help="URL de la base de datos")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    benchmark_writes(args.url, args.iterations)
@@ -1,4 +1,5 @@
 # backend\scripts\generate_tables.py
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -7,12 +8,13 @@ from pathlib import Path
 ROOT_DIR = Path(__file__).resolve().parent.parent
 sys.path.append(str(ROOT_DIR))
 
+from core.generator.online_migration import OnlineMigrationExecutor
 from core.generator.table_generator import TableGenerator
 from core.database.database import engine, SessionLocal
 import logging
 
-def generate_tables():
-    """Genera las tablas físicas desde la metadata"""
+def generate_tables(dry_run: bool = False, allow_drop: bool = False, online: bool = False):
+    """Genera o actualiza las tablas físicas desde la metadata"""
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
 
@@ -23,15 +25,23 @@ def generate_tables():
         generator = TableGenerator(engine)
         
         try:
-            # Generar tablas
-            created_tables = generator.generate_tables(db)
+            # Generar tablas (solo los cambios que faltan)
+            plan = generator.generate_tables(db, dry_run=dry_run, allow_drop=allow_drop, online=online)
             
-            if created_tables:
-                print("\n✅ Tablas creadas exitosamente:")
-                for table in created_tables:
-                    print(f"  - {table}")
+            if dry_run:
+                print("\n📝 Plan de migración (no se ejecutó):")
+                if online and OnlineMigrationExecutor.supports(engine):
+                    print(OnlineMigrationExecutor(engine).render(plan))
+                else:
+                    print(plan.render())
+            elif plan:
+                print("\n✅ Cambios aplicados:")
+                for change in plan:
+                    print(f"  - {change.table}: {change.description}")
             else:
-                print("\n⚠️  No se crearon nuevas tablas")
+                print("\n⚠️  El esquema ya coincide con la metadata")
+            for note in plan.skipped:
+                print(f"  ⚠️  Omitido: {note}")
             
             print("\n🎉 Proceso completado!")
             
@@ -44,4 +54,9 @@ def generate_tables():
         print(f"\n❌ Error de conexión: {str(e)}")
 
 if __name__ == "__main__":
-    generate_tables()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Genera o actualiza las tablas desde la metadata")
+    parser.add_argument("--dry-run", action="store_true", help="Muestra el DDL sin ejecutarlo")
+    parser.add_argument("--allow-drop", action="store_true", help="Borra columnas que ya no están en la metadata")
+    parser.add_argument("--online", action="store_true", help="PostgreSQL: índices CONCURRENTLY, NOT NULL validado aparte y backfill por lotes")
+    args = parser.parse_args()
+    generate_tables(dry_run=args.dry_run, allow_drop=args.allow_drop, online=args.online)
\ No newline at end of file
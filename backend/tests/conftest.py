@@ -0,0 +1,7 @@
+# backend\tests\conftest.py
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz del proyecto al PYTHONPATH
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
@@ -0,0 +1,190 @@
+# backend\tests\test_cache.py
+from types import SimpleNamespace
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Column, Integer, String, create_engine, event
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import StaticPool
+from config.settings import settings
+from core import cache
+from core.cache import MISSING, CacheNamespace, MemoryCache, RedisCache
+from core.cache import memory
+from core.database import database
+from core.generator.api_gen import APIGenerator
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    # RedisCache sobre el stand-in en proceso: mismo protocolo, sin servidor
+    return MemoryCache() if request.param == "memory" else RedisCache("memory://")
+
+def test_get_set_and_cached_none(backend):
+    namespace = CacheNamespace(backend, "rows")
+
+    assert namespace.get("a") is MISSING
+    namespace.set("a", {"id": 1})
+    namespace.set("empty", None)
+
+    assert namespace.get("a") == {"id": 1}
+    assert namespace.get("empty") is None
+    assert (namespace.hits, namespace.misses) == (2, 1)
+
+def test_invalidate_bumps_the_version_and_hides_old_entries(backend):
+    namespace = CacheNamespace(backend, "rows")
+    other = CacheNamespace(backend, "metadata")
+    namespace.set("a", 1)
+    other.set("a", 2)
+
+    namespace.invalidate()
+
+    assert namespace.version() == 1
+    assert namespace.get("a") is MISSING
+    # Cada namespace tiene su propia versión
+    assert other.get("a") == 2
+
+def test_invalidation_is_seen_through_the_shared_backend(backend):
+    # Dos workers: instancias distintas del namespace sobre el mismo backend
+    worker_a = CacheNamespace(backend, "rows")
+    worker_b = CacheNamespace(backend, "rows")
+    worker_a.set("a", 1)
+    assert worker_b.get("a") == 1
+
+    worker_b.invalidate()
+
+    assert worker_a.get("a") is MISSING
+
+def test_value_stored_under_a_pinned_version_is_not_served_after_invalidation(backend):
+    namespace = CacheNamespace(backend, "rows")
+    version = namespace.version()
+    # Una escritura invalida mientras la lectura consulta la base
+    namespace.invalidate()
+    namespace.set("a", "stale", version=version)
+
+    assert namespace.get("a") is MISSING
+    assert namespace.get("a", version=version) == "stale"
+
+def test_failed_invalidation_disables_the_namespace_until_it_is_applied(monkeypatch):
+    backend = RedisCache("memory://")
+    namespace = CacheNamespace(backend, "rows")
+    namespace.set("a", "stale")
+    incr = backend.client.incr
+
+    def unreachable(key):
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(backend.client, "incr", unreachable)
+    namespace.invalidate()
+
+    assert namespace.degraded
+    assert namespace.get("a") is MISSING
+    namespace.set("b", 1)
+    assert namespace.get("b") is MISSING
+
+    # Al volver el servidor, el incremento pendiente se aplica antes de leer
+    monkeypatch.setattr(backend.client, "incr", incr)
+    assert namespace.version() == 1
+    assert not namespace.degraded
+    assert namespace.get("a") is MISSING
+
+def test_unreadable_version_is_a_miss_not_version_zero(monkeypatch):
+    backend = RedisCache("memory://")
+    namespace = CacheNamespace(backend, "rows")
+    namespace.set("a", 1)
+    get = backend.client.get
+
+    def unreachable(key):
+        if key.endswith(":version"):
+            raise OSError("timeout")
+        return get(key)
+
+    monkeypatch.setattr(backend.client, "get", unreachable)
+
+    assert namespace.get("a") is MISSING
+
+def test_async_variants_use_the_threadpool_for_blocking_backends(backend, monkeypatch):
+    monkeypatch.setattr(backend, "blocking", True)
+    namespace = CacheNamespace(backend, "rows")
+
+    async def scenario():
+        version = await namespace.aversion()
+        await namespace.aset("a", 1, version=version)
+        before = await namespace.aget("a")
+        await namespace.ainvalidate()
+        return version, before, await namespace.aget("a"), await namespace.aversion()
+
+    assert asyncio.run(scenario()) == (0, 1, MISSING, 1)
+
+def test_memory_cache_ttl_and_lru(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(memory.time, "monotonic", lambda: now[0])
+    backend = MemoryCache(max_entries=2, ttl=10)
+    backend.set("a", 1)
+    backend.set("b", 2)
+    backend.get("a")
+    backend.set("c", 3)
+
+    assert backend.get("b") is MISSING  # la menos usada
+    assert backend.get("a") == 1
+    now[0] += 11
+    assert backend.get("a") is MISSING
+    assert backend.evictions == 1
+
+# --- Router generado con cache de lecturas ---------------------------------
+class NotesBase(DeclarativeBase):
+    pass
+
+class Note(NotesBase):
+    __tablename__ = "cache_notes"
+    id = Column(Integer, primary_key=True)
+    title = Column(String(50), nullable=False)
+
+def field(name, field_type, nullable=True):
+    return SimpleNamespace(
+        name=name, field_type=field_type, is_nullable=nullable, is_unique=False,
+        length=None, ui_settings={}, validation_rules={}, default_value=None
+    )
+
+@pytest.fixture
+def client(monkeypatch):
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    NotesBase.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
+    monkeypatch.setattr(settings, "DB_MODE", "sync")
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    monkeypatch.setattr(cache, "_namespaces", {})
+    monkeypatch.setattr(cache, "cache_backend", MemoryCache())
+
+    def get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    table = SimpleNamespace(
+        id=1, name="cache_notes", db_schema="main", ui_settings={"cache": True},
+        fields=[field("title", "string", nullable=False)]
+    )
+    app = FastAPI()
+    app.include_router(APIGenerator().generate_router(table, Note), prefix="/notes")
+    app.dependency_overrides[database.get_db] = get_db
+
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    return TestClient(app), queries
+
+def test_reads_are_cached_until_a_write(client):
+    client, queries = client
+    client.post("/notes/", json={"title": "a"})
+
+    for path in ("/notes/", "/notes/1"):
+        first = client.get(path).json()
+        count = len(queries)
+        assert client.get(path).json() == first
+        assert len(queries) == count  # servido desde la cache
+
+    client.put("/notes/1", json={"title": "b"})
+
+    assert client.get("/notes/1").json()["title"] == "b"
+    assert [note["title"] for note in client.get("/notes/").json()] == ["b"]
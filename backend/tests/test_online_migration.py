@@ -0,0 +1,134 @@
+# backend\tests\test_online_migration.py
+import pytest
+from sqlalchemy import Column, Float, ForeignKey, Integer, MetaData, String, Table, create_engine, text
+from sqlalchemy.dialects import postgresql
+from core.generator import schema_diff
+from core.generator.online_migration import OnlineMigrationExecutor
+from core.generator.schema_diff import ForeignKeySpec, SchemaDiff
+
+class FakeInspector:
+    """Tabla `issues` ya existente en Postgres, sin conectarse a una base"""
+
+    def has_table(self, name, schema=None):
+        return name == "issues"
+
+    def get_columns(self, name, schema=None):
+        return [
+            dict(name="id", type=postgresql.INTEGER(), nullable=False, default=None),
+            dict(name="title", type=postgresql.VARCHAR(200), nullable=True, default=None),
+            dict(name="hours", type=postgresql.INTEGER(), nullable=True, default=None),
+            dict(name="assigned_to", type=postgresql.INTEGER(), nullable=True, default=None),
+        ]
+
+    def get_unique_constraints(self, name, schema=None):
+        return []
+
+    def get_indexes(self, name, schema=None):
+        return []
+
+    def get_foreign_keys(self, name, schema=None):
+        return []
+
+@pytest.fixture
+def engine():
+    # Solo el dialecto: ninguna prueba abre conexiones
+    return create_engine("postgresql+psycopg2://")
+
+@pytest.fixture
+def executor(engine, monkeypatch):
+    executor = OnlineMigrationExecutor(engine)
+    # Tabla con filas y sin NULL en columnas existentes
+    monkeypatch.setattr(executor, "_has_rows", lambda table_sql, where=None: where is None)
+    return executor
+
+def make_plan(engine, monkeypatch, *columns, title=None, hours=Integer, foreign_keys=()):
+    """Plan de SchemaDiff para `issues` con las columnas extra y cambios pedidos"""
+    monkeypatch.setattr(schema_diff, "inspect", lambda bind: FakeInspector())
+    metadata = MetaData()
+    Table("users", metadata, Column("id", Integer, primary_key=True))
+    table = Table(
+        "issues",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        title if title is not None else Column("title", String(200)),
+        Column("hours", hours),
+        Column("assigned_to", Integer),
+        *columns,
+    )
+    specs = [ForeignKeySpec(f"fk_issues_{column}", table, column, "users", "id") for column in foreign_keys]
+    return SchemaDiff(engine).diff([table], specs)
+
+def statements(steps):
+    return [(step.mode, statement) for step in steps for statement in step.statements]
+
+def test_add_not_null_column_with_default(engine, executor, monkeypatch):
+    plan = make_plan(
+        engine, monkeypatch,
+        Column("status", String(20), nullable=False, server_default=text("'open'"))
+    )
+
+    steps = executor.steps(plan)
+
+    assert [step.mode for step in steps] == ["transaction", "backfill", "transaction", "validate", "transaction"]
+    assert statements(steps) == [
+        ("transaction", "ALTER TABLE issues ADD COLUMN IF NOT EXISTS status VARCHAR(20)"),
+        ("transaction", "ALTER TABLE issues ALTER COLUMN status SET DEFAULT 'open'"),
+        ("transaction", "ALTER TABLE issues DROP CONSTRAINT IF EXISTS ck_issues_status_not_null"),
+        ("transaction", "ALTER TABLE issues ADD CONSTRAINT ck_issues_status_not_null CHECK (status IS NOT NULL) NOT VALID"),
+        ("validate", "ALTER TABLE issues VALIDATE CONSTRAINT ck_issues_status_not_null"),
+        ("transaction", "ALTER TABLE issues ALTER COLUMN status SET NOT NULL"),
+        ("transaction", "ALTER TABLE issues DROP CONSTRAINT ck_issues_status_not_null"),
+    ]
+    backfill = steps[1]
+    assert (backfill.table_sql, backfill.column_sql, backfill.value) == ("issues", "status", "'open'")
+
+def test_add_nullable_column_is_a_single_statement(engine, executor, monkeypatch):
+    plan = make_plan(engine, monkeypatch, Column("notes", String(50)))
+
+    assert statements(executor.steps(plan)) == [
+        ("transaction", "ALTER TABLE issues ADD COLUMN notes VARCHAR(50)"),
+    ]
+
+def test_unique_and_foreign_key_avoid_long_locks(engine, executor, monkeypatch):
+    plan = make_plan(engine, monkeypatch, Column("code", String(10), unique=True), foreign_keys=["assigned_to"])
+
+    assert statements(executor.steps(plan))[1:] == [
+        ("autocommit", "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_issues_code ON issues (code)"),
+        ("transaction", "ALTER TABLE issues ADD CONSTRAINT uq_issues_code UNIQUE USING INDEX uq_issues_code"),
+        ("transaction", "ALTER TABLE issues DROP CONSTRAINT IF EXISTS fk_issues_assigned_to"),
+        (
+            "transaction",
+            "ALTER TABLE issues ADD CONSTRAINT fk_issues_assigned_to "
+            "FOREIGN KEY (assigned_to) REFERENCES users (id) NOT VALID",
+        ),
+        ("validate", "ALTER TABLE issues VALIDATE CONSTRAINT fk_issues_assigned_to"),
+    ]
+
+def test_not_null_column_without_default_is_rejected_on_a_table_with_rows(engine, executor, monkeypatch):
+    plan = make_plan(engine, monkeypatch, Column("status", String(20), nullable=False))
+
+    with pytest.raises(ValueError, match="status: columna NOT NULL sin default"):
+        executor.steps(plan)
+    with pytest.raises(ValueError):
+        executor.render(plan)
+
+def test_not_null_column_without_default_on_an_empty_table(engine, executor, monkeypatch):
+    monkeypatch.setattr(executor, "_has_rows", lambda table_sql, where=None: False)
+    plan = make_plan(engine, monkeypatch, Column("status", String(20), nullable=False))
+
+    assert [step.mode for step in executor.steps(plan)] == ["transaction", "transaction", "validate", "transaction"]
+
+def test_set_not_null_is_rejected_when_rows_have_nulls(engine, executor, monkeypatch):
+    monkeypatch.setattr(executor, "_has_rows", lambda table_sql, where=None: True)
+    plan = make_plan(engine, monkeypatch, title=Column("title", String(200), nullable=False))
+
+    with pytest.raises(ValueError, match="title: hay filas con NULL"):
+        executor.steps(plan)
+
+def test_type_change_fails_the_plan(engine, executor, monkeypatch):
+    # hours es INTEGER en la base y pasa a FLOAT
+    plan = make_plan(engine, monkeypatch, hours=Float)
+
+    assert [change.details.get("action") for change in plan] == ["type"]
+    with pytest.raises(ValueError, match="reescribe la tabla"):
+        executor.steps(plan)
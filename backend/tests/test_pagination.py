@@ -0,0 +1,131 @@
+# backend\tests\test_pagination.py
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, create_engine, insert, select
+from core.generator.query_builder import QueryBuilder
+from utils.pagination import build_page, decode_cursor, encode_cursor, paginate_keyset, parse_sort
+
+metadata = MetaData()
+items = Table(
+    "items",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(20), nullable=False, index=True),
+    Column("due", DateTime, nullable=True, index=True),
+    Column("notes", String(20)),
+)
+
+START = datetime(2024, 1, 1, 12, 30, 15, 250000)
+# Valores repetidos y NULL en la clave de orden: el id desempata
+ROWS = [
+    {"id": index, "name": f"n{index % 3}", "due": None if index % 4 == 0 else START + timedelta(hours=index % 5)}
+    for index in range(1, 18)
+]
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(items), ROWS)
+    return engine
+
+def walk(engine, sort, limit):
+    """Recorre todas las páginas siguiendo next_cursor; devuelve los ids por página"""
+    keys = parse_sort(items, sort)
+    pages, cursor = [], None
+    with engine.connect() as conn:
+        while True:
+            statement = paginate_keyset(select(items), keys, cursor, limit)
+            page, cursor = build_page(conn.execute(statement).all(), keys, limit)
+            pages.append([row.id for row in page])
+            if cursor is None:
+                return pages
+
+def expected(sort_key, descending):
+    """Orden de referencia: NULL al final en asc y desc, id con la misma dirección"""
+    present = [row for row in ROWS if row[sort_key] is not None]
+    missing = [row for row in ROWS if row[sort_key] is None]
+    ordered = sorted(present, key=lambda row: (row[sort_key], row["id"]), reverse=descending)
+    return [row["id"] for row in ordered] + sorted((row["id"] for row in missing), reverse=descending)
+
+@pytest.mark.parametrize("limit", [1, 4, 5, 17, 50])
+def test_pages_by_id_cover_every_row_once(engine, limit):
+    pages = walk(engine, None, limit)
+
+    assert sum(pages, []) == list(range(1, 18))
+    assert all(len(page) <= limit for page in pages)
+
+@pytest.mark.parametrize("sort,key,descending", [
+    ("due", "due", False),
+    ("-due", "due", True),
+    ("name", "name", False),
+    ("-name", "name", True),
+])
+@pytest.mark.parametrize("limit", [2, 3, 7])
+def test_sort_with_duplicates_and_nulls_keeps_a_total_order(engine, sort, key, descending, limit):
+    ids = sum(walk(engine, sort, limit), [])
+
+    assert ids == expected(key, descending)
+
+def test_cursor_resumes_inside_the_null_tail(engine):
+    # 13 filas con due y 4 con NULL: la primera página de 14 termina en un NULL
+    keys = parse_sort(items, "due")
+    with engine.connect() as conn:
+        first, cursor = build_page(conn.execute(paginate_keyset(select(items), keys, None, 14)).all(), keys, 14)
+        assert first[-1].due is None
+        rest, next_cursor = build_page(conn.execute(paginate_keyset(select(items), keys, cursor, 14)).all(), keys, 14)
+
+    assert [row.id for row in first + rest] == expected("due", False)
+    assert next_cursor is None
+
+def test_datetime_cursor_round_trips(engine):
+    keys = parse_sort(items, "-due")
+    token = encode_cursor([START + timedelta(hours=3), 7])
+
+    assert decode_cursor(token, keys) == [START + timedelta(hours=3), 7]
+    assert decode_cursor(encode_cursor([None, 8]), keys) == [None, 8]
+
+def test_parse_sort_adds_id_as_tiebreaker_in_the_same_direction():
+    keys = parse_sort(items, "-due")
+
+    assert [(column.name, descending) for column, descending in keys] == [("due", True), ("id", True)]
+
+@pytest.mark.parametrize("sort", ["notes", "missing"])
+def test_parse_sort_rejects_unindexed_columns(sort):
+    with pytest.raises(HTTPException) as error:
+        parse_sort(items, sort)
+
+    assert error.value.status_code == 400
+
+@pytest.mark.parametrize("token", ["zzz", encode_cursor([1]), encode_cursor(["not a date", 1])])
+def test_invalid_cursor_is_a_400(token):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(token, parse_sort(items, "due"))
+
+    assert error.value.status_code == 400
+
+def test_query_builder_only_sorts_by_indexed_or_unique_fields():
+    def field(name, field_type, is_unique=False):
+        return SimpleNamespace(name=name, field_type=field_type, is_unique=is_unique)
+
+    model = SimpleNamespace(__table__=items)
+    plain = QueryBuilder(SimpleNamespace(fields=[field("name", "string"), field("notes", "string")]), model)
+    unique = QueryBuilder(SimpleNamespace(fields=[field("notes", "string", is_unique=True)]), model)
+
+    assert set(plain.sortable) == {"id", "name"}
+    with pytest.raises(HTTPException) as error:
+        parse_sort(items, "notes", plain.sortable)
+    assert error.value.status_code == 400
+    assert [column.name for column, _ in parse_sort(items, "-notes", unique.sortable)] == ["notes", "id"]
+
+def test_unknown_plain_params_are_ignored_but_unknown_filters_are_a_400():
+    builder = QueryBuilder(SimpleNamespace(fields=[]), SimpleNamespace(__table__=items))
+
+    assert builder.filter_clauses([("_", "1700000000"), ("utm_source", "mail"), ("limit", "5")]) == []
+    assert len(builder.filter_clauses([("id__gte", "3"), ("_", "1")])) == 1
+    with pytest.raises(HTTPException) as error:
+        builder.filter_clauses([("missing__eq", "x")])
+    assert error.value.status_code == 400
@@ -0,0 +1,102 @@
+# backend\tests\test_public_paths.py
+from datetime import timedelta
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from core.middleware.auth import AuthMiddleware
+from core.middleware.public_paths import PublicPathMatcher, public_route
+from core.security.auth import create_access_token
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    router = APIRouter()
+
+    @router.get("/status", openapi_extra=public_route())
+    def status():
+        return {"ok": True}
+
+    @router.get("/items/", openapi_extra=public_route())
+    def list_items():
+        return []
+
+    @router.post("/items/")
+    def create_item():
+        return {"id": 1}
+
+    @router.get("/items/{item_id}", openapi_extra=public_route())
+    def read_item(item_id: int):
+        return {"id": item_id}
+
+    @router.get("/items/{item_id}/secret")
+    def read_secret(item_id: int):
+        return {"id": item_id, "secret": True}
+
+    @router.get("/items/{item_id}/comments/{comment_id}", openapi_extra=public_route())
+    def read_comment(item_id: int, comment_id: int):
+        return {"id": comment_id}
+
+    @router.get("/files/{file_path:path}", openapi_extra=public_route())
+    def read_file(file_path: str):
+        return {"path": file_path}
+
+    @router.get("/private")
+    def private():
+        return {"ok": True}
+
+    app.include_router(router, prefix="/api")
+    return app
+
+@pytest.fixture
+def app():
+    return build_app()
+
+@pytest.mark.parametrize("method,path,public", [
+    ("GET", "/api/status", True),
+    ("GET", "/api/items/", True),
+    ("GET", "/api/items", True),  # redirección a la barra final
+    ("POST", "/api/items/", False),  # mismo path, otro método
+    ("GET", "/api/items/7", True),
+    ("GET", "/api/items/7/secret", False),
+    ("GET", "/api/items/7/comments/3", True),
+    ("GET", "/api/items//comments/3", False),  # un parámetro no es un segmento vacío
+    ("GET", "/api/items/7/comments", False),
+    ("GET", "/api/files/a/b/c.txt", True),
+    ("POST", "/api/files/a.txt", False),
+    ("GET", "/api/private", False),
+    ("GET", "/api/unknown", False),
+    ("GET", "/docs", True),
+    ("GET", "/openapi.json", True),
+    ("OPTIONS", "/api/private", True),  # preflight de CORS
+])
+def test_classifies_routes_from_their_public_marker(app, method, path, public):
+    assert PublicPathMatcher().is_public(app, method, path) is public
+
+def test_recompiles_only_when_the_route_table_changes(app):
+    matcher = PublicPathMatcher()
+    matcher.is_public(app, "GET", "/api/status")
+    matcher.is_public(app, "GET", "/api/private")
+    assert matcher.compiles == 1
+
+    @app.get("/api/late", openapi_extra=public_route())
+    def late():
+        return {}
+    # RouterRegistry reemplaza la lista de rutas en cada recarga
+    app.router.routes = list(app.router.routes)
+
+    assert matcher.is_public(app, "GET", "/api/late")
+    assert matcher.compiles == 2
+
+def test_middleware_rejects_protected_routes_without_a_valid_token(app):
+    app.add_middleware(AuthMiddleware)
+    client = TestClient(app)
+    token = create_access_token({"sub": "ana"}, timedelta(minutes=5))
+    expired = create_access_token({"sub": "ana"}, timedelta(minutes=-1))
+
+    assert client.get("/api/items/7").status_code == 200
+    assert client.get("/api/files/a/b.txt").json() == {"path": "a/b.txt"}
+    assert client.get("/api/private").status_code == 403
+    assert client.get("/api/private", headers={"Authorization": "Bearer x.y.z"}).status_code == 403
+    response = client.get("/api/private", headers={"Authorization": f"Bearer {expired}"})
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+    assert client.get("/api/private", headers={"Authorization": f"Bearer {token}"}).status_code == 200
@@ -0,0 +1,112 @@
+# backend\tests\test_schema_diff.py
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from core.database.base import Base
+from core.metadata.models import FieldMetadata, RelationshipMetadata, TableMetadata
+from core.generator.table_generator import TableGenerator
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(
+        engine, tables=[TableMetadata.__table__, FieldMetadata.__table__, RelationshipMetadata.__table__]
+    )
+    return engine
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    # SQLite no tiene el schema "public" de la metadata por defecto
+    users = TableMetadata(name="users_x", db_schema="main")
+    issues = TableMetadata(name="issues", db_schema="main")
+    session.add_all([users, issues])
+    session.flush()
+    session.add_all([
+        FieldMetadata(table_id=issues.id, name="title", field_type="varchar", length=200, is_nullable=False),
+        FieldMetadata(table_id=issues.id, name="status", field_type="varchar", length=20, default_value="'open'"),
+        FieldMetadata(table_id=users.id, name="email", field_type="varchar", is_unique=True),
+    ])
+    session.add(RelationshipMetadata(
+        source_table_id=issues.id, target_table_id=users.id, source_field="assigned_to", target_field="id"
+    ))
+    session.commit()
+    yield session
+    session.close()
+
+def kinds(plan):
+    return [(change.kind, change.table, change.column) for change in plan]
+
+def columns(engine, table):
+    return [column["name"] for column in inspect(engine).get_columns(table)]
+
+def test_creates_missing_tables_and_then_has_nothing_to_do(engine, db):
+    generator = TableGenerator(engine)
+
+    plan = generator.generate_tables(db)
+
+    assert kinds(plan) == [("create_table", "users_x", None), ("create_table", "issues", None)]
+    assert plan.skipped == ["issues.assigned_to: SQLite no soporta ADD CONSTRAINT FOREIGN KEY"]
+    assert columns(engine, "issues") == ["id", "created_at", "updated_at", "title", "status", "assigned_to"]
+    assert not TableGenerator(engine).plan_migration(db)
+
+def test_dry_run_does_not_touch_the_database(engine, db):
+    plan = TableGenerator(engine).generate_tables(db, dry_run=True)
+
+    assert len(plan) == 2
+    assert "CREATE TABLE" in plan.render()
+    assert not inspect(engine).has_table("issues")
+
+def test_only_the_new_columns_and_unique_indexes_are_emitted(engine, db):
+    TableGenerator(engine).generate_tables(db)
+    issues = db.query(TableMetadata).filter_by(name="issues").one()
+    db.add_all([
+        FieldMetadata(table_id=issues.id, name="hours", field_type="float"),
+        FieldMetadata(table_id=issues.id, name="code", field_type="varchar", length=10, is_unique=True),
+    ])
+    db.commit()
+    generator = TableGenerator(engine)
+
+    plan = generator.plan_migration(db)
+
+    assert kinds(plan) == [
+        ("add_column", "issues", "hours"),
+        ("add_column", "issues", "code"),
+        ("create_unique", "issues", "code"),
+    ]
+    statements = [change.sql for change in plan]
+    assert statements[0] == "ALTER TABLE main.issues ADD COLUMN hours FLOAT"
+    # SQLite califica el nombre del índice, no la tabla
+    assert statements[2] == "CREATE UNIQUE INDEX main.uq_issues_code ON issues (code)"
+
+    generator.apply_plan(plan)
+    assert columns(engine, "issues")[-2:] == ["hours", "code"]
+    assert not TableGenerator(engine).plan_migration(db)
+
+def test_changes_sqlite_cannot_alter_are_skipped(engine, db):
+    TableGenerator(engine).generate_tables(db)
+    status = db.query(FieldMetadata).filter_by(name="status").one()
+    status.default_value = "'new'"
+    db.commit()
+
+    plan = TableGenerator(engine).plan_migration(db)
+
+    assert not plan
+    assert plan.skipped == [
+        "issues.status: default de status: 'open' -> 'new' (SQLite no soporta ALTER COLUMN, hay que recrear la tabla)",
+        "issues.assigned_to: SQLite no soporta ADD CONSTRAINT FOREIGN KEY",
+    ]
+
+def test_extra_columns_are_only_dropped_with_allow_drop(engine, db):
+    TableGenerator(engine).generate_tables(db)
+    db.delete(db.query(FieldMetadata).filter_by(name="status").one())
+    db.commit()
+
+    kept = TableGenerator(engine).plan_migration(db)
+    dropped = TableGenerator(engine).generate_tables(db, allow_drop=True)
+
+    assert not kept
+    assert "issues.status: columna sin metadata (usar allow_drop para borrarla)" in kept.skipped
+    assert kinds(dropped) == [("drop_column", "issues", "status")]
+    assert "status" not in columns(engine, "issues")
@@ -0,0 +1,62 @@
+# backend\tests\test_tokens.py
+from datetime import timedelta
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from core.security import auth
+from core.security.auth import create_access_token, get_current_user
+from core.security.permissions import permission_resolver
+from core.security.tokens import TokenVerifier, UserSnapshot
+
+def snapshot(username, is_superuser):
+    return UserSnapshot(
+        id=1, username=username, email=None, full_name=None, is_active=True, is_superuser=is_superuser
+    )
+
+@pytest.fixture
+def client(monkeypatch):
+    users = {"ana": snapshot("ana", True)}
+    loads = []
+
+    def load_user_snapshot(username):
+        loads.append(username)
+        return users.get(username)
+
+    monkeypatch.setattr(auth, "load_user_snapshot", load_user_snapshot)
+    monkeypatch.setattr(auth, "token_verifier", TokenVerifier(auth.SECRET_KEY, auth.ALGORITHM, 60, 100))
+    monkeypatch.setattr(permission_resolver, "version", 0)
+    app = FastAPI()
+
+    @app.get("/me")
+    async def me(user: UserSnapshot = Depends(get_current_user)):
+        return {"is_superuser": user.is_superuser}
+
+    token = create_access_token({"sub": "ana"}, timedelta(minutes=5))
+    client = TestClient(app, headers={"Authorization": f"Bearer {token}"})
+    return client, users, loads
+
+def test_snapshot_is_cached_per_token(client):
+    client, users, loads = client
+
+    assert client.get("/me").json() == {"is_superuser": True}
+    assert client.get("/me").json() == {"is_superuser": True}
+    assert loads == ["ana"]
+
+def test_forget_user_drops_the_cached_snapshot(client):
+    client, users, loads = client
+    client.get("/me")
+    users["ana"] = snapshot("ana", False)
+
+    assert auth.token_verifier.forget_user("ana") == 1
+    assert auth.token_verifier.forget_user("otro") == 0
+    assert client.get("/me").json() == {"is_superuser": False}
+
+def test_snapshot_is_reloaded_when_the_permission_version_changes(client, monkeypatch):
+    client, users, loads = client
+    client.get("/me")
+    users["ana"] = snapshot("ana", False)
+    # Otro worker cambió roles: la matriz se recargó con una versión nueva
+    monkeypatch.setattr(permission_resolver, "version", 1)
+
+    assert client.get("/me").json() == {"is_superuser": False}
+    assert loads == ["ana", "ana"]
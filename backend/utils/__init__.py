@@ -1,2 +1,2 @@
 # backend\utils\__init__.py
-from .helpers import CRUDHelper
\ No newline at end of file
+from .helpers import CRUDHelper, AsyncCRUDHelper
\ No newline at end of file
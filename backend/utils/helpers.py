@@ -1,15 +1,34 @@
 # backend\utils\helpers.py
-from typing import Any, Dict, List, Optional, Type, TypeVar, Generic
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, Generic
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import Table, insert, select, update
+from core.database import async_database as adb
+from core.database.async_database import DBSession
 from models.base import Base
 from schemas.base import BaseSchema, BaseCreateSchema, BaseUpdateSchema
+from utils.pagination import build_page, paginate_keyset, parse_sort
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseCreateSchema)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseUpdateSchema)
 
+def insert_values(table: Table, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Values for an INSERT statement.
+
+    Like the ORM unit of work, a None for a column with a default is left out so
+    the default applies instead of writing NULL.
+    """
+    columns = table.columns
+    return {
+        key: value
+        for key, value in data.items()
+        if key in columns and (
+            value is not None
+            or (columns[key].default is None and columns[key].server_default is None)
+        )
+    }
+
 class CRUDHelper(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Base class for CRUD operations"""
     
@@ -28,7 +47,20 @@ class CRUDHelper(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         limit: int = 100
     ) -> List[ModelType]:
         """Get multiple records"""
-        return db.query(self.model).offset(skip).limit(limit).all()
+        return db.query(self.model).order_by(self.model.id).offset(skip).limit(limit).all()
+
+    def get_page(
+        self,
+        db: Session,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        sort: Optional[str] = None
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Get a keyset page of records and the cursor for the next one"""
+        keys = parse_sort(self.model.__table__, sort)
+        statement = paginate_keyset(select(self.model), keys, cursor, limit)
+        return build_page(db.execute(statement).scalars().all(), keys, limit)
 
     def create(
         self, 
@@ -38,10 +70,13 @@ class CRUDHelper(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> ModelType:
         """Create a new record"""
         obj_in_data = obj_in.model_dump() if hasattr(obj_in, 'model_dump') else obj_in.dict()
-        db_obj = self.model(**obj_in_data)
-        db.add(db_obj)
+        # INSERT ... RETURNING brings back ids and server defaults without a refresh
+        db_obj = db.scalars(
+            insert(self.model)
+            .values(**insert_values(self.model.__table__, obj_in_data))
+            .returning(self.model)
+        ).one()
         db.commit()
-        db.refresh(db_obj)
         return db_obj
 
     def update(
@@ -52,19 +87,24 @@ class CRUDHelper(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in: UpdateSchemaType | Dict[str, Any]
     ) -> ModelType:
         """Update a record"""
-        obj_data = db_obj.dict()
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.model_dump() if hasattr(obj_in, 'model_dump') else obj_in.dict(exclude_unset=True)
-            
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-                
-        db.add(db_obj)
+            update_data = obj_in.model_dump(exclude_unset=True) if hasattr(obj_in, 'model_dump') else obj_in.dict(exclude_unset=True)
+
+        columns = self.model.__table__.columns
+        values = {key: value for key, value in update_data.items() if key in columns}
+        if not values:
+            return db_obj
+
+        # UPDATE ... RETURNING refreshes db_obj (same identity) in one round trip
+        db_obj = db.scalars(
+            update(self.model)
+            .where(self.model.id == db_obj.id)
+            .values(**values)
+            .returning(self.model)
+        ).one()
         db.commit()
-        db.refresh(db_obj)
         return db_obj
 
     def delete(self, db: Session, *, id: int) -> ModelType:
@@ -79,4 +119,98 @@ class CRUDHelper(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def exists(self, db: Session, id: int) -> bool:
         """Check if a record exists"""
         result = db.query(self.model).filter(self.model.id == id).first()
-        return result is not None
\ No newline at end of file
+        return result is not None
+
+class AsyncCRUDHelper(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """CRUD operations that await the database (AsyncSession or Session in threadpool)"""
+
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+
+    async def get(self, db: DBSession, id: int) -> Optional[ModelType]:
+        """Get a record by ID"""
+        result = await adb.execute(db, select(self.model).where(self.model.id == id))
+        return result.scalars().first()
+
+    async def get_multi(
+        self,
+        db: DBSession,
+        *,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[ModelType]:
+        """Get multiple records"""
+        result = await adb.execute(
+            db, select(self.model).order_by(self.model.id).offset(skip).limit(limit)
+        )
+        return result.scalars().all()
+
+    async def get_page(
+        self,
+        db: DBSession,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        sort: Optional[str] = None
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Get a keyset page of records and the cursor for the next one"""
+        keys = parse_sort(self.model.__table__, sort)
+        statement = paginate_keyset(select(self.model), keys, cursor, limit)
+        result = await adb.execute(db, statement)
+        return build_page(result.scalars().all(), keys, limit)
+
+    async def create(
+        self,
+        db: DBSession,
+        *,
+        obj_in: CreateSchemaType
+    ) -> ModelType:
+        """Create a new record"""
+        obj_in_data = obj_in.model_dump() if hasattr(obj_in, 'model_dump') else obj_in.dict()
+        result = await adb.execute(
+            db,
+            insert(self.model)
+            .values(**insert_values(self.model.__table__, obj_in_data))
+            .returning(self.model)
+        )
+        db_obj = result.scalars().one()
+        await adb.commit(db)
+        return db_obj
+
+    async def update(
+        self,
+        db: DBSession,
+        *,
+        db_obj: ModelType,
+        obj_in: UpdateSchemaType | Dict[str, Any]
+    ) -> ModelType:
+        """Update a record"""
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        columns = self.model.__table__.columns
+        values = {key: value for key, value in update_data.items() if key in columns}
+        if not values:
+            return db_obj
+
+        result = await adb.execute(
+            db,
+            update(self.model)
+            .where(self.model.id == db_obj.id)
+            .values(**values)
+            .returning(self.model)
+        )
+        db_obj = result.scalars().one()
+        await adb.commit(db)
+        return db_obj
+
+    async def delete(self, db: DBSession, *, id: int) -> ModelType:
+        """Delete a record"""
+        obj = await self.get(db, id)
+        if not obj:
+            raise HTTPException(status_code=404, detail="Object not found")
+        await adb.delete(db, obj)
+        await adb.commit(db)
+        return obj
@@ -0,0 +1,146 @@
+# backend\utils\pagination.py
+import base64
+import binascii
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from fastapi import HTTPException
+from sqlalchemy import Column, Table, and_, or_
+from sqlalchemy.sql import Select
+
+# Clave de ordenamiento: (columna, descendente)
+SortKey = Tuple[Column, bool]
+
+def sortable_columns(table: Table) -> Dict[str, Column]:
+    """Columnas indexadas sobre las que se puede paginar por cursor"""
+    indexed = {
+        index.columns[0].name
+        for index in table.indexes
+        if len(index.columns) == 1
+    }
+    return {
+        column.name: column
+        for column in table.columns
+        if column.primary_key or column.index or column.unique or column.name in indexed
+    }
+
+def parse_sort(
+    table: Table,
+    sort: Optional[str],
+    allowed: Optional[Dict[str, Column]] = None
+) -> List[SortKey]:
+    """Convierte 'campo,-otro' en claves de ordenamiento, con id como desempate"""
+    allowed = allowed if allowed is not None else sortable_columns(table)
+    keys: List[SortKey] = []
+    seen = set()
+    for part in (sort or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        descending = part.startswith("-")
+        name = part.lstrip("+-")
+        if name not in allowed:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot sort by '{name}'"
+            )
+        if name in seen:
+            continue
+        seen.add(name)
+        keys.append((allowed[name], descending))
+
+    # El id hace que el orden sea total y el cursor no salte filas repetidas
+    if "id" not in seen:
+        keys.append((table.c.id, keys[-1][1] if keys else False))
+    return keys
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+def _load_value(value: Any, column: Column) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type in (datetime, date, time):
+        return python_type.fromisoformat(value)
+    if python_type is Decimal:
+        return Decimal(value)
+    return value
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Genera el token opaco a partir de los valores de la última fila"""
+    payload = json.dumps([_dump_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(token: str, keys: Sequence[SortKey]) -> List[Any]:
+    """Recupera los valores de un token generado por encode_cursor"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match sort keys")
+        return [_load_value(value, column) for value, (column, _) in zip(values, keys)]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+# Los NULL van siempre al final (asc y desc), igual en ORDER BY y en el
+# predicado del cursor: una fila con NULL en la clave también se puede retomar
+def _after(column: Column, value: Any, descending: bool):
+    if value is None:
+        # Después de un NULL solo hay más NULL: decide la clave siguiente
+        return None
+    compare = column < value if descending else column > value
+    return or_(compare, column.is_(None)) if column.nullable else compare
+
+def _equals(column: Column, value: Any):
+    return column.is_(None) if value is None else column == value
+
+def keyset_condition(keys: Sequence[SortKey], values: Sequence[Any]):
+    """WHERE para continuar después de la fila (k1, k2, ...) = values"""
+    clauses = []
+    for i, (column, descending) in enumerate(keys):
+        compare = _after(column, values[i], descending)
+        if compare is None:
+            continue
+        prefix = [_equals(keys[j][0], values[j]) for j in range(i)]
+        clauses.append(and_(*prefix, compare))
+    return or_(*clauses)
+
+def order_clauses(keys: Sequence[SortKey]) -> List[Any]:
+    """ORDER BY de las claves; las columnas nullable ordenan los NULL al final"""
+    clauses = []
+    for column, descending in keys:
+        clause = column.desc() if descending else column.asc()
+        clauses.append(clause.nulls_last() if column.nullable else clause)
+    return clauses
+
+def paginate_keyset(
+    statement: Select,
+    keys: Sequence[SortKey],
+    cursor: Optional[str],
+    limit: int
+) -> Select:
+    """Aplica WHERE/ORDER BY/LIMIT de keyset; pide una fila extra para detectar si hay más"""
+    if cursor:
+        statement = statement.where(keyset_condition(keys, decode_cursor(cursor, keys)))
+    return statement.order_by(*order_clauses(keys)).limit(limit + 1)
+
+def build_page(
+    rows: Sequence[Any],
+    keys: Sequence[SortKey],
+    limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    """Separa la fila extra y genera el next_cursor de la página"""
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return items, None
+    last = items[-1]
+    return items, encode_cursor([getattr(last, column.key) for column, _ in keys])